@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+# Benchmarks run without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import cv2
+import numpy as np
+
+from fulldome_converter import (ConversionThread, MAP_CACHE, KERNEL, build_fisheye_maps,
+                                build_lod_plan, sample_level_plan, build_tiled_plan, sample_tiled_plan)
+
+RESOLUTIONS = {
+    '1K': 1024,
+    '2K': 2048,
+    '4K': 4096,
+    '8K': 8192
+}
+
+def get_peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS; Windows has no resource module
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+def get_input_size(input_format, resolution):
+    width = RESOLUTIONS[resolution]
+    if input_format == 'cubemap':
+        # Six faces side by side, each covering 90 degrees of the equirect width
+        face = width // 4
+        return face * 6, face
+    return width, width // 2
+
+def make_synthetic_frame(width, height, index=0):
+    # Smooth gradients plus a moving grid so codecs and samplers see real detail
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = x[None, :]
+    frame[:, :, 1] = y[:, None]
+    frame[:, :, 2] = 128
+    step = max(8, width // 64)
+    offset = (index * 4) % step
+    frame[:, offset::step] = 255
+    frame[offset::step, :] = 255
+    return frame
+
+def write_synthetic_inputs(directory, width, height, frames):
+    still_path = os.path.join(directory, f"still_{width}x{height}.png")
+    cv2.imwrite(still_path, make_synthetic_frame(width, height))
+
+    video_path = os.path.join(directory, f"video_{width}x{height}.mp4")
+    out = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 30, (width, height))
+    for i in range(frames):
+        out.write(make_synthetic_frame(width, height, i))
+    out.release()
+    return still_path, video_path
+
+def time_call(function, repeat):
+    # Best of several runs keeps scheduler noise out of the numbers
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+def make_thread(input_path, output_path, is_video, input_format, flip_h=False, flip_v=False):
+    return ConversionThread(input_path, output_path, is_video, input_format, 'standard', 0,
+                            1.0, 15, 30, 5, flip_h, flip_v, progress_interval=1.0)
+
+def run_case(case):
+    input_format = case['input_format']
+    resolution = case['resolution']
+    frames = case['frames']
+    repeat = case['repeat']
+    kernel = case.get('kernel', 'numpy')
+    KERNEL.set_backend(kernel)
+    width, height = get_input_size(input_format, resolution)
+    dome_size = min(width, height)
+    format_name = 'Cubemap' if input_format == 'cubemap' else 'Equirectangular'
+
+    with tempfile.TemporaryDirectory() as directory:
+        still_path, video_path = write_synthetic_inputs(directory, width, height, frames)
+        frame = cv2.imread(still_path)
+        stages = {}
+
+        # Map build (cold, without any cached geometry)
+        stages['map_build'], maps = time_call(
+            lambda: build_fisheye_maps(dome_size, width, height, 1.0, 15, 30, 5, nearest=True), repeat)
+
+        # Folding flips into the maps is a one-off cost on top of the map build
+        flip_ms, _ = time_call(
+            lambda: build_fisheye_maps(dome_size, width, height, 1.0, 15, 30, 5, flip_h=True, flip_v=True, nearest=True), repeat)
+        stages['flip'] = max(flip_ms - stages['map_build'], 0.0)
+
+        # Sampling with prebuilt maps
+        map_x, map_y = maps
+        stages['sampling'], result = time_call(
+            lambda: cv2.remap(frame, map_x, map_y, cv2.INTER_NEAREST, borderMode=cv2.BORDER_CONSTANT), repeat)
+
+        # Source-tile sorted sampling order against the row-major order above
+        stages['tile_sort'], tiled_plan = time_call(lambda: build_tiled_plan(map_x, map_y, width, height), repeat)
+        stages['sampling_tiled'], _ = time_call(lambda: sample_tiled_plan(frame, tiled_plan), repeat)
+
+        # Antialiased sampling: level-of-detail plan (once per export) and per-frame pyramid sampling
+        continuous_maps = build_fisheye_maps(dome_size, width, height, 1.0, 15, 30, 5)
+        stages['lod_plan'], plan = time_call(lambda: build_lod_plan(*continuous_maps, width, height), repeat)
+        stages['antialias_sampling'], _ = time_call(lambda: sample_level_plan(frame, plan), repeat)
+
+        # Fused rotation + sampling without prebuilt maps (direction geometry is cached, as in animated exports)
+        if KERNEL.is_fused():
+            MAP_CACHE.get_directions(dome_size, 1.0)
+            stages['fused_project'], _ = time_call(
+                lambda: KERNEL.project(frame, dome_size, 1.0, 15, 30, 5, nearest=True), repeat)
+
+        # Decode (per frame)
+        def decode_all():
+            cap = cv2.VideoCapture(video_path)
+            count = 0
+            while cap.read()[0]:
+                count += 1
+            cap.release()
+            return count
+        decode_ms, decoded = time_call(decode_all, repeat)
+        stages['decode'] = decode_ms / max(decoded, 1)
+
+        # Encode (per frame, at dome size)
+        def encode_all():
+            out = cv2.VideoWriter(os.path.join(directory, "encode.mp4"), cv2.VideoWriter_fourcc(*'mp4v'), 30, (dome_size, dome_size))
+            for _ in range(frames):
+                out.write(result)
+            out.release()
+        encode_ms, _ = time_call(encode_all, repeat)
+        stages['encode'] = encode_ms / frames
+
+        # End-to-end still export through ConversionThread (cold cache)
+        def export_still():
+            MAP_CACHE.clear()
+            thread = make_thread(still_path, os.path.join(directory, "still_out.png"), False, format_name)
+            thread.run()
+            if thread.failed:
+                raise Exception("Still export failed")
+        still_ms, _ = time_call(export_still, repeat)
+
+        # End-to-end video export through ConversionThread
+        def export_video():
+            MAP_CACHE.clear()
+            thread = make_thread(video_path, os.path.join(directory, "video_out.mp4"), True, format_name)
+            thread.run()
+            if thread.failed:
+                raise Exception("Video export failed")
+        video_ms, _ = time_call(export_video, repeat)
+
+    return {
+        'input_format': input_format,
+        'resolution': resolution,
+        'kernel': kernel,
+        'width': width,
+        'height': height,
+        'dome_size': dome_size,
+        'frames': frames,
+        'stages_ms': {name: round(value, 3) for name, value in stages.items()},
+        'still_end_to_end_ms': round(still_ms, 3),
+        'video_end_to_end_ms': round(video_ms, 3),
+        'video_fps': round(frames / (video_ms / 1000), 3),
+        'peak_rss_mb': get_peak_rss_mb()
+    }
+
+def run_isolated(case):
+    # One process per case so peak RSS belongs to that case alone
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--case', json.dumps(case)],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return dict(case, error=completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "Benchmark case failed")
+    return json.loads(completed.stdout)
+
+def compare_to_baseline(results, baseline, tolerance):
+    # Flag any case whose video throughput dropped by more than the tolerance; kernels are only compared
+    # with themselves, and reports from before the kernel option ran the numpy one
+    regressions = []
+    previous = {(r['input_format'], r['resolution'], r.get('kernel', 'numpy')): r
+                for r in baseline.get('results', []) if 'video_fps' in r}
+    for result in results:
+        key = (result['input_format'], result['resolution'], result.get('kernel', 'numpy'))
+        if key in previous and 'video_fps' in result:
+            old_fps = previous[key]['video_fps']
+            if result['video_fps'] < old_fps * (1 - tolerance):
+                regressions.append({
+                    'input_format': key[0],
+                    'resolution': key[1],
+                    'kernel': key[2],
+                    'baseline_fps': old_fps,
+                    'fps': result['video_fps']
+                })
+    return regressions
+
+def get_machine_info():
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'opencv': cv2.__version__,
+        'numpy': np.__version__,
+        'opencv_threads': cv2.getNumThreads()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fulldome projection and export pipeline")
+    parser.add_argument('--resolutions', nargs='+', default=['1K', '2K', '4K'], choices=list(RESOLUTIONS))
+    parser.add_argument('--formats', nargs='+', default=['equirect', 'cubemap'], choices=['equirect', 'cubemap'])
+    parser.add_argument('--frames', type=int, default=30, help="Frames in each synthetic video")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', help="Earlier JSON report to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Allowed fractional fps drop against the baseline")
+    parser.add_argument('--kernel', default='numpy', choices=KERNEL.get_available_backends(), help="Projection kernel backend")
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return 0
+
+    results = []
+    for input_format in args.formats:
+        for resolution in args.resolutions:
+            case = {'input_format': input_format, 'resolution': resolution, 'frames': args.frames, 'repeat': args.repeat,
+                    'kernel': args.kernel}
+            print(f"Running {input_format} {resolution}...", file=sys.stderr)
+            results.append(run_isolated(case))
+
+    report = {'machine': get_machine_info(), 'created': time.time(), 'results': results}
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare_to_baseline(results, json.load(f), args.tolerance)
+        if report['regressions']:
+            exit_code = 1
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,227 @@
+import time
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+# Returned by a read_frame callback when the frame matches the previous one and needs no projection
+REPEAT_FRAME = 'repeat'
+
+def open_shared_memory(name):
+    # Workers share the parent's resource tracker, which only unlinks blocks the parent leaks
+    # (Python 3.13+ can skip tracking attachments altogether)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+class SharedArray:
+    # A NumPy array in a named shared memory block; other processes attach to it by name without copying
+    def __init__(self, shm, shape, dtype, owner):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape, dtype):
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        return cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype, True)
+
+    @classmethod
+    def from_array(cls, array):
+        shared = cls.create(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, description, read_only=False):
+        name, shape, dtype = description
+        shared = cls(open_shared_memory(name), shape, dtype, False)
+        if read_only:
+            shared.array.flags.writeable = False
+        return shared
+
+    def describe(self):
+        # Picklable handle for other processes
+        return (self.shm.name, self.shape, self.dtype.str)
+
+    def close(self):
+        # Views must be dropped before the mapping can be closed
+        self.array = None
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (FileNotFoundError, BufferError):
+            pass
+
+class FrameRing:
+    # Fixed number of frame-sized slots in one shared block; frames are handed over by slot index
+    def __init__(self, shared):
+        self.shared = shared
+
+    @classmethod
+    def create(cls, slots, frame_shape, dtype):
+        return cls(SharedArray.create((slots,) + tuple(frame_shape), dtype))
+
+    @classmethod
+    def attach(cls, description):
+        return cls(SharedArray.attach(description))
+
+    def describe(self):
+        return self.shared.describe()
+
+    def slot_count(self):
+        return self.shared.shape[0]
+
+    def view(self, slot):
+        return self.shared.array[slot]
+
+    def close(self):
+        self.shared.close()
+
+def projection_worker(source_ring, result_ring, map_descriptions, tasks, done, free_sources, free_results):
+    # Each worker process projects with its own single OpenCV thread
+    cv2.setNumThreads(1)
+    sources = FrameRing.attach(source_ring)
+    results = FrameRing.attach(result_ring)
+    map_x, map_y = [SharedArray.attach(description, read_only=True) for description in map_descriptions]
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, slot = task
+            result_slot = free_results.get()
+            start = time.perf_counter()
+            error = None
+            try:
+                cv2.remap(sources.view(slot), map_x.array, map_y.array, cv2.INTER_NEAREST,
+                          dst=results.view(result_slot), borderMode=cv2.BORDER_CONSTANT)
+            except Exception as e:
+                error = str(e)
+            free_sources.put(slot)
+            done.put((index, result_slot, start, time.perf_counter(), error))
+    finally:
+        for shared in (map_x, map_y):
+            shared.close()
+        sources.close()
+        results.close()
+
+class ProjectionPool:
+    def __init__(self, workers, source_shape, dome_shape, dtype, map_x, map_y, slots=None):
+        # Spawned workers stay clear of the GUI process's Qt state and work the same on every platform
+        context = multiprocessing.get_context('spawn')
+        slots = slots or workers * 2 + 2
+        self.sources = FrameRing.create(slots, source_shape, dtype)
+        self.results = FrameRing.create(slots, dome_shape, dtype)
+
+        # Projection maps are shared read-only instead of being rebuilt or pickled per worker
+        self.maps = [SharedArray.from_array(map_x), SharedArray.from_array(map_y)]
+
+        self.tasks = context.Queue()
+        self.done = context.Queue()
+        self.free_sources = context.Queue()
+        self.free_results = context.Queue()
+        for slot in range(slots):
+            self.free_sources.put(slot)
+            self.free_results.put(slot)
+
+        self.processes = []
+        try:
+            for _ in range(workers):
+                process = context.Process(
+                    target=projection_worker,
+                    args=(self.sources.describe(), self.results.describe(), [shared.describe() for shared in self.maps],
+                          self.tasks, self.done, self.free_sources, self.free_results),
+                    daemon=True
+                )
+                process.start()
+                self.processes.append(process)
+        except Exception:
+            self.close()
+            raise
+
+    def get_slot(self, slots):
+        # Blocking get that notices dead workers instead of hanging
+        while True:
+            try:
+                return slots.get(timeout=1.0)
+            except queue.Empty:
+                if not all(process.is_alive() for process in self.processes):
+                    raise Exception("Projection worker exited unexpectedly")
+
+    def run(self, read_frame):
+        # Yields (index, result view, decode start, decode end, project start, project end) in frame order.
+        # read_frame(dst) decodes straight into a source slot and returns False at the end of the input, or
+        # REPEAT_FRAME when the frame matches the previous one, which then yields the previous result again.
+        # A yielded result view is only valid until the next frame is requested.
+        slots = self.sources.slot_count()
+        next_read = 0
+        next_write = 0
+        reading = True
+        pending = {}
+        decode_times = {}
+        repeats = set()
+        held_slot = None
+        try:
+            while True:
+                # The last yielded result slot is held for repeats; the frames in flight get one of the
+                # others each, so a worker can never wait on a slot held by a later frame queued for writing
+                while reading and next_read - next_write < slots - 1:
+                    slot = self.get_slot(self.free_sources)
+                    decode_start = time.perf_counter()
+                    status = read_frame(self.sources.view(slot))
+                    if not status:
+                        self.free_sources.put(slot)
+                        reading = False
+                        break
+                    decode_times[next_read] = (decode_start, time.perf_counter())
+                    if status == REPEAT_FRAME and (held_slot is not None or next_read > next_write):
+                        self.free_sources.put(slot)
+                        repeats.add(next_read)
+                    else:
+                        self.tasks.put((next_read, slot))
+                    next_read += 1
+
+                if next_write == next_read:
+                    return
+
+                decode_start, decode_end = decode_times.pop(next_write)
+                if next_write in repeats:
+                    repeats.discard(next_write)
+                    yield next_write, self.results.view(held_slot), decode_start, decode_end, decode_end, decode_end
+                    next_write += 1
+                    continue
+
+                while next_write not in pending:
+                    index, result_slot, project_start, project_end, error = self.get_slot(self.done)
+                    if error is not None:
+                        raise Exception(f"Projection worker error: {error}")
+                    pending[index] = (result_slot, project_start, project_end)
+
+                result_slot, project_start, project_end = pending.pop(next_write)
+                yield next_write, self.results.view(result_slot), decode_start, decode_end, project_start, project_end
+                if held_slot is not None:
+                    self.free_results.put(held_slot)
+                held_slot = result_slot
+                next_write += 1
+        finally:
+            if held_slot is not None:
+                self.free_results.put(held_slot)
+
+    def close(self):
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for shared in self.maps:
+            shared.close()
+        self.sources.close()
+        self.results.close()
@@ -1,19 +1,1278 @@
 import sys
+import os
+import time
+import queue
+import hashlib
+import tempfile
+import json
+import uuid
+import shutil
+import bisect
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+# OpenCV only reads and writes OpenEXR when asked to before it is imported
+os.environ.setdefault('OPENCV_IO_ENABLE_OPENEXR', '1')
 import cv2
 import numpy as np
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QPushButton, QLabel, 
                            QVBoxLayout, QHBoxLayout, QWidget, QFileDialog, QProgressBar,
                            QComboBox, QMessageBox, QFrame, QDialog, QScrollArea, QGroupBox,
-                           QSlider, QSpinBox, QDoubleSpinBox, QTextBrowser)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QPalette, QColor, QImage, QPixmap
+                           QSlider, QSpinBox, QDoubleSpinBox, QTextBrowser, QListWidget, QListWidgetItem,
+                           QCheckBox)
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QTimer, QPointF
+from PyQt6.QtGui import QFont, QPalette, QColor, QImage, QPainter
 from PIL import Image
+from frame_transport import ProjectionPool, REPEAT_FRAME
+
+# Numba is optional; without it the fused projection kernel falls back to NumPy
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# tifffile is optional; without it only .npy and .raw stills are streamed from disk
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+
+def rotation_matrix(tilt, pan, roll):
+    # Rotations are applied in order: tilt (X) -> pan (Y) -> roll (Z)
+    tilt_rad = np.radians(tilt)
+    pan_rad = np.radians(pan)
+    roll_rad = np.radians(roll)
+    
+    rot_x = np.array([[1, 0, 0],
+                      [0, np.cos(tilt_rad), -np.sin(tilt_rad)],
+                      [0, np.sin(tilt_rad), np.cos(tilt_rad)]])
+    rot_y = np.array([[np.cos(pan_rad), 0, np.sin(pan_rad)],
+                      [0, 1, 0],
+                      [-np.sin(pan_rad), 0, np.cos(pan_rad)]])
+    rot_z = np.array([[np.cos(roll_rad), -np.sin(roll_rad), 0],
+                      [np.sin(roll_rad), np.cos(roll_rad), 0],
+                      [0, 0, 1]])
+    return rot_z @ rot_y @ rot_x
+
+def build_polar_grid(dome_size, rotation=0, window=None):
+    # Zoom-independent geometry of the dome circle, or of a window (x, y, width, height) of it
+    x0, y0, window_width, window_height = window or (0, 0, dome_size, dome_size)
+    y, x = np.meshgrid(np.arange(y0, y0 + window_height), np.arange(x0, x0 + window_width), indexing='ij')
+    center = dome_size // 2
+    
+    # Calculate normalized coordinates
+    dx = (x - center) / center
+    dy = (y - center) / center
+    r = np.sqrt(dx**2 + dy**2)
+    theta = np.arctan2(dy, dx)
+    
+    # Create circular mask
+    mask = r <= 1.0
+    
+    # Apply rotation
+    theta_sph = theta[mask] - np.radians(rotation)
+    return mask, r[mask].astype(np.float32), np.cos(theta_sph).astype(np.float32), np.sin(theta_sph).astype(np.float32)
+
+def build_fisheye_directions(dome_size, zoom_factor, rotation=0, grid=None):
+    # Unrotated view direction for every pixel inside the dome circle
+    if grid is None:
+        grid = build_polar_grid(dome_size, rotation)
+    mask, r, cos_theta, sin_theta = grid
+    
+    # Apply zoom, then convert to 3D cartesian coordinates
+    phi = r * np.float32(zoom_factor * 0.5 * np.pi)
+    sin_phi = np.sin(phi)
+    directions = np.empty((3, r.size), dtype=np.float32)
+    np.multiply(sin_phi, cos_theta, out=directions[0])
+    np.multiply(sin_phi, sin_theta, out=directions[1])
+    np.cos(phi, out=directions[2])
+    return mask, directions
+
+def build_fisheye_maps(dome_size, width, height, zoom_factor, tilt, pan, roll, rotation=0,
+                       flip_h=False, flip_v=False, nearest=False, directions=None):
+    # Returns float32 source coordinates for every dome pixel; pixels outside the circle are -1
+    if directions is None:
+        directions = build_fisheye_directions(dome_size, zoom_factor, rotation)
+    mask, vectors = directions
+    
+    # Rotate all view directions at once
+    x_rot, y_rot, z_rot = rotation_matrix(tilt, pan, roll).astype(np.float32) @ vectors
+    
+    # Convert back to spherical coordinates
+    phi_rot = np.arccos(np.clip(z_rot, -1.0, 1.0))
+    theta_rot = np.arctan2(y_rot, x_rot)
+    
+    # Convert to image coordinates with wraparound and clipping (float np.mod is slow, and only theta == pi wraps)
+    x_src = ((theta_rot + np.pi) / (2 * np.pi)) * width
+    x_src[x_src >= width] -= width
+    y_src = np.clip((phi_rot / np.pi) * height, 0, height - 1)
+    
+    # Nearest sampling truncates like the original integer lookup
+    if nearest:
+        x_src = np.floor(x_src)
+        y_src = np.floor(y_src)
+    
+    # Fold flips into the lookup instead of flipping the frame
+    if flip_h:
+        x_src = (width - 1) - x_src
+    if flip_v:
+        y_src = (height - 1) - y_src
+    
+    map_x = np.full(mask.shape, -1, dtype=np.float32)
+    map_y = np.full(mask.shape, -1, dtype=np.float32)
+    map_x[mask] = np.clip(x_src, 0, width - 1)
+    map_y[mask] = np.clip(y_src, 0, height - 1)
+    return map_x, map_y
+
+def interpolate_maps(start_maps, end_maps, t, width):
+    # Blend two continuous maps, unwrapping the horizontal step across the 360 degree seam
+    start_x, start_y = start_maps
+    end_x, end_y = end_maps
+    step_x = end_x - start_x
+    step_x[step_x > width / 2] -= width
+    step_x[step_x < -width / 2] += width
+    map_x = start_x + step_x * np.float32(t)
+    map_y = start_y + (end_y - start_y) * np.float32(t)
+    map_x[map_x < 0] += width
+    map_x[map_x >= width] -= width
+    return map_x, map_y
+
+def finalize_maps(map_x, map_y, outside, width, height, nearest=False, flip_h=False, flip_v=False):
+    # Same post-processing as build_fisheye_maps, applied to whole continuous maps in place
+    if nearest:
+        np.floor(map_x, out=map_x)
+        np.floor(map_y, out=map_y)
+    if flip_h:
+        np.subtract(width - 1, map_x, out=map_x)
+    if flip_v:
+        np.subtract(height - 1, map_y, out=map_y)
+    np.clip(map_x, 0, width - 1, out=map_x)
+    np.clip(map_y, 0, height - 1, out=map_y)
+    map_x[outside] = -1
+    map_y[outside] = -1
+    return map_x, map_y
+
+# Output projections by UI label; the inverse ones take a fulldome master as input
+OUTPUT_PROJECTIONS = {
+    'Fulldome': 'fulldome',
+    'Equirectangular (from dome)': 'equirectangular',
+    'Cubemap (from dome)': 'cubemap'
+}
+
+# Cubemap faces side by side in this order, each as (name, forward, right, up) in the forward projection's
+# world axes: +x is the center of an equirect, +y a quarter turn to its right and +z its top row
+CUBE_FACES = (
+    ('front', (1, 0, 0), (0, 1, 0), (0, 0, 1)),
+    ('right', (0, 1, 0), (-1, 0, 0), (0, 0, 1)),
+    ('back', (-1, 0, 0), (0, -1, 0), (0, 0, 1)),
+    ('left', (0, -1, 0), (1, 0, 0), (0, 0, 1)),
+    ('top', (0, 0, 1), (0, 1, 0), (-1, 0, 0)),
+    ('bottom', (0, 0, -1), (0, 1, 0), (1, 0, 0))
+)
+
+def get_projection_shape(projection, size):
+    # (height, width) of an output: a square dome, a 2:1 equirect or a strip of six square faces
+    if projection == 'equirectangular':
+        return size, size * 2
+    if projection == 'cubemap':
+        return size, size * 6
+    return size, size
+
+def build_view_directions(projection, size):
+    # Unit view direction through the center of every output pixel, shape (3, height, width)
+    height, width = get_projection_shape(projection, size)
+    directions = np.empty((3, height, width), dtype=np.float32)
+    if projection == 'equirectangular':
+        theta = (np.arange(width, dtype=np.float32) + 0.5) * np.float32(2 * np.pi / width) - np.float32(np.pi)
+        phi = (np.arange(height, dtype=np.float32) + 0.5) * np.float32(np.pi / height)
+        sin_phi = np.sin(phi)[:, None]
+        np.multiply(sin_phi, np.cos(theta), out=directions[0])
+        np.multiply(sin_phi, np.sin(theta), out=directions[1])
+        directions[2] = np.cos(phi)[:, None]
+        return directions
+    
+    # Face coordinates run from -1 to 1, rows top to bottom
+    offsets = (np.arange(size, dtype=np.float32) + 0.5) * np.float32(2 / size) - 1
+    across, down = offsets[None, :], offsets[:, None]
+    for index, (_, forward, right, up) in enumerate(CUBE_FACES):
+        face = directions[:, :, index * size:(index + 1) * size]
+        for axis in range(3):
+            face[axis] = forward[axis] + across * right[axis] - down * up[axis]
+    directions /= np.sqrt((directions ** 2).sum(axis=0))
+    return directions
+
+def build_inverse_maps(projection, size, dome_size, zoom_factor, tilt, pan, roll, rotation=0,
+                       flip_h=False, flip_v=False, nearest=False, directions=None):
+    # Dome master coordinates for every pixel of an equirect or cubemap output: the forward projection
+    # run backwards, so the same tilt/pan/roll/zoom settings undo a forward conversion. Pixels the
+    # dome doesn't cover are -1
+    if directions is None:
+        directions = build_view_directions(projection, size)
+    shape = directions.shape[1:]
+    x, y, z = directions.reshape(3, -1)
+    
+    # The forward flips mirror the source, so here they mirror the view
+    if flip_h:
+        y = -y
+    if flip_v:
+        z = -z
+    
+    # The transposed rotation takes world directions back into the dome's frame
+    dome_x, dome_y, dome_z = rotation_matrix(tilt, pan, roll).astype(np.float32).T @ np.stack([x, y, z])
+    
+    # Back to polar dome coordinates, undoing zoom and rotation
+    r = np.arccos(np.clip(dome_z, -1.0, 1.0)) / np.float32(zoom_factor * 0.5 * np.pi)
+    theta = np.arctan2(dome_y, dome_x) + np.float32(np.radians(rotation))
+    center = dome_size // 2
+    map_x = center + r * np.cos(theta) * center
+    map_y = center + r * np.sin(theta) * center
+    
+    # Nearest sampling picks the closest dome pixel
+    if nearest:
+        np.rint(map_x, out=map_x)
+        np.rint(map_y, out=map_y)
+    np.clip(map_x, 0, dome_size - 1, out=map_x)
+    np.clip(map_y, 0, dome_size - 1, out=map_y)
+    outside = r > 1.0
+    map_x[outside] = -1
+    map_y[outside] = -1
+    return map_x.reshape(shape), map_y.reshape(shape)
+
+def get_axis_footprint(values, valid, axis, period=None):
+    # Source distance covered by one dome pixel step along an axis (larger of the forward and backward step)
+    step = np.diff(values, axis=axis)
+    if period is not None:
+        step[step > period / 2] -= period
+        step[step < -period / 2] += period
+    np.abs(step, out=step)
+    
+    # Steps that touch the outside of the circle are meaningless
+    if axis == 0:
+        step[~(valid[:-1] & valid[1:])] = 0
+        footprint = np.zeros_like(values)
+        footprint[:-1] = step
+        np.maximum(footprint[1:], step, out=footprint[1:])
+    else:
+        step[~(valid[:, :-1] & valid[:, 1:])] = 0
+        footprint = np.zeros_like(values)
+        footprint[:, :-1] = step
+        np.maximum(footprint[:, 1:], step, out=footprint[:, 1:])
+    return footprint
+
+def get_level_size(size, level, gaussian=False):
+    # Box levels halve (rounding down), pyrDown levels round up
+    for _ in range(level):
+        size = (size + 1) // 2 if gaussian else max(1, size // 2)
+    return size
+
+def get_footprints(map_x, map_y, width):
+    # Source pixels covered by one dome pixel along the source's horizontal and vertical axes
+    valid = map_x >= 0
+    extent_x = np.maximum(get_axis_footprint(map_x, valid, 1, width), get_axis_footprint(map_x, valid, 0, width))
+    extent_y = np.maximum(get_axis_footprint(map_y, valid, 1), get_axis_footprint(map_y, valid, 0))
+    return valid, extent_x, extent_y
+
+def build_level_plan(map_x, map_y, valid, level_x, level_y, width, height, interpolation, gaussian=False, chunk=4096):
+    # Turn per-pixel pyramid levels into sampling maps, built once and reused for every frame
+    max_key = int(max(level_x.max(), level_y.max())) + 1
+    keys = level_x.ravel() * max_key + level_y.ravel()
+    index = np.flatnonzero(valid)
+    keys = keys[index]
+    
+    def to_level(values, size, level_size, group):
+        # Texel-centre aligned coordinates in the level
+        return np.clip((values.ravel()[group] + 0.5) * (level_size / size) - 0.5, 0, level_size - 1)
+    
+    # The most common level is sampled in place with dome-sized maps; -1 leaves the other pixels black
+    counts = np.bincount(keys, minlength=1) if keys.size else np.zeros(1, dtype=np.int64)
+    base_key = int(np.argmax(counts))
+    base_level = divmod(base_key, max_key)
+    in_base = keys == base_key
+    base_group = index[in_base]
+    base_x = np.full(map_x.shape, -1, dtype=np.float32)
+    base_y = np.full(map_y.shape, -1, dtype=np.float32)
+    base_x.ravel()[base_group] = to_level(map_x, width, get_level_size(width, base_level[0], gaussian), base_group)
+    base_y.ravel()[base_group] = to_level(map_y, height, get_level_size(height, base_level[1], gaussian), base_group)
+    
+    # The remaining pixels are grouped by level so each level is sampled with one remap call
+    index = index[~in_base]
+    keys = keys[~in_base]
+    order = np.argsort(keys, kind='stable')
+    index = index[order]
+    keys = keys[order]
+    splits = np.flatnonzero(np.diff(keys)) + 1
+    
+    levels = []
+    for group, start in zip(np.split(index, splits), np.concatenate([[0], splits]).astype(np.int64)):
+        if group.size == 0:
+            continue
+        lx, ly = divmod(int(keys[start]), max_key)
+        
+        # Padded into rows, since remap is limited to 32767 columns
+        rows = -(-group.size // chunk)
+        level_map_x = np.zeros(rows * chunk, dtype=np.float32)
+        level_map_y = np.zeros(rows * chunk, dtype=np.float32)
+        level_map_x[:group.size] = to_level(map_x, width, get_level_size(width, lx, gaussian), group)
+        level_map_y[:group.size] = to_level(map_y, height, get_level_size(height, ly, gaussian), group)
+        levels.append(((lx, ly), group, level_map_x.reshape(rows, chunk), level_map_y.reshape(rows, chunk)))
+    
+    return {
+        'kind': 'levels',
+        'base': (base_level, base_x, base_y),
+        'levels': levels,
+        'interpolation': interpolation,
+        'gaussian': gaussian
+    }
+
+def build_lod_plan(map_x, map_y, width, height, max_level=10):
+    # Per-pixel level of detail from the mapping's Jacobian. Levels are anisotropic (horizontal and
+    # vertical halvings) because equirect distortion stretches mostly along latitude near the poles.
+    valid, extent_x, extent_y = get_footprints(map_x, map_y, width)
+    
+    # Nearest level whose texels match the footprint
+    max_x = min(max_level, max(int(np.log2(width)) - 2, 0))
+    max_y = min(max_level, max(int(np.log2(height)) - 2, 0))
+    level_x = np.clip(np.floor(np.log2(np.maximum(extent_x, 1)) + 0.5), 0, max_x).astype(np.int64)
+    level_y = np.clip(np.floor(np.log2(np.maximum(extent_y, 1)) + 0.5), 0, max_y).astype(np.int64)
+    return build_level_plan(map_x, map_y, valid, level_x, level_y, width, height, cv2.INTER_LINEAR)
+
+def build_region_plan(map_x, map_y, width, height, region=32, max_level=10):
+    # One Gaussian pyramid level per output region, for outputs much smaller than the source. Each region
+    # takes the coarsest level that is still no coarser than its finest footprint, so nothing is overblurred
+    # and sampling reads a small, prefiltered level instead of gathering across the full-resolution frame.
+    valid, extent_x, extent_y = get_footprints(map_x, map_y, width)
+    footprint = np.minimum(extent_x, extent_y)
+    # Rim pixels without a valid neighbour along an axis measure no step at all; they must not pull
+    # their whole region down to full resolution
+    footprint[~valid | (footprint == 0)] = np.inf
+    
+    output_height, output_width = map_x.shape
+    tiles_y = -(-output_height // region)
+    tiles_x = -(-output_width // region)
+    padded = np.full((tiles_y * region, tiles_x * region), np.inf, dtype=np.float32)
+    padded[:output_height, :output_width] = footprint
+    region_footprint = padded.reshape(tiles_y, region, tiles_x, region).min(axis=(1, 3))
+    region_footprint[np.isinf(region_footprint)] = 1
+    
+    max_level = min(max_level, max(int(np.log2(min(width, height))) - 2, 0))
+    region_level = np.clip(np.floor(np.log2(np.maximum(region_footprint, 1))), 0, max_level).astype(np.int64)
+    if not region_level.any():
+        return None
+    level = np.repeat(np.repeat(region_level, region, axis=0), region, axis=1)[:output_height, :output_width]
+    return build_level_plan(map_x, map_y, valid, level, level, width, height, cv2.INTER_NEAREST, gaussian=True)
+
+def build_tiled_plan(map_x, map_y, width, height, tile=64, chunk=4096):
+    # Output pixels reordered by source tile (then row-major within the tile), so the gather walks the
+    # source in cache-sized blocks instead of jumping across the whole frame
+    index = np.flatnonzero(map_x >= 0)
+    source_x = map_x.ravel()[index].astype(np.int64)
+    source_y = map_y.ravel()[index].astype(np.int64)
+    tiles_x = -(-width // tile)
+    keys = ((source_y // tile) * tiles_x + source_x // tile) * (tile * tile) + (source_y % tile) * tile + source_x % tile
+    index = index[np.argsort(keys, kind='stable')]
+    
+    rows = -(-index.size // chunk)
+    sorted_x = np.zeros(rows * chunk, dtype=np.float32)
+    sorted_y = np.zeros(rows * chunk, dtype=np.float32)
+    sorted_x[:index.size] = map_x.ravel()[index]
+    sorted_y[:index.size] = map_y.ravel()[index]
+    
+    # The scatter back is itself a remap over the small sorted buffer, which beats NumPy fancy assignment
+    position = np.full(map_x.size, -1, dtype=np.int64)
+    position[index] = np.arange(index.size)
+    scatter_x = np.where(position >= 0, position % chunk, -1).astype(np.float32).reshape(map_x.shape)
+    scatter_y = np.where(position >= 0, position // chunk, -1).astype(np.float32).reshape(map_x.shape)
+    return {
+        'kind': 'tiled',
+        'sorted': (sorted_x.reshape(rows, chunk), sorted_y.reshape(rows, chunk)),
+        'scatter': (scatter_x, scatter_y)
+    }
+
+def sample_tiled_plan(frame, plan, interpolation=cv2.INTER_NEAREST):
+    samples = remap_frame(frame, plan['sorted'][0], plan['sorted'][1], interpolation)
+    return remap_frame(samples, plan['scatter'][0], plan['scatter'][1], cv2.INTER_NEAREST)
+
+def get_pyramid_level(pyramid, lx, ly, gaussian=False):
+    # Levels are built on demand from the nearest already-reduced parent
+    if (lx, ly) not in pyramid:
+        source_dtype = None
+        if gaussian:
+            parent = get_pyramid_level(pyramid, lx - 1, ly - 1, gaussian)
+        elif lx > 0:
+            parent = get_pyramid_level(pyramid, lx - 1, ly)
+            size = (max(1, parent.shape[1] // 2), parent.shape[0])
+        else:
+            parent = get_pyramid_level(pyramid, lx, ly - 1)
+            size = (parent.shape[1], max(1, parent.shape[0] // 2))
+        if parent.dtype == np.float16:
+            source_dtype = parent.dtype
+            parent = parent.astype(np.float32)
+        
+        if gaussian:
+            level = cv2.pyrDown(parent)
+        else:
+            # At an exact 2:1 reduction linear resize averages texel pairs, the same box filter as INTER_AREA
+            # but several times faster
+            level = cv2.resize(parent, size, interpolation=cv2.INTER_LINEAR)
+        pyramid[(lx, ly)] = level if source_dtype is None else level.astype(source_dtype)
+    return pyramid[(lx, ly)]
+
+def sample_level_plan(frame, plan, pyramid=None):
+    # Only the pyramid levels the plan uses are built; pass a pyramid dict to reuse levels across calls
+    if pyramid is None:
+        pyramid = {}
+    pyramid[(0, 0)] = frame
+    gaussian = plan['gaussian']
+    interpolation = plan['interpolation']
+    
+    (base_x_level, base_y_level), base_x, base_y = plan['base']
+    result = remap_frame(get_pyramid_level(pyramid, base_x_level, base_y_level, gaussian), base_x, base_y, interpolation)
+    channels = frame.shape[2]
+    flat = result.reshape(-1, channels)
+    for (lx, ly), index, map_x, map_y in plan['levels']:
+        source = get_pyramid_level(pyramid, lx, ly, gaussian)
+        samples = remap_frame(source, map_x, map_y, interpolation)
+        flat[index] = samples.reshape(-1, channels)[:index.size]
+    return result
+
+def get_nbytes(value):
+    # Memory held by an array or a (nested) tuple of arrays
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(get_nbytes(item) for item in value)
+    return 0
+
+class ProjectionMapCache:
+    def __init__(self, max_mb=1024):
+        # Maps, view directions and polar grids share one memory budget and leave least recently used first;
+        # a full-size 8K map pair alone is over 500 MB, so a count limit could hold several GB after one export
+        self.max_mb = max_mb
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+            
+    def count(self, kind):
+        with self.lock:
+            return sum(1 for key in self.entries if key[0] == kind)
+        
+    def _lookup(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        return None
+    
+    def _store(self, key, value):
+        size = get_nbytes(value)
+        with self.lock:
+            # Anything bigger than the whole budget is a one-off and isn't kept at all
+            if size > self.max_mb * 1024 * 1024 or key in self.entries:
+                return value
+            self.entries[key] = value
+            self.nbytes += size
+            while self.nbytes > self.max_mb * 1024 * 1024:
+                self.nbytes -= get_nbytes(self.entries.popitem(last=False)[1])
+        return value
+        
+    def get_grid(self, dome_size, rotation=0):
+        key = ('grid', dome_size, float(rotation))
+        grid = self._lookup(key)
+        if grid is None:
+            grid = self._store(key, build_polar_grid(dome_size, rotation))
+        return grid
+        
+    def get_directions(self, dome_size, zoom_factor, rotation=0, store=True):
+        key = ('directions', dome_size, float(zoom_factor), float(rotation))
+        directions = self._lookup(key)
+        if directions is None:
+            grid = self.get_grid(dome_size, rotation)
+            directions = build_fisheye_directions(dome_size, zoom_factor, rotation, grid)
+            if store:
+                self._store(key, directions)
+        return directions
+    
+    def get_maps(self, dome_size, width, height, zoom_factor, tilt, pan, roll, rotation=0,
+                 flip_h=False, flip_v=False, nearest=False, store=True):
+        key = ('maps', dome_size, width, height, float(zoom_factor), float(tilt), float(pan), float(roll),
+               float(rotation), bool(flip_h), bool(flip_v), bool(nearest))
+        maps = self._lookup(key)
+        if maps is None:
+            # Only the rotation step is recomputed when the geometry is already cached
+            directions = self.get_directions(dome_size, zoom_factor, rotation)
+            maps = build_fisheye_maps(dome_size, width, height, zoom_factor, tilt, pan, roll, rotation,
+                                      flip_h, flip_v, nearest, directions)
+            # Per-frame animated maps are not stored so they don't evict the static ones
+            if store:
+                self._store(key, maps)
+        return maps
+
+    def get_inverse_maps(self, projection, size, dome_size, zoom_factor, tilt, pan, roll, rotation=0,
+                         flip_h=False, flip_v=False, nearest=False, store=True):
+        key = ('maps', projection, size, dome_size, float(zoom_factor), float(tilt), float(pan), float(roll),
+               float(rotation), bool(flip_h), bool(flip_v), bool(nearest))
+        maps = self._lookup(key)
+        if maps is None:
+            # Output view directions don't depend on the view settings, so they are kept like the dome geometry
+            directions = self._lookup(('directions', projection, size))
+            if directions is None:
+                directions = self._store(('directions', projection, size), build_view_directions(projection, size))
+            maps = build_inverse_maps(projection, size, dome_size, zoom_factor, tilt, pan, roll, rotation,
+                                      flip_h, flip_v, nearest, directions)
+            if store:
+                self._store(key, maps)
+        return maps
+
+MAP_CACHE = ProjectionMapCache()
+
+class PyramidCache:
+    def __init__(self, max_entries=2):
+        self.max_entries = max_entries
+        self.pyramids = OrderedDict()
+        self.lock = threading.Lock()
+        
+    def clear(self):
+        with self.lock:
+            self.pyramids.clear()
+        
+    def get(self, path, frame, gaussian, part=None):
+        # Levels of a still are reused while the file is unchanged; large pyramids are memory hungry,
+        # so only the last few images are kept
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        key = (os.path.abspath(path), part, mtime, frame.shape, frame.dtype.str, bool(gaussian))
+        with self.lock:
+            if key not in self.pyramids:
+                self.pyramids[key] = {}
+                while len(self.pyramids) > self.max_entries:
+                    self.pyramids.popitem(last=False)
+            self.pyramids.move_to_end(key)
+            return self.pyramids[key]
+
+PYRAMID_CACHE = PyramidCache()
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def fused_fisheye_kernel(frame, out, directions, pixel_index, matrix, flip_h, flip_v, nearest, round_offset):
+        # Rotation, source coordinate and sample for each dome pixel in one pass, no temporaries
+        height, width, channels = frame.shape
+        dome_size = out.shape[1]
+        for i in numba.prange(pixel_index.shape[0]):
+            vx = directions[0, i]
+            vy = directions[1, i]
+            vz = directions[2, i]
+            x_rot = matrix[0, 0] * vx + matrix[0, 1] * vy + matrix[0, 2] * vz
+            y_rot = matrix[1, 0] * vx + matrix[1, 1] * vy + matrix[1, 2] * vz
+            z_rot = min(max(matrix[2, 0] * vx + matrix[2, 1] * vy + matrix[2, 2] * vz, -1.0), 1.0)
+            
+            # Same wrap, clip and flip rules as build_fisheye_maps
+            x_src = (np.arctan2(y_rot, x_rot) + np.pi) / (2 * np.pi) * width
+            if x_src >= width:
+                x_src -= width
+            y_src = min(max(np.arccos(z_rot) / np.pi * height, 0.0), height - 1.0)
+            if nearest:
+                x_src = np.floor(x_src)
+                y_src = np.floor(y_src)
+            if flip_h:
+                x_src = (width - 1) - x_src
+            if flip_v:
+                y_src = (height - 1) - y_src
+            x_src = min(max(x_src, 0.0), width - 1.0)
+            y_src = min(max(y_src, 0.0), height - 1.0)
+            
+            row = pixel_index[i] // dome_size
+            col = pixel_index[i] % dome_size
+            x0 = int(x_src)
+            y0 = int(y_src)
+            if nearest:
+                for c in range(channels):
+                    out[row, col, c] = frame[y0, x0, c]
+                continue
+            
+            # Bilinear sample, wrapping horizontally across the 360 degree seam
+            fx = x_src - x0
+            fy = y_src - y0
+            x1 = x0 + 1 if x0 + 1 < width else 0
+            y1 = min(y0 + 1, height - 1)
+            for c in range(channels):
+                top = frame[y0, x0, c] * (1.0 - fx) + frame[y0, x1, c] * fx
+                bottom = frame[y1, x0, c] * (1.0 - fx) + frame[y1, x1, c] * fx
+                out[row, col, c] = top * (1.0 - fy) + bottom * fy + round_offset
+
+class ProjectionKernel:
+    def __init__(self):
+        self.backend = 'numpy'
+        self.validated = {'numpy'}
+        self.pixel_indices = OrderedDict()
+        
+    def get_available_backends(self):
+        return ['numpy'] + (['numba'] if numba is not None else [])
+        
+    def is_fused(self):
+        return self.backend != 'numpy'
+        
+    def set_backend(self, name):
+        if name not in self.get_available_backends():
+            raise Exception(f"Kernel backend not available: {name}")
+        # A backend is only used once it has matched the NumPy reference on this machine
+        if name not in self.validated:
+            self.validate(name)
+            self.validated.add(name)
+        self.backend = name
+        
+    def get_pixel_index(self, mask):
+        # Flat output position of each direction vector, kept for the last few dome sizes
+        key = mask.shape[0]
+        if key not in self.pixel_indices:
+            self.pixel_indices[key] = np.flatnonzero(mask)
+            while len(self.pixel_indices) > 4:
+                self.pixel_indices.popitem(last=False)
+        return self.pixel_indices[key]
+        
+    def project(self, frame, dome_size, zoom_factor, tilt, pan, roll, rotation=0,
+                flip_h=False, flip_v=False, nearest=False, out=None, backend=None):
+        backend = backend or self.backend
+        if out is None:
+            out = np.empty((dome_size, dome_size) + frame.shape[2:], dtype=frame.dtype)
+        
+        # Both paths share the cached zoom-dependent view directions
+        mask, vectors = directions = MAP_CACHE.get_directions(dome_size, zoom_factor, rotation, store=False)
+        
+        # Numba has no half-float arithmetic; nearest lookups still work on the raw bits
+        if backend == 'numba' and frame.dtype == np.float16:
+            if not nearest:
+                backend = 'numpy'
+            else:
+                self.project(frame.view(np.uint16), dome_size, zoom_factor, tilt, pan, roll, rotation,
+                             flip_h, flip_v, nearest, out.view(np.uint16), backend)
+                return out
+        
+        if backend == 'numba':
+            source = np.ascontiguousarray(frame)
+            round_offset = 0.5 if np.issubdtype(frame.dtype, np.integer) else 0.0
+            out[~mask] = 0
+            fused_fisheye_kernel(
+                source if source.ndim == 3 else source[:, :, None], out if out.ndim == 3 else out[:, :, None],
+                vectors, self.get_pixel_index(mask), rotation_matrix(tilt, pan, roll).astype(np.float32),
+                flip_h, flip_v, nearest, round_offset
+            )
+            return out
+        
+        # Reference path: build the lookup maps, then sample them
+        height, width = frame.shape[:2]
+        map_x, map_y = build_fisheye_maps(dome_size, width, height, zoom_factor, tilt, pan, roll, rotation,
+                                          flip_h, flip_v, nearest, directions)
+        interpolation = cv2.INTER_NEAREST if nearest else cv2.INTER_LINEAR
+        return remap_frame(frame, map_x, map_y, interpolation, dst=out)
+        
+    def validate(self, name):
+        # Compare against the NumPy path on a noisy test frame (this also triggers JIT compilation)
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (256, 512, 3), dtype=np.uint8)
+        for nearest, flip in [(True, False), (False, True)]:
+            params = (255, 1.1, 20, 35, -10, 15, flip, flip, nearest)
+            expected = self.project(frame, *params, backend='numpy').astype(np.float32)
+            result = self.project(frame, *params, backend=name).astype(np.float32)
+            diff = np.abs(result - expected)
+            
+            # Nearest lookups may land on the neighbouring texel at float32/float64 rounding boundaries
+            mismatch = np.mean(np.any(diff > 0, axis=2)) if nearest else np.mean(diff)
+            limit = 0.01 if nearest else 1.0
+            if mismatch > limit:
+                raise Exception(f"Kernel backend {name} does not match the NumPy reference ({mismatch:.4f} > {limit})")
+
+KERNEL = ProjectionKernel()
+
+def get_rss_mb():
+    # Current resident set size, where the platform makes it cheap to read
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
+
+class StageProfiler:
+    def __init__(self, history=120, max_events=200000):
+        self.enabled = False
+        self.history = history
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=max_events)
+        self.thread_names = {}
+        self.stage_history = {}
+        self.counters = {}
+        
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        
+    def reset(self):
+        with self.lock:
+            self.origin = time.perf_counter()
+            self.events.clear()
+            self.stage_history.clear()
+            self.counters.clear()
+        
+    def record(self, name, start, end, category='stage'):
+        if not self.enabled:
+            return
+        thread_id = threading.get_ident()
+        with self.lock:
+            self.events.append(('X', name, category, start, end - start, thread_id))
+            self.thread_names.setdefault(thread_id, threading.current_thread().name)
+            if name not in self.stage_history:
+                self.stage_history[name] = deque(maxlen=self.history)
+            self.stage_history[name].append(end - start)
+        
+    @contextmanager
+    def span(self, name, category='stage'):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter(), category)
+        
+    def count(self, name, value):
+        # Counters cover queue depths and memory
+        if not self.enabled:
+            return
+        thread_id = threading.get_ident()
+        with self.lock:
+            self.events.append(('C', name, 'counter', time.perf_counter(), value, thread_id))
+            self.counters[name] = value
+        
+    def sample_memory(self):
+        if self.enabled:
+            rss = get_rss_mb()
+            if rss is not None:
+                self.count('rss_mb', round(rss, 1))
+        
+    def summary(self):
+        # Rolling averages over the last `history` samples of each stage
+        with self.lock:
+            stages = {
+                name: {
+                    'avg_ms': sum(samples) / len(samples) * 1000,
+                    'max_ms': max(samples) * 1000,
+                    'count': len(samples)
+                }
+                for name, samples in self.stage_history.items() if samples
+            }
+            return {'stages': stages, 'counters': dict(self.counters)}
+        
+    def export_chrome_trace(self, path):
+        # Chrome trace event format, readable by chrome://tracing and Perfetto
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+            origin = self.origin
+        
+        trace_events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id, 'args': {'name': name}}
+            for thread_id, name in thread_names.items()
+        ]
+        for kind, name, category, start, value, thread_id in events:
+            timestamp = (start - origin) * 1e6
+            if kind == 'X':
+                trace_events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': timestamp,
+                                     'dur': value * 1e6, 'pid': pid, 'tid': thread_id})
+            else:
+                trace_events.append({'name': name, 'cat': category, 'ph': 'C', 'ts': timestamp,
+                                     'pid': pid, 'tid': thread_id, 'args': {name: value}})
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+PROFILER = StageProfiler()
+
+# Output depth choices; 'source' keeps whatever depth the input was read with
+OUTPUT_DEPTHS = {
+    'Source': 'source',
+    '8-bit': 'uint8',
+    '16-bit': 'uint16',
+    'Half float': 'float16',
+    'Float': 'float32'
+}
+
+# Still formats that can carry an alpha channel
+ALPHA_FORMATS = ('.png', '.tif', '.tiff', '.exr')
+
+# Depths each still format can store
+WRITE_DEPTHS = {
+    '.jpg': ('uint8',),
+    '.jpeg': ('uint8',),
+    '.png': ('uint8', 'uint16'),
+    '.tif': ('uint8', 'uint16', 'float32'),
+    '.tiff': ('uint8', 'uint16', 'float32'),
+    '.exr': ('float16', 'float32'),
+    '.hdr': ('float32',)
+}
+
+def get_depth_scale(dtype):
+    # Integer images span their full range, float images span 0..1 (HDR may exceed 1)
+    dtype = np.dtype(dtype)
+    return float(np.iinfo(dtype).max) if dtype.kind in 'ui' else 1.0
+
+def convert_depth(image, dtype):
+    dtype = np.dtype(dtype)
+    if image.dtype == dtype:
+        return image
+    scale = get_depth_scale(dtype) / get_depth_scale(image.dtype)
+    if dtype.kind in 'ui':
+        scaled = image.astype(np.float32) * np.float32(scale)
+        return np.clip(np.rint(scaled), 0, np.iinfo(dtype).max).astype(dtype)
+    if scale == 1.0:
+        return image.astype(dtype)
+    return (image.astype(np.float32) * np.float32(scale)).astype(dtype)
+
+def read_image(path, keep_alpha=False):
+    # Keep 16-bit and float data (PNG/TIFF/EXR/HDR) instead of letting OpenCV reduce it to 8-bit
+    image = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    if image is None:
+        return None
+    return normalize_channels(image, keep_alpha)
+
+def normalize_channels(image, keep_alpha=False):
+    if image.dtype == np.float64:
+        image = image.astype(np.float32)
+    if image.ndim == 2:
+        image = image[:, :, None]
+    
+    # Gray and gray + alpha become BGR / BGRA
+    if image.shape[2] <= 2:
+        image = np.concatenate([image[:, :, :1]] * 3 + [image[:, :, 1:]], axis=2)
+    if image.shape[2] == 4 and not keep_alpha:
+        image = image[:, :, :3]
+    return np.ascontiguousarray(image)
+
+def add_opaque_alpha(image):
+    # Full alpha on the source; sampling then leaves zero alpha outside the dome circle
+    if image.shape[2] == 4:
+        return image
+    if image.dtype != np.float16:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2BGRA)
+    alpha = np.ones(image.shape[:2] + (1,), dtype=image.dtype)
+    return np.concatenate([image, alpha], axis=2)
+
+def flatten_alpha(image):
+    # Premultiply so transparent areas show as the black dome background
+    if image.shape[2] != 4:
+        return image
+    alpha = image[:, :, 3:].astype(np.float32) / np.float32(get_depth_scale(image.dtype))
+    return (image[:, :, :3] * alpha).astype(image.dtype)
+
+def get_write_depth(path, dtype):
+    # Closest depth the format can store, never narrower than the data when avoidable
+    dtype = np.dtype(dtype)
+    supported = [np.dtype(depth) for depth in WRITE_DEPTHS.get(os.path.splitext(path)[1].lower(), ('uint8',))]
+    if dtype in supported:
+        return dtype
+    same_kind = [depth for depth in supported if (depth.kind == 'f') == (dtype.kind == 'f')] or supported
+    wider = [depth for depth in same_kind if depth.itemsize >= dtype.itemsize]
+    return wider[0] if wider else same_kind[-1]
+
+def write_image(path, image):
+    if os.path.splitext(path)[1].lower() in ('.npy', '.raw'):
+        # Mapped formats OpenCV can't write
+        output = MappedImage.create(path, image.shape[0], image.shape[1], image.shape[2], image.dtype)
+        output.write(0, 0, image)
+        output.close()
+        return
+    if image.shape[2] == 4 and os.path.splitext(path)[1].lower() not in ALPHA_FORMATS:
+        image = image[:, :, :3]
+    image = convert_depth(np.ascontiguousarray(image), get_write_depth(path, image.dtype))
+    params = []
+    if image.dtype == np.float16:
+        # imwrite takes float32 data and stores it as half floats
+        image = image.astype(np.float32)
+        params = [cv2.IMWRITE_EXR_TYPE, cv2.IMWRITE_EXR_TYPE_HALF]
+    if not cv2.imwrite(path, image, params):
+        raise Exception("Failed to write output image")
+
+def remap_frame(frame, map_x, map_y, interpolation, dst=None):
+    # cv2.remap has no float16 support: nearest lookups copy the raw bits as uint16, filtered ones go via float32
+    if frame.dtype == np.float16:
+        if interpolation == cv2.INTER_NEAREST:
+            result = cv2.remap(frame.view(np.uint16), map_x, map_y, interpolation,
+                               dst=None if dst is None else dst.view(np.uint16), borderMode=cv2.BORDER_CONSTANT)
+            return result.view(np.float16)
+        result = cv2.remap(frame.astype(np.float32), map_x, map_y, interpolation, borderMode=cv2.BORDER_CONSTANT)
+        if dst is None:
+            return result.astype(np.float16)
+        dst[...] = result
+        return dst
+    return cv2.remap(frame, map_x, map_y, interpolation, dst=dst, borderMode=cv2.BORDER_CONSTANT)
+
+# Stills above this many pixels are projected tile by tile from a memory-mapped file when the format
+# allows it (.npy and .raw always are), so peak memory follows the tile size instead of the panorama
+STREAMING_PIXELS = 16384 * 8192
+STREAMING_EXTENSIONS = ('.npy', '.raw', '.tif', '.tiff')
+STREAMING_TILE = 1024
+
+def get_sidecar_path(path):
+    # Raw pixels are described by shot.raw.json: width, height, channels, dtype, offset and order
+    return path + ".json"
+
+def is_streaming_source(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.npy', '.raw'):
+        return True
+    if extension not in STREAMING_EXTENSIONS or tifffile is None:
+        return False
+    # Compressed TIFFs can't be mapped and are decoded whole as before
+    try:
+        with tifffile.TiffFile(path) as tif:
+            page = tif.pages[0]
+            return page.is_memmappable and int(np.prod(page.shape[:2])) > STREAMING_PIXELS
+    except Exception:
+        return False
+
+class MappedImage:
+    # Memory-mapped (height, width, channels) pixels; only the regions that are read get paged in
+    def __init__(self, pixels, bgr=False):
+        if pixels.ndim == 2:
+            pixels = pixels[:, :, None]
+        if pixels.ndim != 3 or pixels.shape[2] > 4:
+            raise Exception(f"Unsupported pixel layout {pixels.shape}")
+        self.pixels = pixels
+        self.height, self.width, self.channels = pixels.shape
+        # Files written outside OpenCV are RGB unless their sidecar says otherwise
+        self.bgr = bgr
+        
+    @classmethod
+    def open(cls, path):
+        extension = os.path.splitext(path)[1].lower()
+        info = {}
+        if os.path.exists(get_sidecar_path(path)):
+            with open(get_sidecar_path(path), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        try:
+            if extension == '.npy':
+                pixels = np.load(path, mmap_mode='r')
+            elif extension == '.raw':
+                shape = (int(info['height']), int(info['width']), int(info.get('channels', 3)))
+                pixels = np.memmap(path, dtype=info.get('dtype', 'uint8'), mode='r',
+                                   offset=int(info.get('offset', 0)), shape=shape)
+            elif tifffile is not None:
+                pixels = tifffile.memmap(path, mode='r')
+            else:
+                raise Exception("tifffile is not installed")
+        except KeyError as e:
+            raise Exception(f"Missing {str(e)} in {os.path.basename(get_sidecar_path(path))}")
+        except Exception as e:
+            raise Exception(f"Cannot map {os.path.basename(path)}: {str(e)}")
+        return cls(pixels, info.get('order', 'rgb').lower() == 'bgr')
+    
+    @classmethod
+    def create(cls, path, height, width, channels, dtype):
+        # Output written tile by tile straight to disk, in RGB order like the inputs
+        extension = os.path.splitext(path)[1].lower()
+        shape = (height, width, channels)
+        if extension == '.npy':
+            pixels = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        elif extension == '.raw':
+            pixels = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+            with open(get_sidecar_path(path), 'w', encoding='utf-8') as f:
+                json.dump({'width': width, 'height': height, 'channels': channels,
+                           'dtype': np.dtype(dtype).name, 'order': 'rgb'}, f, indent=2)
+        else:
+            photometric = 'rgb' if channels >= 3 else 'minisblack'
+            pixels = tifffile.memmap(path, shape=shape, dtype=get_write_depth(path, dtype), photometric=photometric)
+        return cls(pixels)
+    
+    @staticmethod
+    def can_create(path):
+        extension = os.path.splitext(path)[1].lower()
+        return extension in ('.npy', '.raw') or (extension in STREAMING_EXTENSIONS and tifffile is not None)
+    
+    def swap_channels(self, image):
+        # RGB(A) <-> BGR(A); gray has nothing to swap
+        if self.bgr or image.shape[2] < 3:
+            return image
+        return image[:, :, [2, 1, 0, 3][:image.shape[2]]]
+        
+    def view(self, pixels):
+        # Same file, narrower window (one eye of a stereo pair)
+        return MappedImage(pixels, self.bgr)
+    
+    def read(self, y0, y1, x0, x1, period=None, keep_alpha=False):
+        # Region in OpenCV channel order; columns from period on wrap around to 0 (the equirect seam)
+        period = period or self.width
+        rows = self.pixels[y0:y1]
+        if x1 <= period:
+            region = rows[:, x0:x1]
+        else:
+            region = np.concatenate([rows[:, x0:period], rows[:, :x1 - period]], axis=1)
+        return normalize_channels(np.array(self.swap_channels(region)), keep_alpha)
+    
+    def read_preview(self, max_size):
+        # Every n-th row and column, so a preview never pages in the whole file
+        step = max(1, int(np.ceil(max(self.width, self.height) / max_size)))
+        return normalize_channels(np.array(self.swap_channels(self.pixels[::step, ::step])))
+    
+    def write(self, y, x, image):
+        self.pixels[y:y + image.shape[0], x:x + image.shape[1]] = convert_depth(self.swap_channels(image), self.pixels.dtype)
+        
+    def close(self):
+        if isinstance(self.pixels, np.memmap):
+            self.pixels.flush()
+        self.pixels = None
+
+def get_circular_span(columns, size):
+    # Shortest wrapping interval (start, length) covering every used column: the complement of the largest gap
+    present = np.zeros(size, dtype=bool)
+    present[columns] = True
+    used = np.flatnonzero(present)
+    gaps = np.diff(np.append(used, used[0] + size))
+    largest = int(np.argmax(gaps))
+    return int(used[(largest + 1) % used.size]), int(size - gaps[largest] + 1)
+
+# Stereo layouts and outputs by UI label
+STEREO_LAYOUTS = {
+    'Mono': 'mono',
+    'Auto-detect': 'auto',
+    'Top-Bottom': 'top_bottom',
+    'Side-by-Side': 'side_by_side'
+}
+STEREO_OUTPUTS = {
+    'Left eye': 'left',
+    'Right eye': 'right',
+    'Both eyes (two files)': 'both',
+    'Anaglyph (red/cyan)': 'anaglyph'
+}
+
+def get_mono_aspect(input_format, output_projection='fulldome'):
+    # Aspect ratio of one eye: a 2:1 equirect, a 6:1 cubemap strip, or a square dome master for inverse outputs
+    if output_projection != 'fulldome':
+        return 1.0
+    return 6.0 if input_format == 'Cubemap' else 2.0
+
+def get_stereo_layout(layout, width, height, mono_aspect=2.0):
+    # Auto-detect: stacked eyes halve a mono frame's aspect ratio, side-by-side eyes double it
+    if layout != 'auto':
+        return layout
+    candidates = {'mono': mono_aspect, 'top_bottom': mono_aspect / 2, 'side_by_side': mono_aspect * 2}
+    return min(candidates, key=lambda name: abs(np.log(width / height / candidates[name])))
+
+def get_eye_size(width, height, layout):
+    if layout == 'top_bottom':
+        return width, height // 2
+    if layout == 'side_by_side':
+        return width // 2, height
+    return width, height
+
+def split_stereo(frame, layout):
+    # Views into the frame, so both eyes are sampled in place with the same maps
+    height, width = frame.shape[:2]
+    eye_width, eye_height = get_eye_size(width, height, layout)
+    if layout == 'top_bottom':
+        return frame[:eye_height], frame[eye_height:eye_height * 2]
+    return frame[:, :eye_width], frame[:, eye_width:eye_width * 2]
+
+def compose_anaglyph(left, right, dst=None):
+    # Red from the left eye, green and blue from the right (BGR order; any alpha comes from the right eye)
+    if dst is None:
+        dst = right.copy()
+    elif dst is not right:
+        dst[...] = right
+    dst[..., 2] = left[..., 2]
+    return dst
+
+def get_stream_path(path, stream):
+    # Per-eye outputs sit next to the requested path: dome_left.mp4, dome_right.mp4
+    if stream is None:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}_{stream}{extension}"
+
+def frames_match(frame, previous, tolerance=0.0, step=16):
+    # Frames match when their mean absolute difference is at most the tolerance (0: identical).
+    # The difference over a sparse set of rows is a lower bound on the full one, so most changing
+    # frames are rejected at a fraction of the cost of a full comparison
+    if previous is None or frame.shape != previous.shape or frame.dtype != previous.dtype:
+        return False
+    limit = tolerance * frame.size
+    if cv2.norm(frame[::step], previous[::step], cv2.NORM_L1) > limit:
+        return False
+    return cv2.norm(frame, previous, cv2.NORM_L1) <= limit
+
+# Limited-range black for the area outside the dome, per Y/U/V plane
+YUV_BLACK = (16, 128, 128)
+
+def get_i420_planes(buffer, width, height):
+    # Views of the Y, U and V planes of one planar 4:2:0 (yuv420p / I420) frame buffer
+    luma = width * height
+    chroma = luma // 4
+    return (buffer[:luma].reshape(height, width),
+            buffer[luma:luma + chroma].reshape(height // 2, width // 2),
+            buffer[luma + chroma:luma + 2 * chroma].reshape(height // 2, width // 2))
+
+def read_exact(stream, buffer):
+    # Pipes return short reads, so keep reading until the frame is complete; False at the end of the stream
+    view = memoryview(buffer).cast('B')
+    filled = 0
+    while filled < len(view):
+        count = stream.readinto(view[filled:])
+        if not count:
+            if filled:
+                raise Exception("Decoder stopped in the middle of a frame")
+            return False
+        filled += count
+    return True
+
+def open_yuv_decoder(ffmpeg, input_path):
+    return subprocess.Popen(
+        [ffmpeg, '-loglevel', 'error', '-nostdin', '-i', input_path, '-map', '0:v:0',
+         '-f', 'rawvideo', '-pix_fmt', 'yuv420p', '-'],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0
+    )
+
+def open_yuv_encoder(ffmpeg, output_path, width, height, fps):
+    # MPEG-4 Part 2, the same codec as the OpenCV writer ('mp4v')
+    return subprocess.Popen(
+        [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'yuv420p',
+         '-s', f"{width}x{height}", '-r', f"{fps or 30}", '-i', '-',
+         '-c:v', 'mpeg4', '-q:v', '2', '-pix_fmt', 'yuv420p', output_path],
+        stdin=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+
+def downscale_to_fit(frame, max_size):
+    height, width = frame.shape[:2]
+    scale = max_size / max(height, width)
+    if scale >= 1.0:
+        return frame
+    return cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+
+def concat_segments(segment_paths, output_path, fps):
+    # Stream-copy with ffmpeg when available, otherwise re-encode through OpenCV
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is not None:
+        list_path = output_path + ".segments.txt"
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for path in segment_paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        try:
+            result = subprocess.run(
+                [ffmpeg, '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path],
+                capture_output=True
+            )
+        finally:
+            os.remove(list_path)
+        if result.returncode == 0:
+            return
+    
+    out = None
+    try:
+        for path in segment_paths:
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                raise Exception(f"Failed to open segment {path}")
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if out is None:
+                    height, width = frame.shape[:2]
+                    out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+                out.write(frame)
+            cap.release()
+    finally:
+        if out is not None:
+            out.release()
+
+class CameraTrack:
+    CHANNELS = ('tilt', 'pan', 'roll', 'zoom')
+    DEFAULTS = {'tilt': 0.0, 'pan': 0.0, 'roll': 0.0, 'zoom': 1.0}
+    
+    def __init__(self, keyframes, interpolation='linear'):
+        if interpolation not in ('linear', 'smooth'):
+            raise Exception(f"Invalid camera track: unknown interpolation '{interpolation}'")
+        if not keyframes:
+            raise Exception("Invalid camera track: no keyframes")
+        
+        # Channels left out of a keyframe hold the previous keyframe's value
+        self.interpolation = interpolation
+        self.keyframes = []
+        previous = dict(self.DEFAULTS)
+        for keyframe in sorted(keyframes, key=lambda k: float(k['time'])):
+            filled = {'time': float(keyframe['time'])}
+            for channel in self.CHANNELS:
+                filled[channel] = float(keyframe.get(channel, previous[channel]))
+            self.keyframes.append(filled)
+            previous = filled
+        self.times = [keyframe['time'] for keyframe in self.keyframes]
+        
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            return cls(data['keyframes'], data.get('interpolation', 'linear'))
+        except (KeyError, TypeError, ValueError) as e:
+            raise Exception(f"Invalid camera track: {str(e)}")
+        
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+        
+    def to_dict(self):
+        return {'interpolation': self.interpolation, 'keyframes': [dict(keyframe) for keyframe in self.keyframes]}
+    
+    def evaluate(self, seconds):
+        # Hold the first/last keyframe outside the animated range
+        index = bisect.bisect_right(self.times, seconds)
+        if index == 0:
+            return {channel: self.keyframes[0][channel] for channel in self.CHANNELS}
+        if index == len(self.keyframes):
+            return {channel: self.keyframes[-1][channel] for channel in self.CHANNELS}
+        
+        start = self.keyframes[index - 1]
+        end = self.keyframes[index]
+        t = (seconds - start['time']) / (end['time'] - start['time'])
+        if self.interpolation == 'smooth':
+            t = t * t * (3 - 2 * t)
+        return {channel: start[channel] + (end[channel] - start[channel]) * t for channel in self.CHANNELS}
+
+def apply_camera_track(camera_track, seconds, tilt, pan, roll, zoom_factor):
+    if camera_track is None:
+        return tilt, pan, roll, zoom_factor
+    
+    # Track angles are offsets from the static settings; track zoom scales the static zoom
+    values = camera_track.evaluate(seconds)
+    return (round(tilt + values['tilt'], 4), round(pan + values['pan'], 4),
+            round(roll + values['roll'], 4), round(zoom_factor * values['zoom'], 6))
 
 class ConversionThread(QThread):
     progress = pyqtSignal(int)
+    stats = pyqtSignal(dict)
+    checkpoint = pyqtSignal(dict)
     error = pyqtSignal(str)
     
-    def __init__(self, input_path, output_path, is_video, input_format, dome_type, rotation, zoom_factor, tilt, pan, roll, flip_h, flip_v):
+    # Stills are one-off frames unless a subclass converts many with the same maps
+    reuse_maps = False
+    
+    def __init__(self, input_path, output_path, is_video, input_format, dome_type, rotation, zoom_factor, tilt, pan, roll, flip_h, flip_v,
+                 progress_interval=0.1, start_frame=0, segment_frames=0, segments=None, camera_track=None,
+                 map_interval=4, output_depth='source', transparent=False, antialias=False, output_size=0,
+                 tiled_sampling=False, workers=0, end_frame=0, stereo_layout='mono', stereo_output='left',
+                 skip_duplicates=False, duplicate_tolerance=0.0, yuv_pipeline=False, output_projection='fulldome'):
         super().__init__()
         self.input_path = input_path
         self.output_path = output_path
@@ -27,163 +1286,1271 @@ class ConversionThread(QThread):
         self.roll = roll
         self.flip_h = flip_h
         self.flip_v = flip_v
+        self.output_depth = output_depth
+        self.transparent = transparent
+        self.antialias = antialias
+        self.output_size = int(output_size or 0)
+        self.tiled_sampling = tiled_sampling
+        self.workers = int(workers or 0)
+        self.stereo_layout = stereo_layout
+        self.stereo_output = stereo_output
+        # Held frames (title cards, doubled low-frame-rate renders) reuse the previous projection
+        self.skip_duplicates = skip_duplicates
+        # Lossy codecs rarely decode a held frame bit-exactly; this allows a mean difference in 8-bit levels
+        self.duplicate_tolerance = float(duplicate_tolerance or 0.0)
+        # Decode, project and encode planar YUV through ffmpeg pipes, skipping both BGR conversions
+        self.yuv_pipeline = yuv_pipeline
+        # 'fulldome' projects 360 media to a dome; 'equirectangular' and 'cubemap' turn a dome master back
+        self.output_projection = output_projection
+        self.duplicate_frames = 0
+        
+        # Keyframed animation on top of the static tilt/pan/roll/zoom (kept as a dict so jobs stay serializable)
+        self.camera_track = CameraTrack.from_dict(camera_track) if camera_track else None
+        self.map_interval = max(1, int(map_interval))
+        self.anchor_maps = OrderedDict()
+        self.fps = 0.0
+        self.last_map_key = None
+        self.last_maps = None
+        self.last_plan = None
+        self.map_lock = threading.Lock()
+        
+        # Resumable exports render fixed-length segments and checkpoint after each one
+        self.start_frame = start_frame
+        self.segment_frames = segment_frames
+        # Frame ranges (start_frame up to end_frame) let several nodes share one video
+        self.end_frame = int(end_frame or 0)
+        self.segments = list(segments or [])
+        
+        # Job control
+        self.progress_interval = progress_interval
+        self.cancel_requested = False
+        self.failed = False
+        # Streams written so far (set once the video's layout is known), for cleaning up after a cancel
+        self.output_streams = []
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+        
+    def pause(self):
+        self.resume_event.clear()
+        
+    def resume(self):
+        self.resume_event.set()
+        
+    def cancel(self):
+        self.cancel_requested = True
+        # Wake a paused job so it can exit
+        self.resume_event.set()
+        
+    def is_paused(self):
+        return not self.resume_event.is_set()
+        
+    def wait_if_paused(self, cancel_event=None):
+        # Returns False once the job has been cancelled; cancel_event cancels one still on a shared converter
+        if not self.resume_event.is_set():
+            pause_start = time.perf_counter()
+            self.resume_event.wait()
+            self.paused_time += time.perf_counter() - pause_start
+        return not self.cancel_requested and not (cancel_event is not None and cancel_event.is_set())
+        
+    def start_timing(self, start_frame=0):
+        self.start_time = time.perf_counter()
+        self.timing_base = start_frame
+        self.paused_time = 0.0
+        self.last_report = 0.0
+        self.stage_times = {'decode': 0.0, 'project': 0.0, 'encode': 0.0}
+        self.stats_lock = threading.Lock()
+        
+    def add_stage_time(self, name, start, end):
+        with self.stats_lock:
+            self.stage_times[name] += end - start
+        PROFILER.record(name, start, end)
+        
+    def report_progress(self, done, total, force=False):
+        # Throttle cross-thread signals so the GUI event loop isn't flooded
+        now = time.perf_counter()
+        if not force and now - self.last_report < self.progress_interval:
+            return
+        self.last_report = now
+        
+        elapsed = max(now - self.start_time - self.paused_time, 1e-6)
+        fps = (done - self.timing_base) / elapsed
+        remaining = max(total - done, 0)
+        with PROFILER.span('signal', 'qt'):
+            self.progress.emit(int(done / total * 100) if total > 0 else 0)
+            self.stats.emit({
+                'frames': done,
+                'total_frames': total,
+                'fps': fps,
+                'eta': remaining / fps if fps > 0 else 0.0,
+                'stages': {name: seconds / max(done - self.timing_base, 1) * 1000 for name, seconds in self.stage_times.items()},
+                'duplicates': self.duplicate_frames
+            })
+        PROFILER.sample_memory()
         
-    def convert_frame(self, frame):
+    def get_parts_dir(self):
+        return self.output_path + ".parts"
+        
+    def remove_partial_output(self):
+        # Only the streams this export writes, so a mono job never touches an unrelated _left/_right file
+        try:
+            for stream in self.output_streams:
+                path = get_stream_path(self.output_path, stream)
+                if os.path.exists(path):
+                    os.remove(path)
+            shutil.rmtree(self.get_parts_dir(), ignore_errors=True)
+        except OSError:
+            pass
+        
+    def get_natural_size(self, width, height):
+        # Output size that keeps the source's resolution: the dome matches the source height, an equirect
+        # the dome master's diameter, and a cube face covers a quarter turn like half the dome
+        if self.output_projection == 'cubemap':
+            return min(width, height) // 2
+        return min(width, height)
+        
+    def get_dome_size(self, width, height):
+        # The natural size unless an output size is set (equirect height or cube face size for inverse outputs)
+        return self.output_size or self.get_natural_size(width, height)
+        
+    def get_output_shape(self, dome_size):
+        return get_projection_shape(self.output_projection, dome_size)
+        
+    def get_stereo_layout(self, width, height):
+        mono_aspect = get_mono_aspect(self.input_format, self.output_projection)
+        return get_stereo_layout(self.stereo_layout, width, height, mono_aspect)
+        
+    def get_streams(self, layout):
+        # Output streams per frame: one, or a left and a right file
+        if layout != 'mono' and self.stereo_output == 'both':
+            return ['left', 'right']
+        return [None]
+        
+    def get_view_params(self, frame_index):
+        seconds = frame_index / self.fps if self.fps > 0 else 0.0
+        return apply_camera_track(self.camera_track, seconds, self.tilt, self.pan, self.roll, self.zoom_factor)
+        
+    def get_anchor_maps(self, dome_size, width, height, anchor_index):
+        # Exact continuous maps every map_interval frames; frames in between are interpolated
+        if anchor_index not in self.anchor_maps:
+            tilt, pan, roll, zoom_factor = self.get_view_params(anchor_index)
+            directions = MAP_CACHE.get_directions(dome_size, zoom_factor, self.rotation, store=False)
+            maps = build_fisheye_maps(dome_size, width, height, zoom_factor, tilt, pan, roll,
+                                      self.rotation, directions=directions)
+            self.anchor_maps[anchor_index] = ((tilt, pan, roll, zoom_factor), maps)
+            while len(self.anchor_maps) > 2:
+                self.anchor_maps.popitem(last=False)
+        return self.anchor_maps[anchor_index]
+        
+    def get_animated_maps(self, dome_size, width, height, frame_index, nearest=True):
+        anchor_index = frame_index - frame_index % self.map_interval
+        start_params, start_maps = self.get_anchor_maps(dome_size, width, height, anchor_index)
+        end_params, end_maps = self.get_anchor_maps(dome_size, width, height, anchor_index + self.map_interval)
+        
+        t = (frame_index - anchor_index) / self.map_interval
+        if t == 0 or start_params == end_params:
+            map_x, map_y = start_maps[0].copy(), start_maps[1].copy()
+        else:
+            map_x, map_y = interpolate_maps(start_maps, end_maps, t, width)
+        
+        outside = ~MAP_CACHE.get_grid(dome_size, self.rotation)[0]
+        return finalize_maps(map_x, map_y, outside, width, height, nearest, self.flip_h, self.flip_v)
+        
+    def get_view_maps(self, dome_size, width, height, view_params, nearest=True, store=True):
+        # Lookup maps for one view, forward to a dome or back from one
+        tilt, pan, roll, zoom_factor = view_params
+        if self.output_projection == 'fulldome':
+            return MAP_CACHE.get_maps(dome_size, width, height, zoom_factor, tilt, pan, roll,
+                                      self.rotation, self.flip_h, self.flip_v, nearest=nearest, store=store)
+        return MAP_CACHE.get_inverse_maps(self.output_projection, dome_size, min(width, height), zoom_factor,
+                                          tilt, pan, roll, self.rotation, self.flip_h, self.flip_v,
+                                          nearest=nearest, store=store)
+        
+    def get_frame_maps(self, dome_size, width, height, view_params, frame_index, downsampled):
+        # Locked so batch worker threads share one build per resolution
+        with self.map_lock:
+            # Held keyframes reuse the previous frame's maps outright
+            map_key = (dome_size, width, height) + tuple(view_params)
+            if map_key != self.last_map_key:
+                # Pyramid sampling works from continuous maps; plain lookups truncate like the original
+                nearest = not (self.antialias or downsampled)
+                if self.camera_track is None:
+                    # Lookup maps are built once per parameter set and reused for every frame
+                    self.last_maps = self.get_view_maps(dome_size, width, height, view_params, nearest)
+                elif self.output_projection != 'fulldome':
+                    # Inverse views are built per frame; only forward maps are interpolated between anchors
+                    self.last_maps = self.get_view_maps(dome_size, width, height, view_params, nearest, store=False)
+                else:
+                    self.last_maps = self.get_animated_maps(dome_size, width, height, frame_index, nearest)
+                
+                # Level selection runs once per view, so a static export pays for it once
+                if self.antialias:
+                    self.last_plan = build_lod_plan(self.last_maps[0], self.last_maps[1], width, height)
+                elif downsampled:
+                    self.last_plan = build_region_plan(self.last_maps[0], self.last_maps[1], width, height)
+                elif self.tiled_sampling and self.camera_track is None:
+                    self.last_plan = build_tiled_plan(self.last_maps[0], self.last_maps[1], width, height)
+                else:
+                    self.last_plan = None
+                self.last_map_key = map_key
+            return self.last_maps, self.last_plan
+        
+    def convert_stereo(self, frame, frame_index=0, source_path=None):
+        # One result per output stream; both eyes share the maps since they have the same size
+        layout = self.get_stereo_layout(frame.shape[1], frame.shape[0])
+        if layout == 'mono':
+            return [self.convert_frame(frame, frame_index, source_path)]
+        left, right = split_stereo(frame, layout)
+        if self.stereo_output == 'left':
+            return [self.convert_frame(left, frame_index, source_path, 'left')]
+        if self.stereo_output == 'right':
+            return [self.convert_frame(right, frame_index, source_path, 'right')]
+        left = self.convert_frame(left, frame_index, source_path, 'left')
+        right = self.convert_frame(right, frame_index, source_path, 'right')
+        if self.stereo_output == 'anaglyph':
+            return [compose_anaglyph(left, right, dst=right)]
+        return [left, right]
+        
+    def convert_frame(self, frame, frame_index=0, source_path=None, eye=None):
         try:
             height, width = frame.shape[:2]
             
             # Create a square output image
-            dome_size = min(height, width)
-            result = np.zeros((dome_size, dome_size, 3), dtype=np.uint8)
+            dome_size = self.get_dome_size(width, height)
+            downsampled = dome_size < self.get_natural_size(width, height)
             
-            # Create coordinate maps
-            y, x = np.meshgrid(np.arange(dome_size), np.arange(dome_size), indexing='ij')
-            center = dome_size // 2
+            view_params = self.get_view_params(frame_index)
             
-            # Calculate normalized coordinates
-            dx = (x - center) / center
-            dy = (y - center) / center
-            r = np.sqrt(dx**2 + dy**2)
-            theta = np.arctan2(dy, dx)
+            # The fused kernel projects single stills and animated frames directly, without building maps
+            if (KERNEL.is_fused() and not self.antialias and not downsampled and self.output_projection == 'fulldome' and
+                    (self.camera_track is not None or (not self.is_video and not self.reuse_maps))):
+                tilt, pan, roll, zoom_factor = view_params
+                return KERNEL.project(frame, dome_size, zoom_factor, tilt, pan, roll, self.rotation,
+                                      self.flip_h, self.flip_v, nearest=True)
             
-            # Create circular mask
-            mask = r <= 1.0
+            maps, plan = self.get_frame_maps(dome_size, width, height, view_params, frame_index, downsampled)
+            if plan is not None and plan['kind'] == 'tiled':
+                return sample_tiled_plan(frame, plan)
+            if plan is not None:
+                # A still's pyramid is kept for later exports of the same image
+                pyramid = None
+                if source_path is not None:
+                    pyramid = PYRAMID_CACHE.get(source_path, frame, plan['gaussian'], eye)
+                return sample_level_plan(frame, plan, pyramid)
+            map_x, map_y = maps
             
-            # Apply rotation
-            rotation_rad = -np.radians(self.rotation)
-            theta_rot = theta + rotation_rad
+            # Sample pixels (any depth; the result keeps the frame's dtype)
+            return remap_frame(frame, map_x, map_y, cv2.INTER_NEAREST)
             
-            # Apply zoom factor to radius calculation
-            r_scaled = r[mask] * self.zoom_factor
+        except Exception as e:
+            raise Exception(f"Frame conversion error: {str(e)}")
+    
+    def run(self):
+        try:
+            if self.is_video:
+                self.convert_video()
+            else:
+                self.convert_image()
+        except Exception as e:
+            self.failed = True
+            self.error.emit(str(e))
+    
+    def convert_still(self, input_path, output_path, on_progress=None, cancel_event=None):
+        # Read, project and write one still; returns False if the job was cancelled on the way
+        if is_streaming_source(input_path) and self.output_projection == 'fulldome':
+            return self.convert_streaming(input_path, output_path, on_progress, cancel_event)
+        stage_start = time.perf_counter()
+        # Source alpha is only kept for transparent (RGBA) output
+        if is_streaming_source(input_path):
+            # Mapped dome masters are read whole; only the forward projection is tiled
+            source = MappedImage.open(input_path)
+            img = source.read(0, source.height, 0, source.width, keep_alpha=self.transparent)
+        else:
+            img = read_image(input_path, keep_alpha=self.transparent)
+        if img is None:
+            raise Exception("Failed to load input image")
+        
+        # Narrowing happens before projection so the working frame is as small as the output
+        # (e.g. half float halves the memory of a float32 HDR); widening waits for the smaller dome
+        target_depth = img.dtype if self.output_depth == 'source' else np.dtype(self.output_depth)
+        if target_depth.itemsize <= img.dtype.itemsize:
+            img = convert_depth(img, target_depth)
+        decoded = time.perf_counter()
+        self.add_stage_time('decode', stage_start, decoded)
+        if not self.wait_if_paused(cancel_event):
+            return False
+        
+        # Convert the image
+        # Adding alpha to the source keeps RGBA on the single sampling pass (4-channel remap is
+        # as fast as 3-channel, and cheaper than attaching alpha to the result)
+        if self.transparent:
+            img = add_opaque_alpha(img)
+        results = [convert_depth(result, target_depth) for result in self.convert_stereo(img, source_path=input_path)]
+        streams = self.get_streams(self.get_stereo_layout(img.shape[1], img.shape[0]))
+        projected = time.perf_counter()
+        self.add_stage_time('project', decoded, projected)
+        
+        if not self.wait_if_paused(cancel_event):
+            return False
+        
+        # Save the result (one file per eye for stereo pairs)
+        stage_start = time.perf_counter()
+        for stream, result in zip(streams, results):
+            write_image(get_stream_path(output_path, stream), result)
+        self.add_stage_time('encode', stage_start, time.perf_counter())
+        return True
+    
+    def get_tile_maps(self, dome_size, width, height, window):
+        # Lookup maps for one window of the dome, the same values as that part of the full maps
+        grid = build_polar_grid(dome_size, self.rotation, window)
+        directions = build_fisheye_directions(dome_size, self.zoom_factor, self.rotation, grid)
+        return build_fisheye_maps(dome_size, width, height, self.zoom_factor, self.tilt, self.pan, self.roll,
+                                  self.rotation, self.flip_h, self.flip_v, nearest=True, directions=directions)
+    
+    def get_tile_region(self, map_x, map_y, width, height, factor):
+        # Source blocks (factor x factor pixels) the tile samples: a row range and a column span that may wrap the seam
+        inside = map_x >= 0
+        if not inside.any():
+            return None
+        block_width, block_height = width // factor, height // factor
+        columns = np.minimum(map_x[inside].astype(np.int32) // factor, block_width - 1)
+        rows = np.minimum(map_y[inside].astype(np.int32) // factor, block_height - 1)
+        top, bottom = int(rows.min()), int(rows.max()) + 1
+        start, span = get_circular_span(columns, block_width)
+        
+        local_x = np.full(map_x.shape, -1, dtype=np.float32)
+        local_y = np.full(map_y.shape, -1, dtype=np.float32)
+        local_x[inside] = (columns - start) % block_width
+        local_y[inside] = rows - top
+        return top, bottom, start, span, block_width, local_x, local_y
+    
+    def read_tile_region(self, eye, region, factor, target_depth):
+        top, bottom, start, span, block_width = region[:5]
+        pixels = eye.read(top * factor, bottom * factor, start * factor, (start + span) * factor,
+                          block_width * factor, keep_alpha=self.transparent)
+        if target_depth.itemsize <= pixels.dtype.itemsize:
+            pixels = convert_depth(pixels, target_depth)
+        if factor > 1:
+            # Box filter down to the dome's scale, so nearest sampling doesn't alias (cv2.resize has no float16)
+            reduced = cv2.resize(pixels.astype(np.float32) if pixels.dtype == np.float16 else pixels,
+                                 (span, bottom - top), interpolation=cv2.INTER_AREA)
+            pixels = reduced.astype(pixels.dtype, copy=False)
+        return pixels
+    
+    def convert_streaming(self, input_path, output_path, on_progress=None, cancel_event=None):
+        # Out-of-core still: each dome tile builds its own maps and reads only the source region they
+        # touch from the memory-mapped file, so memory follows the tile size instead of the panorama
+        source = MappedImage.open(input_path)
+        layout = self.get_stereo_layout(source.width, source.height)
+        streams = self.get_streams(layout)
+        eyes = [source]
+        if layout != 'mono':
+            left, right = split_stereo(source.pixels, layout)
+            eyes = [source.view(pixels) for pixels in {'left': [left], 'right': [right]}.get(self.stereo_output, [left, right])]
+        width, height = eyes[0].width, eyes[0].height
+        dome_size = self.get_dome_size(width, height)
+        factor = max(1, min(width, height) // dome_size)
+        
+        target_depth = source.pixels.dtype if self.output_depth == 'source' else np.dtype(self.output_depth)
+        if target_depth == np.float64:
+            target_depth = np.dtype(np.float32)
+        channels = 4 if self.transparent else 3
+        
+        # .npy, .raw and TIFF outputs are written tile by tile to disk; other formats are assembled in memory
+        paths = [get_stream_path(output_path, stream) for stream in streams]
+        outputs = []
+        created = []
+        completed = False
+        try:
+            for path in paths:
+                if MappedImage.can_create(path):
+                    created.append(path)
+                    if path.lower().endswith('.raw'):
+                        created.append(get_sidecar_path(path))
+                    outputs.append(MappedImage.create(path, dome_size, dome_size, channels, target_depth))
+                else:
+                    outputs.append(np.zeros((dome_size, dome_size, channels), dtype=target_depth))
             
-            # Convert to spherical coordinates
-            phi = r_scaled * 0.5 * np.pi  # Azimuthal angle (0 to pi/2)
-            theta_sph = theta_rot[mask]   # Polar angle (-pi to pi)
+            tiles = [(x, y, min(STREAMING_TILE, dome_size - x), min(STREAMING_TILE, dome_size - y))
+                     for y in range(0, dome_size, STREAMING_TILE) for x in range(0, dome_size, STREAMING_TILE)]
+            tiles.reverse()
+            budget = (STREAMING_TILE * factor) ** 2 * 4
+            done = 0
+            last_report = 0.0
+            while tiles:
+                if not self.wait_if_paused(cancel_event):
+                    return False
+                window = tiles.pop()
+                x, y, tile_width, tile_height = window
+                stage_start = time.perf_counter()
+                map_x, map_y = self.get_tile_maps(dome_size, width, height, window)
+                region = self.get_tile_region(map_x, map_y, width, height, factor)
+                if region is not None:
+                    top, bottom, start, span = region[:4]
+                    if span * (bottom - top) * factor * factor > budget and min(tile_width, tile_height) > 32:
+                        # Tiles near a pole reach across the whole panorama; quarter them until the region fits
+                        half_width, half_height = tile_width // 2, tile_height // 2
+                        tiles += [(x + half_width, y + half_height, tile_width - half_width, tile_height - half_height),
+                                  (x, y + half_height, half_width, tile_height - half_height),
+                                  (x + half_width, y, tile_width - half_width, half_height),
+                                  (x, y, half_width, half_height)]
+                        continue
+                    self.add_stage_time('project', stage_start, time.perf_counter())
+                    
+                    results = []
+                    for eye in eyes:
+                        stage_start = time.perf_counter()
+                        pixels = self.read_tile_region(eye, region, factor, target_depth)
+                        decoded = time.perf_counter()
+                        self.add_stage_time('decode', stage_start, decoded)
+                        if self.transparent:
+                            pixels = add_opaque_alpha(pixels)
+                        results.append(convert_depth(remap_frame(pixels, region[5], region[6], cv2.INTER_NEAREST), target_depth))
+                        self.add_stage_time('project', decoded, time.perf_counter())
+                    if len(results) > len(outputs):
+                        results = [compose_anaglyph(results[0], results[1], dst=results[1])]
+                    
+                    stage_start = time.perf_counter()
+                    for output, result in zip(outputs, results):
+                        if isinstance(output, MappedImage):
+                            output.write(y, x, result)
+                        else:
+                            output[y:y + tile_height, x:x + tile_width] = result
+                    self.add_stage_time('encode', stage_start, time.perf_counter())
+                
+                done += tile_width * tile_height
+                now = time.perf_counter()
+                if on_progress is not None and now - last_report >= self.progress_interval:
+                    last_report = now
+                    on_progress(done / (dome_size * dome_size))
             
-            # Convert to 3D cartesian coordinates
-            x_cart = np.sin(phi) * np.cos(theta_sph)
-            y_cart = np.sin(phi) * np.sin(theta_sph)
-            z_cart = np.cos(phi)
+            if not self.wait_if_paused(cancel_event):
+                return False
+            stage_start = time.perf_counter()
+            for path, output in zip(paths, outputs):
+                if not isinstance(output, MappedImage):
+                    write_image(path, output)
+            self.add_stage_time('encode', stage_start, time.perf_counter())
+            completed = True
+            return True
+        finally:
+            for output in outputs:
+                if isinstance(output, MappedImage):
+                    output.close()
+            if not completed:
+                # Mapped outputs were created up front; don't leave half-written ones behind
+                for path in created:
+                    if os.path.exists(path):
+                        os.remove(path)
+    
+    def convert_image(self):
+        try:
+            self.start_timing()
+            if self.convert_still(self.input_path, self.output_path, lambda fraction: self.progress.emit(int(fraction * 100))):
+                self.report_progress(1, 1, force=True)
             
-            # Convert angles to radians
-            tilt_rad = np.radians(self.tilt)
-            pan_rad = np.radians(self.pan)
-            roll_rad = np.radians(self.roll)
+        except Exception as e:
+            self.failed = True
+            self.error.emit(f"Image conversion error: {str(e)}")
+    
+    def open_video_writer(self, path, fps, dome_size):
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        height, width = self.get_output_shape(dome_size)
+        out = cv2.VideoWriter(path, fourcc, fps, (width, height))
+        if not out.isOpened():
+            raise Exception("Failed to open output video")
+        return out
+    
+    def use_yuv_pipeline(self, width, height, dome_size):
+        # Static full-resolution mono exports from the start of the video; anything else takes the BGR path
+        return (self.yuv_pipeline and shutil.which('ffmpeg') is not None and self.camera_track is None and
+                not self.antialias and not self.tiled_sampling and self.segment_frames == 0 and self.start_frame == 0 and
+                self.get_stereo_layout(width, height) == 'mono' and dome_size == self.get_natural_size(width, height) and
+                width % 2 == 0 and height % 2 == 0 and dome_size % 2 == 0)
+        
+    def get_yuv_maps(self, dome_size, width, height):
+        # Each plane is sampled with maps at its own resolution; chroma maps are half size on both axes
+        view_params = (self.tilt, self.pan, self.roll, self.zoom_factor)
+        return [self.get_view_maps(size, plane_width, plane_height, view_params)
+                for size, plane_width, plane_height in ((dome_size, width, height),
+                                                        (dome_size // 2, width // 2, height // 2))]
+        
+    def project_yuv(self, source, result, width, height, dome_size, maps):
+        luma_maps, chroma_maps = maps
+        output_height, output_width = self.get_output_shape(dome_size)
+        planes = zip(get_i420_planes(source, width, height), get_i420_planes(result, output_width, output_height),
+                     (luma_maps, chroma_maps, chroma_maps), YUV_BLACK)
+        for plane, dst, (map_x, map_y), black in planes:
+            cv2.remap(plane, map_x, map_y, cv2.INTER_NEAREST, dst=dst, borderMode=cv2.BORDER_CONSTANT, borderValue=black)
+        
+    def convert_video_yuv(self, width, height, fps, total_frames, dome_size):
+        ffmpeg = shutil.which('ffmpeg')
+        maps = self.get_yuv_maps(dome_size, width, height)
+        
+        # Two source buffers: one holds the frame behind the current result for duplicate checks, the other is read into
+        sources = [np.empty(width * height * 3 // 2, dtype=np.uint8) for _ in range(2)]
+        output_height, output_width = self.get_output_shape(dome_size)
+        result = np.empty(output_width * output_height * 3 // 2, dtype=np.uint8)
+        
+        decoder = open_yuv_decoder(ffmpeg, self.input_path)
+        encoder = None
+        try:
+            encoder = open_yuv_encoder(ffmpeg, self.output_path, output_width, output_height, fps)
+            self.start_timing()
+            done = 0
+            previous = None
+            while total_frames <= 0 or done < total_frames:
+                source = sources[1] if previous is sources[0] else sources[0]
+                stage_start = time.perf_counter()
+                if not read_exact(decoder.stdout, source):
+                    break
+                decoded = time.perf_counter()
+                if not self.wait_if_paused():
+                    break
+                
+                if self.skip_duplicates and frames_match(source, previous, self.duplicate_tolerance):
+                    self.duplicate_frames += 1
+                else:
+                    self.project_yuv(source, result, width, height, dome_size, maps)
+                    previous = source
+                projected = time.perf_counter()
+                
+                encoder.stdin.write(result.data)
+                encoded = time.perf_counter()
+                
+                self.add_stage_time('decode', stage_start, decoded)
+                self.add_stage_time('project', decoded, projected)
+                self.add_stage_time('encode', projected, encoded)
+                done += 1
+                self.report_progress(done, total_frames)
             
-            # Apply rotations in order: tilt (X) -> pan (Y) -> roll (Z)
+            # Closing stdin lets the encoder flush and finish the file
+            encoder.stdin.close()
+            if encoder.wait() != 0 and not self.cancel_requested:
+                raise Exception(f"ffmpeg encoder failed: {encoder.stderr.read().decode(errors='replace').strip()}")
+            if decoder.poll() not in (None, 0) and not self.cancel_requested:
+                raise Exception(f"ffmpeg decoder failed: {decoder.stderr.read().decode(errors='replace').strip()}")
             
-            # Tilt rotation (around X-axis)
-            y_tilt = y_cart * np.cos(tilt_rad) - z_cart * np.sin(tilt_rad)
-            z_tilt = y_cart * np.sin(tilt_rad) + z_cart * np.cos(tilt_rad)
-            x_tilt = x_cart
+            if not self.cancel_requested:
+                self.report_progress(done, total_frames if total_frames > 0 else done, force=True)
+        finally:
+            for process in (decoder, encoder):
+                if process is not None and process.poll() is None:
+                    process.kill()
+                    process.wait()
+        
+    def use_worker_pool(self, width, height, dome_size):
+        # Worker processes handle the plain static lookup; pyramid, tiled and animated sampling stay in-process
+        return (self.workers > 1 and self.camera_track is None and not self.antialias and
+                not self.tiled_sampling and dome_size >= self.get_natural_size(width, height) and
+                self.get_stereo_layout(width, height) == 'mono')
+        
+    def project_frames(self, cap, start_frame, total_frames):
+        # Yields (results per stream, decode start, decode end, project start, project end) one frame at a time
+        index = start_frame
+        previous = None
+        results = None
+        # An animated camera changes the view on every frame, so only static views can reuse a projection
+        skip = self.skip_duplicates and self.camera_track is None
+        while total_frames <= 0 or index < total_frames:
+            stage_start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            decoded = time.perf_counter()
+            # Compared with the frame the reused result came from, so slow fades can't creep under the tolerance
+            if skip and frames_match(frame, previous, self.duplicate_tolerance):
+                self.duplicate_frames += 1
+            else:
+                results = self.convert_stereo(frame, index)
+                # Every read returns a new array, so keeping the frame costs no copy
+                previous = frame
+            yield results, stage_start, decoded, decoded, time.perf_counter()
+            index += 1
+        
+    def project_frames_parallel(self, cap, start_frame, total_frames, width, height, dome_size):
+        # Frames are decoded straight into shared-memory slots and projected by worker processes
+        map_x, map_y = self.get_view_maps(dome_size, width, height, (self.tilt, self.pan, self.roll, self.zoom_factor))
+        remaining = [total_frames - start_frame if total_frames > 0 else -1]
+        # Slots are reused, so duplicate detection compares against a private copy of the last new frame
+        previous = np.empty((height, width, 3), dtype=np.uint8) if self.skip_duplicates else None
+        has_previous = [False]
+        
+        def read_frame(dst):
+            if remaining[0] == 0:
+                return False
+            remaining[0] -= 1
+            ret, frame = cap.read(dst)
+            if ret and frame is not dst:
+                # The decoder could not write in place (e.g. a different frame size)
+                if frame.shape != dst.shape:
+                    raise Exception("Video frame size changed during export")
+                dst[...] = frame
+            if ret and previous is not None:
+                if has_previous[0] and frames_match(dst, previous, self.duplicate_tolerance):
+                    self.duplicate_frames += 1
+                    return REPEAT_FRAME
+                np.copyto(previous, dst)
+                has_previous[0] = True
+            return ret
+        
+        pool = ProjectionPool(self.workers, (height, width, 3), self.get_output_shape(dome_size) + (3,), np.uint8, map_x, map_y)
+        try:
+            for index, result, stage_start, decoded, project_start, projected in pool.run(read_frame):
+                yield [result], stage_start, decoded, project_start, projected
+        finally:
+            pool.close()
+        
+    def convert_video(self):
+        cap = None
+        outs = []
+        frames = None
+        try:
+            # Read input video
+            cap = cv2.VideoCapture(self.input_path)
+            if not cap.isOpened():
+                raise Exception("Failed to open input video")
             
-            # Pan rotation (around Y-axis)
-            x_pan = x_tilt * np.cos(pan_rad) + z_tilt * np.sin(pan_rad)
-            z_pan = -x_tilt * np.sin(pan_rad) + z_tilt * np.cos(pan_rad)
-            y_pan = y_tilt
+            # Get video properties
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if self.end_frame > 0:
+                total_frames = min(total_frames, self.end_frame) if total_frames > 0 else self.end_frame
+            # Stereo frames are projected per eye, so the dome follows the eye size
+            layout = self.get_stereo_layout(width, height)
+            streams = self.get_streams(layout)
+            self.output_streams = streams
+            dome_size = self.get_dome_size(*get_eye_size(width, height, layout))
+            self.fps = fps
             
-            # Roll rotation (around Z-axis)
-            x_roll = x_pan * np.cos(roll_rad) - y_pan * np.sin(roll_rad)
-            y_roll = x_pan * np.sin(roll_rad) + y_pan * np.cos(roll_rad)
-            z_roll = z_pan
+            if self.use_yuv_pipeline(width, height, dome_size):
+                cap.release()
+                cap = None
+                self.convert_video_yuv(width, height, fps, total_frames, dome_size)
+                return
             
-            # Convert back to spherical coordinates
-            phi_rot = np.arccos(z_roll)
-            theta_rot = np.arctan2(y_roll, x_roll)
+            # Resume after the last checkpoint, unless its segments have gone missing
+            segmented = self.segment_frames > 0
+            segments = list(self.segments)
+            start_frame = self.start_frame
+            # Each segment is written once per stream (segment_00000_left.mp4, ... for both eyes)
+            if any(not os.path.exists(get_stream_path(path, stream)) for path in segments for stream in streams):
+                segments = []
+                start_frame = 0
+            if segmented:
+                os.makedirs(self.get_parts_dir(), exist_ok=True)
+            if start_frame > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
             
-            # Convert to image coordinates
-            x_src = ((theta_rot + np.pi) / (2 * np.pi)) * width
-            y_src = (phi_rot / np.pi) * height
+            # Convert frames
+            self.start_timing(start_frame)
+            done = start_frame
+            segment_path = None
+            segment_start = start_frame
+            if self.use_worker_pool(width, height, dome_size):
+                frames = self.project_frames_parallel(cap, start_frame, total_frames, width, height, dome_size)
+            else:
+                frames = self.project_frames(cap, start_frame, total_frames)
+            for results, stage_start, decoded, project_start, projected in frames:
+                if not self.wait_if_paused():
+                    break
+                
+                # Create the output (or next segment) writers lazily, one per stream
+                if not outs:
+                    if segmented:
+                        segment_path = os.path.join(self.get_parts_dir(), f"segment_{len(segments):05d}.mp4")
+                        base_path = segment_path
+                    else:
+                        base_path = self.output_path
+                    for stream in streams:
+                        outs.append(self.open_video_writer(get_stream_path(base_path, stream), fps, dome_size))
+                
+                # Write frame to output video
+                encode_start = time.perf_counter()
+                for out, result in zip(outs, results):
+                    out.write(result)
+                encoded = time.perf_counter()
+                
+                self.stage_times['decode'] += decoded - stage_start
+                self.stage_times['project'] += projected - project_start
+                self.stage_times['encode'] += encoded - encode_start
+                PROFILER.record('decode', stage_start, decoded)
+                PROFILER.record('project', project_start, projected)
+                PROFILER.record('encode', encode_start, encoded)
+                done += 1
+                
+                # Close finished segments and record the checkpoint
+                if segmented and done - segment_start >= self.segment_frames:
+                    for out in outs:
+                        out.release()
+                    outs = []
+                    segments.append(segment_path)
+                    segment_start = done
+                    self.checkpoint.emit({'frames_done': done, 'segments': list(segments)})
+                
+                # Emit (throttled) progress
+                self.report_progress(done, total_frames)
+            
+            if outs:
+                for out in outs:
+                    out.release()
+                outs = []
+                if segmented and not self.cancel_requested:
+                    segments.append(segment_path)
             
-            # Handle wraparound and clipping
-            x_src = np.mod(x_src, width)
-            y_src = np.clip(y_src, 0, height - 1)
+            if self.cancel_requested:
+                return
             
-            # Sample pixels
-            result[mask] = frame[y_src.astype(np.int32), x_src.astype(np.int32)]
+            # Join the segments into the requested output
+            if segmented:
+                for stream in streams:
+                    concat_segments([get_stream_path(path, stream) for path in segments],
+                                    get_stream_path(self.output_path, stream), fps)
+                shutil.rmtree(self.get_parts_dir(), ignore_errors=True)
+                self.checkpoint.emit({'frames_done': done, 'segments': []})
             
-            return result
+            self.report_progress(done, total_frames if total_frames > 0 else done, force=True)
             
         except Exception as e:
-            raise Exception(f"Frame conversion error: {str(e)}")
+            self.failed = True
+            self.error.emit(f"Video conversion error: {str(e)}")
+            
+        finally:
+            # Release resources (closing the frame source also stops any worker processes)
+            if frames is not None:
+                frames.close()
+            if cap is not None:
+                cap.release()
+            for out in outs:
+                out.release()
+            
+            # A cancelled job leaves nothing half-written behind
+            if self.cancel_requested:
+                self.remove_partial_output()
+
+def get_image_size(path):
+    # Header-only probe, so inputs can be grouped without decoding them
+    if is_streaming_source(path):
+        try:
+            source = MappedImage.open(path)
+            return source.width, source.height
+        except Exception:
+            return None
+    try:
+        with Image.open(path) as image:
+            return image.size
+    except Exception:
+        image = read_image(path)
+        return None if image is None else (image.shape[1], image.shape[0])
+
+def get_batch_output_path(input_path, output_dir, extension=None):
+    # The suffix keeps outputs from overwriting their inputs when both share a folder
+    stem, input_extension = os.path.splitext(os.path.basename(input_path))
+    return os.path.join(output_dir, f"{stem}_fulldome{extension or input_extension}")
+
+def get_batch_output_paths(input_paths, output_dir, extension=None):
+    # Inputs with the same name from different folders would share an output; later ones get a numeric suffix
+    outputs = OrderedDict()
+    taken = set()
+    for input_path in input_paths:
+        output_path = get_batch_output_path(input_path, output_dir, extension)
+        root, output_extension = os.path.splitext(output_path)
+        number = 1
+        while os.path.normcase(output_path) in taken:
+            number += 1
+            output_path = f"{root}_{number}{output_extension}"
+        taken.add(os.path.normcase(output_path))
+        outputs[input_path] = output_path
+    return outputs
+
+class BatchConversionThread(ConversionThread):
+    file_failed = pyqtSignal(str, str)
+    
+    reuse_maps = True
     
+    def __init__(self, input_paths, output_dir, output_extension=None, max_workers=None, **params):
+        # Same projection settings as a single export; per-file paths come from the batch
+        for key in ('input_path', 'output_path', 'is_video'):
+            params.pop(key, None)
+        # Camera tracks only animate videos
+        params['camera_track'] = None
+        super().__init__(input_paths[0] if input_paths else "", output_dir, False, **params)
+        # The same file picked twice is converted once
+        self.input_paths = list(OrderedDict.fromkeys(input_paths))
+        self.output_dir = output_dir
+        self.output_paths = get_batch_output_paths(self.input_paths, output_dir, output_extension)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        
     def run(self):
         try:
-            if self.is_video:
-                self.convert_video()
-            else:
-                self.convert_image()
+            self.convert_batch()
         except Exception as e:
-            self.error.emit(str(e))
+            self.failed = True
+            self.error.emit(f"Batch conversion error: {str(e)}")
+            
+    def convert_batch_item(self, input_path):
+        return self.convert_still(input_path, self.output_paths[input_path])
+        
+    def convert_batch(self):
+        self.start_timing()
+        os.makedirs(self.output_dir, exist_ok=True)
+        
+        # Group by resolution so each group builds its maps once
+        groups = OrderedDict()
+        for path in self.input_paths:
+            groups.setdefault(get_image_size(path), []).append(path)
+        
+        total = len(self.input_paths)
+        done = 0
+        failures = []
+        
+        def collect(finished):
+            count = 0
+            for future in finished:
+                path = futures.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((path, str(e)))
+                    self.file_failed.emit(path, str(e))
+                count += 1
+            return count
+        
+        # Reading, projection and writing all release the GIL, so threads overlap disk, codec and sampling
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            for paths in groups.values():
+                for path in paths:
+                    if self.cancel_requested:
+                        break
+                    # Bounded look-ahead keeps only a few decoded images in memory
+                    if len(futures) >= self.max_workers * 2:
+                        finished, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                        done += collect(finished)
+                        self.report_progress(done, total)
+                    futures[pool.submit(self.convert_batch_item, path)] = path
+                
+                # Finish the group before the next resolution replaces its maps
+                done += collect(list(futures))
+                self.report_progress(done, total)
+                if self.cancel_requested:
+                    break
+        
+        if self.cancel_requested:
+            return
+        self.report_progress(done, total, force=True)
+        if failures:
+            self.failed = True
+            path, message = failures[0]
+            self.error.emit(f"{len(failures)} of {total} images failed; first: {os.path.basename(path)}: {message}")
+
+# Settings a headless job falls back to when its preset leaves them out
+EXPORT_DEFAULTS = {
+    'input_format': 'Equirectangular',
+    'dome_type': 'standard',
+    'rotation': 0,
+    'zoom_factor': 1.0,
+    'tilt': 0,
+    'pan': 0,
+    'roll': 0,
+    'flip_h': False,
+    'flip_v': False
+}
+
+class WarmConverters:
+    # Still converters kept per export setting, so their maps and sampling plans survive between jobs
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.converters = OrderedDict()
+        self.lock = threading.Lock()
+        
+    def get(self, params):
+        key = json.dumps(params, sort_keys=True)
+        with self.lock:
+            converter = self.converters.get(key)
+            if converter is None:
+                converter = BatchConversionThread([], "", **params)
+                converter.start_timing()
+                self.converters[key] = converter
+                while len(self.converters) > self.max_entries:
+                    self.converters.popitem(last=False)
+            self.converters.move_to_end(key)
+            return converter
+
+def get_app_data_dir():
+    path = os.path.join(os.path.expanduser("~"), ".fulldome_exporter")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+class ExportJournal:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_app_data_dir(), "export_jobs.json")
+        self.lock = threading.Lock()
+        self.data = {'concurrency': 1, 'jobs': []}
+        self.load()
+        
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            # Keep an unreadable journal aside rather than silently overwriting it
+            os.replace(self.path, self.path + ".corrupt")
+        
+    def save(self):
+        # Write-then-rename so a crash never leaves a truncated journal
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        
+    def get_concurrency(self):
+        with self.lock:
+            return self.data.get('concurrency', 1)
+        
+    def set_concurrency(self, value):
+        with self.lock:
+            self.data['concurrency'] = max(1, int(value))
+            self.save()
+        
+    def add_job(self, params):
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'params': params,
+            'status': 'queued',
+            'frames_done': 0,
+            'segments': [],
+            'error': None,
+            'created': time.time()
+        }
+        with self.lock:
+            self.data['jobs'].append(job)
+            self.save()
+        return job['id']
     
-    def convert_image(self):
+    def update_job(self, job_id, **fields):
+        with self.lock:
+            for job in self.data['jobs']:
+                if job['id'] == job_id:
+                    job.update(fields)
+                    self.save()
+                    return
+    
+    def remove_job(self, job_id):
+        with self.lock:
+            self.data['jobs'] = [job for job in self.data['jobs'] if job['id'] != job_id]
+            self.save()
+    
+    def get_job(self, job_id):
+        with self.lock:
+            for job in self.data['jobs']:
+                if job['id'] == job_id:
+                    return json.loads(json.dumps(job))
+        return None
+    
+    def get_jobs(self):
+        with self.lock:
+            return json.loads(json.dumps(self.data['jobs']))
+    
+    def recover(self):
+        # Jobs still marked running were interrupted by a crash or restart
+        recovered = 0
+        with self.lock:
+            for job in self.data['jobs']:
+                if job['status'] == 'running':
+                    job['status'] = 'queued'
+                    recovered += 1
+            if recovered:
+                self.save()
+        return recovered
+
+class ExportQueue(QObject):
+    job_changed = pyqtSignal(str)
+    
+    def __init__(self, journal, segment_frames=300):
+        super().__init__()
+        self.journal = journal
+        self.segment_frames = segment_frames
+        self.running = {}
+        self.progress = {}
+        
+    def add_job(self, params):
+        job_id = self.journal.add_job(params)
+        self.job_changed.emit(job_id)
+        self.start_pending()
+        return job_id
+    
+    def set_concurrency(self, value):
+        self.journal.set_concurrency(value)
+        self.start_pending()
+        
+    def start_pending(self):
+        for job in self.journal.get_jobs():
+            if len(self.running) >= self.journal.get_concurrency():
+                break
+            if job['status'] == 'queued' and job['id'] not in self.running:
+                self.start_job(job)
+    
+    def start_job(self, job):
+        job_id = job['id']
+        thread = ConversionThread(
+            **job['params'],
+            start_frame=job['frames_done'],
+            segment_frames=self.segment_frames,
+            segments=job['segments']
+        )
+        
+        # Checkpoints are journaled on the worker thread before it moves on
+        thread.checkpoint.connect(
+            lambda checkpoint, job_id=job_id: self.journal.update_job(
+                job_id, frames_done=checkpoint['frames_done'], segments=checkpoint['segments']),
+            Qt.ConnectionType.DirectConnection
+        )
+        thread.progress.connect(lambda value, job_id=job_id: self.job_progress(job_id, value))
+        thread.error.connect(lambda message, job_id=job_id: self.journal.update_job(job_id, error=message))
+        thread.finished.connect(lambda job_id=job_id: self.job_finished(job_id))
+        
+        self.running[job_id] = thread
+        self.journal.update_job(job_id, status='running', error=None)
+        self.job_changed.emit(job_id)
+        thread.start()
+    
+    def job_progress(self, job_id, value):
+        self.progress[job_id] = value
+        self.job_changed.emit(job_id)
+    
+    def job_finished(self, job_id):
+        thread = self.running.pop(job_id, None)
+        if thread is None:
+            return
+        if thread.cancel_requested:
+            status = 'cancelled'
+        elif thread.failed:
+            status = 'failed'
+        else:
+            status = 'done'
+        self.journal.update_job(job_id, status=status)
+        self.job_changed.emit(job_id)
+        
+        # One failure doesn't stop the rest of the batch
+        self.start_pending()
+    
+    def cancel_job(self, job_id):
+        if job_id in self.running:
+            self.running[job_id].cancel()
+        else:
+            self.journal.update_job(job_id, status='cancelled')
+            self.job_changed.emit(job_id)
+
+def get_proxy_candidates(video_path, proxy_size):
+    # Preferred location is next to the source; fall back to the temp dir for read-only shares
+    root, _ = os.path.splitext(video_path)
+    digest = hashlib.sha1(os.path.abspath(video_path).encode('utf-8')).hexdigest()[:16]
+    return [
+        f"{root}.proxy{proxy_size}.mp4",
+        os.path.join(tempfile.gettempdir(), f"fulldome_proxy_{digest}_{proxy_size}.mp4")
+    ]
+
+def find_cached_proxy(video_path, proxy_size):
+    try:
+        source_mtime = os.path.getmtime(video_path)
+    except OSError:
+        return None
+    for proxy_path in get_proxy_candidates(video_path, proxy_size):
+        if os.path.isfile(proxy_path) and os.path.getmtime(proxy_path) >= source_mtime:
+            return proxy_path
+    return None
+
+class ProxyThread(QThread):
+    ready = pyqtSignal(str, str)
+    error = pyqtSignal(str)
+    
+    def __init__(self, input_path, proxy_size):
+        super().__init__()
+        self.input_path = input_path
+        self.proxy_size = proxy_size
+        self.cancelled = False
+        
+    def cancel(self):
+        self.cancelled = True
+        
+    def run(self):
         try:
-            # Read input image
-            img = cv2.imread(self.input_path)
-            if img is None:
-                raise Exception("Failed to load input image")
+            # Reuse a proxy from an earlier session if the source hasn't changed since
+            proxy_path = find_cached_proxy(self.input_path, self.proxy_size)
+            if proxy_path is not None:
+                self.ready.emit(self.input_path, proxy_path)
+                return
             
-            # Apply flips if needed
-            if self.flip_h:
-                img = cv2.flip(img, 1)
-            if self.flip_v:
-                img = cv2.flip(img, 0)
+            cap = cv2.VideoCapture(self.input_path)
+            if not cap.isOpened():
+                raise Exception("Failed to open input video")
             
-            # Convert the image
-            result = self.convert_frame(img)
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            
+            # Small sources are already cheap to decode
+            scale = self.proxy_size / max(width, height)
+            if scale >= 1.0:
+                cap.release()
+                return
+            proxy_width = max(2, int(width * scale) // 2 * 2)
+            proxy_height = max(2, int(height * scale) // 2 * 2)
+            
+            # Open a writer in the first location that accepts it
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            out = None
+            for candidate in get_proxy_candidates(self.input_path, self.proxy_size):
+                temp_path = candidate[:-len(".mp4")] + ".part.mp4"
+                out = cv2.VideoWriter(temp_path, fourcc, fps, (proxy_width, proxy_height))
+                if out.isOpened():
+                    proxy_path = candidate
+                    break
+                out.release()
+                out = None
+            if out is None:
+                cap.release()
+                raise Exception("No writable location for the preview proxy")
             
-            # Save the result
-            cv2.imwrite(self.output_path, result)
+            # Decode once at full resolution and store every frame downscaled
+            while not self.cancelled:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                out.write(cv2.resize(frame, (proxy_width, proxy_height), interpolation=cv2.INTER_AREA))
+            
+            cap.release()
+            out.release()
             
-            self.progress.emit(100)
+            if self.cancelled:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                return
             
+            # Publish atomically so a half-written proxy is never picked up
+            os.replace(temp_path, proxy_path)
+            self.ready.emit(self.input_path, proxy_path)
+            
+        except Exception as e:
+            self.error.emit(f"Proxy generation error: {str(e)}")
+
+class MediaLoader(QThread):
+    metadata_ready = pyqtSignal(str, dict)
+    video_ready = pyqtSignal(str, object, object)
+    image_ready = pyqtSignal(str, object, object)
+    error = pyqtSignal(str, str)
+    
+    def __init__(self, media_path, is_video, preview_size):
+        super().__init__()
+        self.media_path = media_path
+        self.is_video = is_video
+        self.preview_size = preview_size
+        self.cancelled = False
+        
+    def cancel(self):
+        # Opening a capture can't be interrupted, so a cancelled load just drops its results
+        self.cancelled = True
+        
+    def run(self):
+        try:
+            if self.is_video:
+                self.load_video()
+            else:
+                self.load_image()
         except Exception as e:
-            self.error.emit(f"Image conversion error: {str(e)}")
+            if not self.cancelled:
+                self.error.emit(self.media_path, str(e))
     
-    def convert_video(self):
+    def load_video(self):
+        cap = cv2.VideoCapture(self.media_path)
+        if self.cancelled:
+            cap.release()
+            return
+        if not cap.isOpened():
+            raise Exception("Failed to open video")
+        
+        # Properties are cheap and let the timeline appear before the first decode
+        metadata = {
+            'total_frames': int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            'fps': cap.get(cv2.CAP_PROP_FPS),
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        }
+        self.metadata_ready.emit(self.media_path, metadata)
+        
+        # First-frame thumbnail; the open capture is handed over for scrubbing
+        ret, frame = cap.read()
+        if self.cancelled:
+            cap.release()
+            return
+        if not ret:
+            cap.release()
+            raise Exception("Failed to read first frame")
+        self.video_ready.emit(self.media_path, cap, downscale_to_fit(frame, self.preview_size))
+    
+    def load_image(self):
+        if is_streaming_source(self.media_path):
+            # Giant stills are previewed from a subsampled read of the mapped file
+            image = MappedImage.open(self.media_path).read_preview(self.preview_size * 2)
+        else:
+            image = read_image(self.media_path)
+        if self.cancelled:
+            return
+        if image is None:
+            raise Exception("Failed to load image")
+        # The preview is always displayed as 8-bit BGR
+        preview_image = convert_depth(flatten_alpha(downscale_to_fit(image, self.preview_size)), np.uint8)
+        self.image_ready.emit(self.media_path, image, preview_image)
+
+class PlaybackDecoder(QThread):
+    error = pyqtSignal(str)
+    
+    def __init__(self, video_path, start_frame, preview_size, queue_size=8):
+        super().__init__()
+        self.video_path = video_path
+        self.start_frame = start_frame
+        self.preview_size = preview_size
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.stopped = False
+        
+    def stop(self):
+        self.stopped = True
+        
+    def run(self):
         try:
-            # Read input video
-            cap = cv2.VideoCapture(self.input_path)
+            cap = cv2.VideoCapture(self.video_path)
             if not cap.isOpened():
-                raise Exception("Failed to open input video")
-            
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            # Create output video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(self.output_path, fourcc, fps, (width, height))
+                raise Exception("Failed to open video for playback")
             
-            # Convert frames
-            for i in range(total_frames):
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Apply flips if needed
-                if self.flip_h:
-                    frame = cv2.flip(frame, 1)
-                if self.flip_v:
-                    frame = cv2.flip(frame, 0)
-                
-                # Convert frame
-                result = self.convert_frame(frame)
-                
-                # Write frame to output video
-                out.write(result)
+            # Seek once, then decode sequentially ahead of the display clock
+            cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+            index = self.start_frame
+            while not self.stopped:
+                with PROFILER.span('playback_decode', 'preview'):
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                    frame = downscale_to_fit(frame, self.preview_size)
                 
-                # Emit progress signal
-                self.progress.emit(int((i + 1) / total_frames * 100))
+                # Block while the queue is full, but keep checking for stop requests
+                while not self.stopped:
+                    try:
+                        self.frames.put((index, frame), timeout=0.05)
+                        break
+                    except queue.Full:
+                        continue
+                index += 1
             
-            # Release resources
             cap.release()
-            out.release()
             
         except Exception as e:
-            self.error.emit(f"Video conversion error: {str(e)}")
+            self.error.emit(f"Playback error: {str(e)}")
 
 class UIScaleDialog(QDialog):
     def __init__(self, current_scale, parent=None):
@@ -238,16 +2605,64 @@ class UIScaleDialog(QDialog):
     def get_scale(self):
         return self.scale_slider.value() / 100
 
+class PreviewLabel(QLabel):
+    def __init__(self, text, parent=None):
+        super().__init__(text, parent)
+        self.frame_image = None
+        
+    def show_message(self, text):
+        self.frame_image = None
+        self.setText(text)
+        self.update()
+        
+    def set_frame_image(self, image):
+        # The image wraps a buffer owned by PreviewWidget, so only a repaint is needed
+        if self.text():
+            self.setText("")
+        self.frame_image = image
+        self.update()
+        
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.frame_image is None:
+            return
+        
+        # Draw centered at logical size; the image carries the device pixel ratio
+        with PROFILER.span('preview_paint', 'preview'):
+            rect = self.contentsRect()
+            size = self.frame_image.deviceIndependentSize()
+            x = rect.x() + (rect.width() - size.width()) / 2
+            y = rect.y() + (rect.height() - size.height()) / 2
+            painter = QPainter(self)
+            painter.drawImage(QPointF(x, y), self.frame_image)
+            painter.end()
+
 class PreviewWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.ui_scale = 1.0  # Default scale
         self.initUI()
         self.preview_image = None
+        self.preview_buffer = None
+        self.preview_qimage = None
         self.original_image = None
         self.video_capture = None
+        self.video_path = None
+        self.media_loader = None
+        self.retired_threads = []
+        self.proxy_thread = None
+        self.using_proxy = False
+        self.proxy_path = None
+        self.preview_size = 600
+        self.camera_track = None
+        self.current_frame_index = 0
         self.current_frame = None
         self.is_playing = False
+        self.playback_decoder = None
+        self.playback_pending = None
+        self.playback_timer = QTimer(self)
+        self.playback_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.playback_timer.timeout.connect(self.playback_tick)
         self.total_frames = 0
         self.fps = 0
         self.zoom_factor = 1.0
@@ -256,6 +2671,11 @@ class PreviewWidget(QWidget):
         self.roll = 0.0
         self.flip_h = False
         self.flip_v = False
+        self.stereo_layout = 'mono'
+        self.stereo_output = 'left'
+        self.eye_buffer = None
+        self.output_projection = 'fulldome'
+        self.input_format = 'Equirectangular'
         self.current_theme = "green"  # Default theme
         
     def get_theme_colors(self, theme_name):
@@ -388,6 +2808,8 @@ class PreviewWidget(QWidget):
         self.import_image_btn.setStyleSheet(button_style)
         self.import_video_btn.setStyleSheet(button_style)
         self.export_btn.setStyleSheet(button_style)
+        self.queue_btn.setStyleSheet(button_style)
+        self.batch_btn.setStyleSheet(button_style)
         self.preview_label.setStyleSheet(label_style)
         self.controls_group.setStyleSheet(groupbox_style)
         
@@ -487,20 +2909,32 @@ class PreviewWidget(QWidget):
         self.play_button.setMinimumWidth(100)
         self.play_button.setMinimumHeight(30)
         
+        # Playback statistics (throughput and dropped frames)
+        self.playback_stats_label = QLabel("")
+        self.playback_stats_label.setStyleSheet("color: #c2ff4d; font-size: 12px;")
+        
         playback_layout.addStretch()
         playback_layout.addWidget(self.play_button)
+        playback_layout.addWidget(self.playback_stats_label)
         playback_layout.addStretch()
         
+        # Shown when the low-res proxy couldn't be built
+        self.proxy_status_label = QLabel("")
+        self.proxy_status_label.setStyleSheet("color: #c2ff4d; font-size: 12px;")
+        self.proxy_status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.proxy_status_label.setVisible(False)
+        
         # Add layouts to video controls
         video_controls_layout.addLayout(timeline_layout)
         video_controls_layout.addLayout(playback_layout)
+        video_controls_layout.addWidget(self.proxy_status_label)
         
         # Initially hide video controls
         self.video_controls.setVisible(False)
         
         # Preview section
         preview_layout = QVBoxLayout()
-        self.preview_label = QLabel("Import an image or video to start")
+        self.preview_label = PreviewLabel("Import an image or video to start")
         self.preview_label.setMinimumSize(600, 600)  # Reduced size
         self.preview_label.setMaximumSize(800, 800)  # Maximum size limit
         self.preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -571,12 +3005,28 @@ class PreviewWidget(QWidget):
         self.export_btn.setFont(QFont('Segoe UI', 12))
         self.export_btn.setEnabled(False)
         
+        # Queue button (runs the export later, with crash-resume)
+        self.queue_btn = QPushButton("Add to Queue")
+        self.queue_btn.setMinimumHeight(50)
+        self.queue_btn.setFont(QFont('Segoe UI', 12))
+        self.queue_btn.setEnabled(False)
+        
+        # Batch button (converts many stills with the current view settings)
+        self.batch_btn = QPushButton("Batch Images...")
+        self.batch_btn.setMinimumHeight(50)
+        self.batch_btn.setFont(QFont('Segoe UI', 12))
+        
+        export_layout = QHBoxLayout()
+        export_layout.addWidget(self.export_btn)
+        export_layout.addWidget(self.queue_btn)
+        export_layout.addWidget(self.batch_btn)
+        
         # Add all sections to main layout with proper spacing
         main_layout.addLayout(top_layout)
         main_layout.addWidget(self.video_controls)  # Add video controls right after top layout
         main_layout.addLayout(preview_layout)
         main_layout.addWidget(self.controls_group)
-        main_layout.addWidget(self.export_btn)
+        main_layout.addLayout(export_layout)
         
         # Connect theme change signal
         self.theme_combo.currentTextChanged.connect(self.handle_theme_change)
@@ -687,35 +3137,24 @@ class PreviewWidget(QWidget):
         
     def set_video(self, video_path):
         try:
-            if self.video_capture is not None:
-                self.video_capture.release()
-            
-            self.video_capture = cv2.VideoCapture(video_path)
-            if not self.video_capture.isOpened():
-                raise Exception("Failed to open video")
-            
-            # Get video properties
-            self.total_frames = int(self.video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
-            self.fps = self.video_capture.get(cv2.CAP_PROP_FPS)
+            self.stop_playback()
+            self.stop_proxy_thread()
+            self.close_media()
             
-            # Setup timeline
-            self.timeline_slider.setRange(0, self.total_frames - 1)
-            self.timeline_slider.setValue(0)
-            self.timeline_slider.setEnabled(True)
-            self.play_button.setEnabled(True)
+            self.video_path = video_path
+            self.using_proxy = False
+            self.proxy_path = None
+            self.proxy_status_label.setVisible(False)
+            self.preview_label.show_message("Loading video...")
             
-            # Show video controls
-            self.video_controls.setVisible(True)
+            # Open, probe and decode the first frame off the GUI thread
+            self.start_loader(video_path, True)
             
-            # Enable flip controls
-            self.flip_h_btn.setEnabled(True)
-            self.flip_v_btn.setEnabled(True)
-            
-            # Read first frame
-            self.seek_frame(0)
-            
-            # Enable other controls
-            self.enable_controls()
+            # Build (or pick up) the low-res preview proxy in the background
+            self.proxy_thread = ProxyThread(video_path, self.preview_size)
+            self.proxy_thread.ready.connect(self.proxy_ready)
+            self.proxy_thread.error.connect(self.proxy_failed)
+            self.proxy_thread.start()
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load video: {str(e)}")
@@ -723,30 +3162,150 @@ class PreviewWidget(QWidget):
     def set_image(self, image_path):
         try:
             # Stop video playback if active
-            self.is_playing = False
-            if self.video_capture is not None:
-                self.video_capture.release()
-                self.video_capture = None
+            self.stop_playback()
+            self.stop_proxy_thread()
+            self.close_media()
+            self.video_path = None
             
             # Hide video controls
             self.video_controls.setVisible(False)
+            self.preview_label.show_message("Loading image...")
             
-            self.original_image = cv2.imread(image_path)
-            if self.original_image is None:
-                raise Exception("Failed to load image")
-            
-            # Enable flip controls
-            self.flip_h_btn.setEnabled(True)
-            self.flip_v_btn.setEnabled(True)
-            
-            # Enable other controls
-            self.enable_controls()
-            
-            self.update_preview()
+            self.start_loader(image_path, False)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load preview image: {str(e)}")
 
+    def close_media(self):
+        if self.video_capture is not None:
+            self.video_capture.release()
+            self.video_capture = None
+        self.current_frame = None
+        self.original_image = None
+        self.preview_image = None
+
+    def retire_thread(self, thread):
+        # Keep a reference until the thread exits so Qt doesn't destroy it while running
+        self.retired_threads = [t for t in self.retired_threads if t.isRunning()]
+        if thread.isRunning():
+            self.retired_threads.append(thread)
+
+    def start_loader(self, media_path, is_video):
+        # A new import supersedes any load still in progress
+        if self.media_loader is not None:
+            self.media_loader.cancel()
+            self.retire_thread(self.media_loader)
+        
+        self.media_loader = MediaLoader(media_path, is_video, self.preview_size)
+        self.media_loader.metadata_ready.connect(self.video_metadata_ready)
+        self.media_loader.video_ready.connect(self.video_ready)
+        self.media_loader.image_ready.connect(self.image_ready)
+        self.media_loader.error.connect(self.media_load_failed)
+        self.media_loader.start()
+
+    def video_metadata_ready(self, video_path, metadata):
+        if self.sender() is not self.media_loader:
+            return
+        
+        # Get video properties
+        self.total_frames = metadata['total_frames']
+        self.fps = metadata['fps']
+        
+        # Setup timeline without seeking the (not yet available) capture
+        self.timeline_slider.blockSignals(True)
+        self.timeline_slider.setRange(0, max(self.total_frames - 1, 0))
+        self.timeline_slider.setValue(0)
+        self.timeline_slider.blockSignals(False)
+        self.update_time_label(0)
+        
+        # Show video controls
+        self.video_controls.setVisible(True)
+
+    def video_ready(self, video_path, capture, first_frame):
+        if self.sender() is not self.media_loader:
+            capture.release()
+            return
+        
+        self.video_capture = capture
+        self.current_frame = first_frame
+        self.current_frame_index = 0
+        self.timeline_slider.setEnabled(True)
+        self.play_button.setEnabled(True)
+        
+        # Enable flip controls
+        self.flip_h_btn.setEnabled(True)
+        self.flip_v_btn.setEnabled(True)
+        
+        # Enable other controls
+        self.enable_controls()
+        self.update_preview()
+        
+        # The proxy may have been found before the capture finished opening
+        if self.proxy_path is not None:
+            self.activate_proxy()
+
+    def image_ready(self, image_path, image, preview_image):
+        if self.sender() is not self.media_loader:
+            return
+        
+        self.original_image = image
+        self.preview_image = preview_image
+        
+        # Enable flip controls
+        self.flip_h_btn.setEnabled(True)
+        self.flip_v_btn.setEnabled(True)
+        
+        # Enable other controls
+        self.enable_controls()
+        
+        self.update_preview()
+
+    def media_load_failed(self, media_path, message):
+        if self.sender() is not self.media_loader:
+            return
+        self.preview_label.show_message("Import an image or video to start")
+        QMessageBox.critical(self, "Error", f"Failed to load media: {message}")
+
+    def stop_proxy_thread(self):
+        if self.proxy_thread is not None:
+            self.proxy_thread.cancel()
+            self.retire_thread(self.proxy_thread)
+            self.proxy_thread = None
+
+    def proxy_ready(self, source_path, proxy_path):
+        # Ignore proxies for media that has since been replaced
+        if source_path != self.video_path:
+            return
+        self.proxy_path = proxy_path
+        if self.video_capture is not None:
+            self.activate_proxy()
+
+    def proxy_failed(self, message):
+        if self.sender() is not self.proxy_thread:
+            return
+        # The preview keeps scrubbing the full-resolution source, just more slowly
+        self.proxy_path = None
+        self.proxy_status_label.setText(f"{message} - previewing the original video")
+        self.proxy_status_label.setVisible(True)
+
+    def activate_proxy(self):
+        proxy_capture = cv2.VideoCapture(self.proxy_path)
+        if not proxy_capture.isOpened():
+            self.proxy_path = None
+            return
+        
+        # Frame indices must line up with the source for scrubbing to stay accurate
+        if int(proxy_capture.get(cv2.CAP_PROP_FRAME_COUNT)) != self.total_frames:
+            proxy_capture.release()
+            self.proxy_path = None
+            return
+        
+        self.video_capture.release()
+        self.video_capture = proxy_capture
+        self.using_proxy = True
+        if not self.is_playing:
+            self.seek_frame(self.timeline_slider.value())
+
     def enable_controls(self):
         # Enable all controls
         self.tilt_slider.setEnabled(True)
@@ -758,6 +3317,7 @@ class PreviewWidget(QWidget):
         self.zoom_slider.setEnabled(True)
         self.zoom_spinbox.setEnabled(True)
         self.export_btn.setEnabled(True)
+        self.queue_btn.setEnabled(True)
 
     def seek_frame(self, frame_number):
         if self.video_capture is None:
@@ -766,13 +3326,15 @@ class PreviewWidget(QWidget):
         self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
         ret, frame = self.video_capture.read()
         if ret:
-            self.current_frame = frame
+            self.current_frame = self.downscale_for_preview(frame)
+            self.current_frame_index = frame_number
             self.update_preview()
-            
-            # Update time label
-            current_time = frame_number / self.fps
-            total_time = self.total_frames / self.fps
-            self.time_label.setText(f"{self.format_time(current_time)} / {self.format_time(total_time)}")
+            self.update_time_label(frame_number)
+
+    def update_time_label(self, frame_number):
+        current_time = frame_number / self.fps
+        total_time = self.total_frames / self.fps
+        self.time_label.setText(f"{self.format_time(current_time)} / {self.format_time(total_time)}")
 
     def format_time(self, seconds):
         minutes = int(seconds // 60)
@@ -780,8 +3342,7 @@ class PreviewWidget(QWidget):
         return f"{minutes}:{seconds:02d}"
 
     def timeline_pressed(self):
-        self.is_playing = False
-        self.play_button.setText("Play")
+        self.stop_playback()
 
     def timeline_released(self):
         self.seek_frame(self.timeline_slider.value())
@@ -791,145 +3352,227 @@ class PreviewWidget(QWidget):
             self.seek_frame(value)
 
     def toggle_playback(self):
-        self.is_playing = not self.is_playing
-        self.play_button.setText("Pause" if self.is_playing else "Play")
-        
         if self.is_playing:
-            self.play_video()
+            self.stop_playback()
+        else:
+            self.start_playback()
 
-    def play_video(self):
-        if not self.is_playing or self.video_capture is None:
+    def start_playback(self):
+        if self.video_capture is None or self.fps <= 0:
             return
-            
-        current_frame = self.timeline_slider.value()
-        if current_frame >= self.total_frames - 1:
-            current_frame = 0
-            self.timeline_slider.setValue(0)
-            
-        self.seek_frame(current_frame)
-        self.timeline_slider.setValue(current_frame + 1)
         
-        # Schedule next frame
-        delay = int(1000 / self.fps)  # Convert to milliseconds
-        QTimer.singleShot(delay, self.play_video)
+        start_frame = self.timeline_slider.value()
+        if start_frame >= self.total_frames - 1:
+            start_frame = 0
+        
+        # Decode on a worker thread from the proxy when one is available
+        video_path = self.proxy_path if self.using_proxy else self.video_path
+        self.playback_decoder = PlaybackDecoder(video_path, start_frame, self.preview_size)
+        self.playback_decoder.error.connect(self.playback_failed)
+        self.playback_decoder.start()
+        
+        self.is_playing = True
+        self.play_button.setText("Pause")
+        self.playback_pending = None
+        self.playback_start_frame = start_frame
+        self.playback_index = start_frame - 1
+        self.playback_clock = time.perf_counter()
+        self.playback_shown = 0
+        self.playback_dropped = 0
+        self.playback_render_time = 0.0
+        self.playback_stats_time = self.playback_clock
+        
+        # Tick faster than the source rate so frame boundaries are hit on time
+        self.playback_timer.start(max(1, int(500 / self.fps)))
+
+    def stop_playback(self):
+        self.playback_timer.stop()
+        self.is_playing = False
+        self.play_button.setText("Play")
+        if self.playback_decoder is not None:
+            self.playback_decoder.stop()
+            self.playback_decoder.wait()
+            self.playback_decoder = None
+        self.playback_pending = None
+
+    def playback_failed(self, message):
+        # Ignore errors from a decoder that has already been replaced
+        if self.sender() is not self.playback_decoder:
+            return
+        self.stop_playback()
+        QMessageBox.critical(self, "Error", message)
+
+    def playback_tick(self):
+        if not self.is_playing or self.playback_decoder is None:
+            return
+        
+        PROFILER.count('playback_queue', self.playback_decoder.frames.qsize())
+        
+        # The wall clock decides which frame should be on screen
+        now = time.perf_counter()
+        target = self.playback_start_frame + int((now - self.playback_clock) * self.fps)
+        if target >= self.total_frames:
+            self.stop_playback()
+            return
+        if target <= self.playback_index:
+            return
+        
+        # Take the newest decoded frame that is due; anything older is dropped
+        shown = None
+        while True:
+            item = self.playback_pending
+            if item is None:
+                try:
+                    item = self.playback_decoder.frames.get_nowait()
+                except queue.Empty:
+                    break
+            if item[0] > target:
+                self.playback_pending = item
+                break
+            self.playback_pending = None
+            if shown is not None:
+                self.playback_dropped += 1
+            shown = item
+        if shown is None:
+            return
+        
+        index, frame = shown
+        self.playback_index = index
+        self.current_frame = frame
+        self.current_frame_index = index
+        
+        render_start = time.perf_counter()
+        self.update_preview()
+        self.playback_render_time += time.perf_counter() - render_start
+        self.playback_shown += 1
+        
+        # Move the timeline without triggering a seek
+        self.timeline_slider.blockSignals(True)
+        self.timeline_slider.setValue(index)
+        self.timeline_slider.blockSignals(False)
+        self.update_time_label(index)
+        
+        if now - self.playback_stats_time >= 0.5:
+            self.playback_stats_time = now
+            self.update_playback_stats(now)
+
+    def update_playback_stats(self, now):
+        elapsed = max(now - self.playback_clock, 1e-6)
+        shown_fps = self.playback_shown / elapsed
+        render_ms = self.playback_render_time / max(self.playback_shown, 1) * 1000
+        total = self.playback_shown + self.playback_dropped
+        dropped_pct = self.playback_dropped / max(total, 1) * 100
+        self.playback_stats_label.setText(
+            f"{shown_fps:.1f}/{self.fps:.1f} fps | dropped {self.playback_dropped} ({dropped_pct:.1f}%) | {render_ms:.1f} ms/frame"
+        )
+
+    def downscale_for_preview(self, frame):
+        # Proxy frames already arrive at preview size
+        return downscale_to_fit(frame, self.preview_size)
+
+    def get_preview_buffer(self):
+        # Render at the label's device-pixel size so Qt never has to rescale
+        rect = self.preview_label.contentsRect()
+        ratio = self.preview_label.devicePixelRatioF()
+        side = int(min(rect.width(), rect.height()) * ratio)
+        if side < 16:
+            side = self.preview_size
+        
+        if self.preview_buffer is None or self.preview_buffer.shape[0] != side:
+            # Persistent BGR buffer wrapped by a QImage without copying
+            self.preview_buffer = np.zeros((side, side, 3), dtype=np.uint8)
+            self.preview_qimage = QImage(self.preview_buffer.data, side, side, 3 * side, QImage.Format.Format_BGR888)
+        self.preview_qimage.setDevicePixelRatio(ratio)
+        return self.preview_buffer
 
-    def convert_to_fisheye(self, frame, rotation_degrees):
+    def render_preview(self, frame):
         try:
-            height, width = frame.shape[:2]
-            
-            # Create a square output image
-            dome_size = min(height, width)
-            result = np.zeros((dome_size, dome_size, 3), dtype=np.uint8)
-            
-            # Create coordinate maps
-            y, x = np.meshgrid(np.arange(dome_size), np.arange(dome_size), indexing='ij')
-            center = dome_size // 2
-            
-            # Calculate normalized coordinates
-            dx = (x - center) / center
-            dy = (y - center) / center
-            r = np.sqrt(dx**2 + dy**2)
-            theta = np.arctan2(dy, dx)
-            
-            # Create circular mask
-            mask = r <= 1.0
-            
-            # Apply zoom factor to radius calculation
-            r_scaled = r[mask] * self.zoom_factor
-            
-            # Convert to spherical coordinates
-            phi = r_scaled * 0.5 * np.pi  # Azimuthal angle (0 to pi/2)
-            theta_sph = theta[mask]       # Polar angle (-pi to pi)
-            
-            # Convert to 3D cartesian coordinates
-            x_cart = np.sin(phi) * np.cos(theta_sph)
-            y_cart = np.sin(phi) * np.sin(theta_sph)
-            z_cart = np.cos(phi)
-            
-            # Convert angles to radians
-            tilt_rad = np.radians(self.tilt)
-            pan_rad = np.radians(self.pan)
-            roll_rad = np.radians(self.roll)
+            buffer = self.get_preview_buffer()
             
-            # Apply rotations in order: tilt (X) -> pan (Y) -> roll (Z)
+            # Stereo sources preview the exported eye; anaglyph renders both and combines them
+            mono_aspect = get_mono_aspect(self.input_format, self.output_projection)
+            layout = get_stereo_layout(self.stereo_layout, frame.shape[1], frame.shape[0], mono_aspect)
+            if layout != 'mono':
+                left, right = split_stereo(frame, layout)
+                if self.stereo_output == 'anaglyph':
+                    if self.eye_buffer is None or self.eye_buffer.shape != buffer.shape:
+                        self.eye_buffer = np.zeros_like(buffer)
+                    self.render_preview_view(left, self.eye_buffer)
+                    self.render_preview_view(right, buffer)
+                    compose_anaglyph(self.eye_buffer, buffer, dst=buffer)
+                    self.preview_label.set_frame_image(self.preview_qimage)
+                    return
+                frame = right if self.stereo_output == 'right' else left
             
-            # Tilt rotation (around X-axis)
-            y_tilt = y_cart * np.cos(tilt_rad) - z_cart * np.sin(tilt_rad)
-            z_tilt = y_cart * np.sin(tilt_rad) + z_cart * np.cos(tilt_rad)
-            x_tilt = x_cart
-            
-            # Pan rotation (around Y-axis)
-            x_pan = x_tilt * np.cos(pan_rad) + z_tilt * np.sin(pan_rad)
-            z_pan = -x_tilt * np.sin(pan_rad) + z_tilt * np.cos(pan_rad)
-            y_pan = y_tilt
-            
-            # Roll rotation (around Z-axis)
-            x_roll = x_pan * np.cos(roll_rad) - y_pan * np.sin(roll_rad)
-            y_roll = x_pan * np.sin(roll_rad) + y_pan * np.cos(roll_rad)
-            z_roll = z_pan
-            
-            # Convert back to spherical coordinates
-            phi_rot = np.arccos(z_roll)
-            theta_rot = np.arctan2(y_roll, x_roll)
-            
-            # Convert to image coordinates
-            x_src = ((theta_rot + np.pi) / (2 * np.pi)) * width
-            y_src = (phi_rot / np.pi) * height
-            
-            # Handle wraparound and clipping
-            x_src = np.mod(x_src, width)
-            y_src = np.clip(y_src, 0, height - 1)
-            
-            # Sample pixels
-            result[mask] = frame[y_src.astype(np.int32), x_src.astype(np.int32)]
-            
-            # Convert BGR to RGB for Qt
-            result = cv2.cvtColor(result, cv2.COLOR_BGR2RGB)
-            
-            return result
+            self.render_preview_view(frame, buffer)
+            self.preview_label.set_frame_image(self.preview_qimage)
             
         except Exception as e:
             raise Exception(f"Preview conversion error: {str(e)}")
         
+    def render_preview_view(self, frame, buffer):
+        height, width = frame.shape[:2]
+        
+        # Show the camera track at the current frame on top of the slider values
+        seconds = self.current_frame_index / self.fps if self.video_capture is not None and self.fps > 0 else 0.0
+        tilt, pan, roll, zoom_factor = apply_camera_track(
+            self.camera_track, seconds, self.tilt, self.pan, self.roll, self.zoom_factor
+        )
+        if self.output_projection != 'fulldome':
+            self.render_inverse_view(frame, buffer, tilt, pan, roll, zoom_factor)
+            return
+        if KERNEL.is_fused() and self.camera_track is not None:
+            # Animated views change every frame, so skip the maps and project straight into the buffer
+            with PROFILER.span('preview_sample', 'preview'):
+                KERNEL.project(frame, buffer.shape[0], zoom_factor, tilt, pan, roll,
+                               flip_h=self.flip_h, flip_v=self.flip_v, out=buffer)
+            return
+        
+        with PROFILER.span('preview_maps', 'preview'):
+            map_x, map_y = MAP_CACHE.get_maps(
+                buffer.shape[0], width, height, zoom_factor,
+                tilt, pan, roll, flip_h=self.flip_h, flip_v=self.flip_v, store=self.camera_track is None
+            )
+        
+        # Single sampling pass straight into the displayed buffer
+        with PROFILER.span('preview_sample', 'preview'):
+            cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, dst=buffer, borderMode=cv2.BORDER_CONSTANT)
+        
+    def render_inverse_view(self, frame, buffer, tilt, pan, roll, zoom_factor):
+        # Equirect and cubemap views fill the square preview's width and are letterboxed
+        side = buffer.shape[0]
+        size = side // get_projection_shape(self.output_projection, 1)[1]
+        with PROFILER.span('preview_maps', 'preview'):
+            map_x, map_y = MAP_CACHE.get_inverse_maps(
+                self.output_projection, size, min(frame.shape[:2]), zoom_factor, tilt, pan, roll,
+                flip_h=self.flip_h, flip_v=self.flip_v, store=self.camera_track is None
+            )
+        with PROFILER.span('preview_sample', 'preview'):
+            view = cv2.remap(frame, map_x, map_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        top = (side - view.shape[0]) // 2
+        left = (side - view.shape[1]) // 2
+        buffer[...] = 0
+        buffer[top:top + view.shape[0], left:left + view.shape[1]] = view
+        
     def update_preview(self):
         if self.video_capture is not None and self.current_frame is not None:
-            frame = self.current_frame.copy()
-        elif self.original_image is not None:
-            frame = self.original_image.copy()
+            frame = self.current_frame
+        elif self.preview_image is not None:
+            frame = self.preview_image
         else:
             return
             
         try:
-            # Apply flips before preview conversion
-            if self.flip_h:
-                frame = cv2.flip(frame, 1)  # 1 for horizontal flip
-            if self.flip_v:
-                frame = cv2.flip(frame, 0)  # 0 for vertical flip
-            
-            # Create a preview version
-            preview_size = 600  # Reduced size
-            height, width = frame.shape[:2]
-            scale = preview_size / max(height, width)
-            small_image = cv2.resize(frame, (int(width * scale), int(height * scale)))
-            
-            # Convert to fisheye with current rotation
-            preview = self.convert_to_fisheye(small_image, 0)
-            
-            # Convert to Qt image
-            height, width = preview.shape[:2]
-            bytes_per_line = 3 * width
-            qt_image = QImage(preview.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-            
-            # Scale the image to fit the label while maintaining aspect ratio
-            pixmap = QPixmap.fromImage(qt_image)
-            scaled_pixmap = pixmap.scaled(self.preview_label.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            
-            # Display preview
-            self.preview_label.setPixmap(scaled_pixmap)
+            self.render_preview(frame)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to update preview: {str(e)}")
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # The preview buffer tracks the label size, so re-render at the new size
+        self.update_preview()
+
     def toggle_flip_h(self):
         self.flip_h = not self.flip_h
         self.flip_h_btn.setStyleSheet(f"background-color: {'#444444' if self.flip_h else '#333333'}")
@@ -983,8 +3626,9 @@ class PreviewWidget(QWidget):
             btn.setFont(QFont('Segoe UI', int(10 * self.ui_scale)))
         
         # Update export button
-        self.export_btn.setMinimumHeight(int(40 * self.ui_scale))
-        self.export_btn.setFont(QFont('Segoe UI', int(10 * self.ui_scale)))
+        for btn in [self.export_btn, self.queue_btn, self.batch_btn]:
+            btn.setMinimumHeight(int(40 * self.ui_scale))
+            btn.setFont(QFont('Segoe UI', int(10 * self.ui_scale)))
         
         # Update theme selector
         self.theme_combo.setMinimumHeight(int(30 * self.ui_scale))
@@ -1009,9 +3653,14 @@ class PreviewWidget(QWidget):
 class FulldomeConverter(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.export_queue = ExportQueue(ExportJournal())
         self.initUI()
         self.current_file = None
         self.is_video = False
+        self.camera_track_data = None
+        
+        # Offer to resume jobs left over from a crash or earlier session
+        QTimer.singleShot(0, self.resume_export_queue)
         
     def initUI(self):
         self.setWindowTitle('Fulldome Exporter')
@@ -1059,9 +3708,156 @@ class FulldomeConverter(QMainWindow):
         dome_layout.addWidget(self.dome_combo)
         settings_layout.addLayout(dome_layout)
         
+        # Forward to a dome, or a dome master back to equirect / cubemap
+        projection_layout = QHBoxLayout()
+        projection_label = QLabel("Output:")
+        self.projection_combo = QComboBox()
+        self.projection_combo.addItems(list(OUTPUT_PROJECTIONS))
+        projection_layout.addWidget(projection_label)
+        projection_layout.addWidget(self.projection_combo)
+        settings_layout.addLayout(projection_layout)
+        
+        # Stereo 360 input (eyes stacked or side by side) and which eye(s) to export
+        stereo_layout = QHBoxLayout()
+        stereo_label = QLabel("Stereo Input:")
+        self.stereo_combo = QComboBox()
+        self.stereo_combo.addItems(list(STEREO_LAYOUTS))
+        stereo_layout.addWidget(stereo_label)
+        stereo_layout.addWidget(self.stereo_combo)
+        settings_layout.addLayout(stereo_layout)
+        
+        eye_layout = QHBoxLayout()
+        eye_label = QLabel("Stereo Output:")
+        self.eye_combo = QComboBox()
+        self.eye_combo.addItems(list(STEREO_OUTPUTS))
+        self.eye_combo.setEnabled(False)
+        eye_layout.addWidget(eye_label)
+        eye_layout.addWidget(self.eye_combo)
+        settings_layout.addLayout(eye_layout)
+        
+        # Output bit depth (stills; video is always 8-bit)
+        depth_layout = QHBoxLayout()
+        depth_label = QLabel("Bit Depth:")
+        self.depth_combo = QComboBox()
+        self.depth_combo.addItems(list(OUTPUT_DEPTHS))
+        depth_layout.addWidget(depth_label)
+        depth_layout.addWidget(self.depth_combo)
+        settings_layout.addLayout(depth_layout)
+        
+        # Output resolution; smaller outputs sample prefiltered pyramid levels
+        size_layout = QHBoxLayout()
+        size_label = QLabel("Output Size:")
+        self.size_combo = QComboBox()
+        self.size_combo.addItems(['Source', '8192', '4096', '2048', '1024'])
+        size_layout.addWidget(size_label)
+        size_layout.addWidget(self.size_combo)
+        settings_layout.addLayout(size_layout)
+        
+        # Footprint-aware (mip level of detail) sampling instead of point sampling
+        self.antialias_checkbox = QCheckBox("Antialiased sampling")
+        settings_layout.addWidget(self.antialias_checkbox)
+        
+        # Reuse the projection of frames identical to the one before (videos)
+        duplicates_layout = QHBoxLayout()
+        self.duplicates_checkbox = QCheckBox("Skip duplicate frames")
+        tolerance_label = QLabel("Tolerance:")
+        self.tolerance_spinbox = QDoubleSpinBox()
+        self.tolerance_spinbox.setRange(0.0, 2.0)
+        self.tolerance_spinbox.setSingleStep(0.05)
+        self.tolerance_spinbox.setDecimals(2)
+        self.tolerance_spinbox.setToolTip("Mean difference (in 8-bit levels) still treated as the same frame; 0 = identical only")
+        duplicates_layout.addWidget(self.duplicates_checkbox)
+        duplicates_layout.addWidget(tolerance_label)
+        duplicates_layout.addWidget(self.tolerance_spinbox)
+        settings_layout.addLayout(duplicates_layout)
+        
+        # RGBA output with the area outside the dome circle left transparent (PNG/TIFF/EXR stills)
+        self.transparent_checkbox = QCheckBox("Transparent outside dome (RGBA)")
+        settings_layout.addWidget(self.transparent_checkbox)
+        
+        # Keyframed camera animation
+        track_layout = QHBoxLayout()
+        track_label = QLabel("Camera Track:")
+        self.track_name_label = QLabel("None")
+        self.load_track_btn = QPushButton("Load...")
+        self.clear_track_btn = QPushButton("Clear")
+        self.clear_track_btn.setEnabled(False)
+        track_layout.addWidget(track_label)
+        track_layout.addWidget(self.track_name_label)
+        track_layout.addWidget(self.load_track_btn)
+        track_layout.addWidget(self.clear_track_btn)
+        settings_layout.addLayout(track_layout)
+        
         settings_group.setLayout(settings_layout)
         left_layout.addWidget(settings_group)
         
+        # Export queue
+        queue_group = QGroupBox("Export Queue")
+        queue_layout = QVBoxLayout()
+        self.queue_list = QListWidget()
+        queue_layout.addWidget(self.queue_list)
+        
+        concurrency_layout = QHBoxLayout()
+        concurrency_label = QLabel("Parallel jobs:")
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setRange(1, os.cpu_count() or 1)
+        self.concurrency_spinbox.setValue(self.export_queue.journal.get_concurrency())
+        concurrency_layout.addWidget(concurrency_label)
+        concurrency_layout.addWidget(self.concurrency_spinbox)
+        queue_layout.addLayout(concurrency_layout)
+        
+        queue_buttons_layout = QHBoxLayout()
+        self.queue_run_btn = QPushButton("Run Queue")
+        self.queue_cancel_btn = QPushButton("Cancel Job")
+        self.queue_clear_btn = QPushButton("Clear Finished")
+        queue_buttons_layout.addWidget(self.queue_run_btn)
+        queue_buttons_layout.addWidget(self.queue_cancel_btn)
+        queue_buttons_layout.addWidget(self.queue_clear_btn)
+        queue_layout.addLayout(queue_buttons_layout)
+        
+        queue_group.setLayout(queue_layout)
+        left_layout.addWidget(queue_group)
+        
+        # Performance panel (optional profiling)
+        perf_group = QGroupBox("Performance")
+        perf_layout = QVBoxLayout()
+        perf_controls_layout = QHBoxLayout()
+        self.profiling_checkbox = QCheckBox("Enable profiling")
+        self.export_trace_btn = QPushButton("Export Trace...")
+        perf_controls_layout.addWidget(self.profiling_checkbox)
+        perf_controls_layout.addWidget(self.export_trace_btn)
+        perf_layout.addLayout(perf_controls_layout)
+        kernel_layout = QHBoxLayout()
+        kernel_layout.addWidget(QLabel("Projection Kernel:"))
+        self.kernel_combo = QComboBox()
+        self.kernel_combo.addItems(KERNEL.get_available_backends())
+        kernel_layout.addWidget(self.kernel_combo)
+        perf_layout.addLayout(kernel_layout)
+        self.tiled_checkbox = QCheckBox("Tile-sorted sampling")
+        perf_layout.addWidget(self.tiled_checkbox)
+        workers_layout = QHBoxLayout()
+        workers_layout.addWidget(QLabel("Worker Processes:"))
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_spinbox.setToolTip("Video frames are projected by this many processes sharing memory (1 = in-process)")
+        workers_layout.addWidget(self.workers_spinbox)
+        perf_layout.addLayout(workers_layout)
+        self.yuv_checkbox = QCheckBox("YUV pipeline (ffmpeg)")
+        if shutil.which('ffmpeg') is None:
+            self.yuv_checkbox.setEnabled(False)
+            self.yuv_checkbox.setToolTip("Needs ffmpeg on the PATH")
+        else:
+            self.yuv_checkbox.setToolTip("Projects decoded YUV planes directly, skipping the BGR conversions on decode and encode")
+        perf_layout.addWidget(self.yuv_checkbox)
+        self.perf_stats_label = QLabel("Profiling is off")
+        self.perf_stats_label.setFont(QFont('Consolas', 9))
+        perf_layout.addWidget(self.perf_stats_label)
+        perf_group.setLayout(perf_layout)
+        left_layout.addWidget(perf_group)
+        
+        self.perf_timer = QTimer(self)
+        self.perf_timer.timeout.connect(self.update_perf_stats)
+        
         # Add about button
         self.btn_about = QPushButton("About & Instructions")
         self.btn_about.setStyleSheet("""
@@ -1091,16 +3887,37 @@ class FulldomeConverter(QMainWindow):
         self.preview_widget.import_image_btn.clicked.connect(self.import_image)
         self.preview_widget.import_video_btn.clicked.connect(self.import_video)
         self.preview_widget.export_btn.clicked.connect(self.export_image)
+        self.preview_widget.queue_btn.clicked.connect(self.queue_export)
+        self.preview_widget.batch_btn.clicked.connect(self.batch_convert_images)
+        self.profiling_checkbox.toggled.connect(self.toggle_profiling)
+        self.kernel_combo.currentTextChanged.connect(self.set_kernel_backend)
+        self.projection_combo.currentTextChanged.connect(self.update_projection)
+        self.format_combo.currentTextChanged.connect(self.update_input_format)
+        self.stereo_combo.currentTextChanged.connect(self.update_stereo)
+        self.eye_combo.currentTextChanged.connect(self.update_stereo)
+        self.export_trace_btn.clicked.connect(self.export_trace)
+        self.load_track_btn.clicked.connect(self.load_camera_track)
+        self.clear_track_btn.clicked.connect(self.clear_camera_track)
         self.btn_about.clicked.connect(self.show_about)
         
+        # Connect queue signals
+        self.export_queue.job_changed.connect(self.refresh_queue_list)
+        self.concurrency_spinbox.valueChanged.connect(self.export_queue.set_concurrency)
+        self.queue_run_btn.clicked.connect(self.export_queue.start_pending)
+        self.queue_cancel_btn.clicked.connect(self.cancel_queued_job)
+        self.queue_clear_btn.clicked.connect(self.clear_finished_jobs)
+        self.refresh_queue_list()
+        
     def import_image(self):
         try:
-            file_filter = "Image files (*.jpg *.png);;All files (*.*)"
+            file_filter = "Image files (*.jpg *.png *.tif *.tiff *.exr *.hdr *.npy *.raw);;All files (*.*)"
             input_path, _ = QFileDialog.getOpenFileName(self, "Select input image", "", file_filter)
             
             if input_path:
                 self.current_file = input_path
                 self.is_video = False
+                self.depth_combo.setEnabled(True)
+                self.transparent_checkbox.setEnabled(True)
                 self.preview_widget.set_image(input_path)
                 
         except Exception as e:
@@ -1116,8 +3933,7 @@ class FulldomeConverter(QMainWindow):
                 reply = QMessageBox.warning(
                     self,
                     "Video Conversion Warning",
-                    "Video conversion can take a long time depending on the file size and length. "
-                    "The application will be unresponsive during conversion. Continue?",
+                    "Video conversion can take a long time depending on the file size and length. Continue?",
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                     QMessageBox.StandardButton.No
                 )
@@ -1125,81 +3941,295 @@ class FulldomeConverter(QMainWindow):
                 if reply == QMessageBox.StandardButton.Yes:
                     self.current_file = input_path
                     self.is_video = True
+                    self.depth_combo.setEnabled(False)
+                    self.transparent_checkbox.setEnabled(False)
                     self.preview_widget.set_video(input_path)
                     
         except Exception as e:
             self.show_error(str(e))
 
-    def export_image(self):
+    def ask_output_path(self):
+        if not self.current_file:
+            raise Exception("No media loaded")
+            
+        # Get output file
+        if self.is_video:
+            file_filter = "Video files (*.mp4);;All files (*.*)"
+        else:
+            file_filter = "JPEG (*.jpg);;PNG (*.png);;TIFF (*.tif *.tiff);;OpenEXR (*.exr);;Radiance HDR (*.hdr);;NumPy (*.npy);;Raw (*.raw);;All files (*.*)"
+            
+        output_path, _ = QFileDialog.getSaveFileName(self, "Save output file", "", file_filter)
+        return output_path
+
+    def get_export_params(self, output_path):
+        # Full parameter set for ConversionThread, also stored in the job journal
+        return {
+            'input_path': self.current_file,
+            'output_path': output_path,
+            'is_video': self.is_video,
+            'input_format': self.format_combo.currentText(),
+            'dome_type': 'standard' if self.dome_combo.currentText() == 'Standard Fulldome' else 'virtual_sky',
+            'rotation': 0,
+            'zoom_factor': self.preview_widget.zoom_factor,
+            'tilt': self.preview_widget.tilt,
+            'pan': self.preview_widget.pan,
+            'roll': self.preview_widget.roll,
+            'flip_h': self.preview_widget.flip_h,
+            'flip_v': self.preview_widget.flip_v,
+            'camera_track': self.camera_track_data,
+            'output_depth': OUTPUT_DEPTHS[self.depth_combo.currentText()],
+            'transparent': self.transparent_checkbox.isChecked(),
+            'antialias': self.antialias_checkbox.isChecked(),
+            'tiled_sampling': self.tiled_checkbox.isChecked(),
+            'workers': self.workers_spinbox.value(),
+            'yuv_pipeline': self.yuv_checkbox.isChecked(),
+            'output_size': 0 if self.size_combo.currentText() == 'Source' else int(self.size_combo.currentText()),
+            'stereo_layout': STEREO_LAYOUTS[self.stereo_combo.currentText()],
+            'stereo_output': STEREO_OUTPUTS[self.eye_combo.currentText()],
+            'skip_duplicates': self.duplicates_checkbox.isChecked(),
+            'duplicate_tolerance': self.tolerance_spinbox.value(),
+            'output_projection': OUTPUT_PROJECTIONS[self.projection_combo.currentText()]
+        }
+
+    def update_input_format(self, input_format):
+        # Stereo auto-detection compares against the format's mono aspect ratio
+        self.preview_widget.input_format = input_format
+        self.preview_widget.update_preview()
+
+    def update_projection(self):
+        self.preview_widget.output_projection = OUTPUT_PROJECTIONS[self.projection_combo.currentText()]
+        self.preview_widget.update_preview()
+
+    def update_stereo(self):
+        layout = STEREO_LAYOUTS[self.stereo_combo.currentText()]
+        self.eye_combo.setEnabled(layout != 'mono')
+        self.preview_widget.stereo_layout = layout
+        self.preview_widget.stereo_output = STEREO_OUTPUTS[self.eye_combo.currentText()]
+        self.preview_widget.update_preview()
+
+    def set_kernel_backend(self, name):
         try:
-            if not self.current_file:
-                raise Exception("No media loaded")
-                
-            # Get output file
-            if self.is_video:
-                default_ext = ".mp4"
-                file_filter = "Video files (*.mp4);;All files (*.*)"
-            else:
-                default_ext = ".jpg"
-                file_filter = "Image files (*.jpg);;All files (*.*)"
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                KERNEL.set_backend(name)
+            finally:
+                QApplication.restoreOverrideCursor()
+            self.preview_widget.update_preview()
+        except Exception as e:
+            # Fall back to the reference path if the backend fails validation
+            self.kernel_combo.blockSignals(True)
+            self.kernel_combo.setCurrentText(KERNEL.backend)
+            self.kernel_combo.blockSignals(False)
+            self.show_error(str(e))
+
+    def toggle_profiling(self, enabled):
+        PROFILER.set_enabled(enabled)
+        if enabled:
+            PROFILER.reset()
+            self.perf_timer.start(500)
+            self.update_perf_stats()
+        else:
+            self.perf_timer.stop()
+            self.perf_stats_label.setText("Profiling is off")
+
+    def update_perf_stats(self):
+        PROFILER.sample_memory()
+        summary = PROFILER.summary()
+        lines = [f"{name:<16} {stats['avg_ms']:7.2f} ms avg {stats['max_ms']:7.2f} max"
+                 for name, stats in sorted(summary['stages'].items())]
+        lines += [f"{name:<16} {value}" for name, value in sorted(summary['counters'].items())]
+        self.perf_stats_label.setText("\n".join(lines) if lines else "Waiting for samples...")
+
+    def export_trace(self):
+        try:
+            file_filter = "Chrome trace (*.json);;All files (*.*)"
+            trace_path, _ = QFileDialog.getSaveFileName(self, "Save trace", "fulldome_trace.json", file_filter)
+            if trace_path:
+                PROFILER.export_chrome_trace(trace_path)
+        except Exception as e:
+            self.show_error(str(e))
+
+    def load_camera_track(self):
+        try:
+            file_filter = "Camera tracks (*.json);;All files (*.*)"
+            track_path, _ = QFileDialog.getOpenFileName(self, "Select camera track", "", file_filter)
+            
+            if track_path:
+                track = CameraTrack.load(track_path)
+                self.camera_track_data = track.to_dict()
+                self.track_name_label.setText(os.path.basename(track_path))
+                self.clear_track_btn.setEnabled(True)
+                self.preview_widget.camera_track = track
+                self.preview_widget.update_preview()
                 
-            output_path, _ = QFileDialog.getSaveFileName(self, "Save output file", "", file_filter)
+        except Exception as e:
+            self.show_error(str(e))
+
+    def clear_camera_track(self):
+        self.camera_track_data = None
+        self.track_name_label.setText("None")
+        self.clear_track_btn.setEnabled(False)
+        self.preview_widget.camera_track = None
+        self.preview_widget.update_preview()
+
+    def export_image(self):
+        try:
+            output_path = self.ask_output_path()
             
             if output_path:
-                # Get settings
-                dome_type = 'standard' if self.dome_combo.currentText() == 'Standard Fulldome' else 'virtual_sky'
-                tilt = self.preview_widget.tilt
-                pan = self.preview_widget.pan
-                roll = self.preview_widget.roll
-                zoom_factor = self.preview_widget.zoom_factor
-                flip_h = self.preview_widget.flip_h
-                flip_v = self.preview_widget.flip_v
-                
                 # Start conversion
-                self.conversion_thread = ConversionThread(
-                    self.current_file,
-                    output_path,
-                    self.is_video,
-                    self.format_combo.currentText(),
-                    dome_type,
-                    0,  # rotation
-                    zoom_factor,
-                    tilt,
-                    pan,
-                    roll,
-                    flip_h,
-                    flip_v
-                )
-                
-                # Connect signals
-                self.conversion_thread.progress.connect(self.update_progress)
-                self.conversion_thread.finished.connect(self.conversion_finished)
-                self.conversion_thread.error.connect(self.show_error)
-                
-                # Disable controls during conversion
-                self.preview_widget.export_btn.setEnabled(False)
-                self.preview_widget.import_image_btn.setEnabled(False)
-                self.preview_widget.import_video_btn.setEnabled(False)
-                
-                # Show progress bar
-                self.progress_bar = QProgressBar()
-                self.progress_bar.setVisible(True)
-                self.progress_bar.setValue(0)
-                self.statusBar().addWidget(self.progress_bar)
-                
-                self.conversion_thread.start()
+                self.start_conversion(ConversionThread(**self.get_export_params(output_path)))
                 
         except Exception as e:
             self.show_error(str(e))
 
+    def batch_convert_images(self):
+        try:
+            file_filter = "Image files (*.jpg *.png *.tif *.tiff *.exr *.hdr *.npy *.raw);;All files (*.*)"
+            input_paths, _ = QFileDialog.getOpenFileNames(self, "Select input images", "", file_filter)
+            if not input_paths:
+                return
+            output_dir = QFileDialog.getExistingDirectory(self, "Select output folder")
+            if not output_dir:
+                return
+            
+            params = self.get_export_params(None)
+            self.start_conversion(BatchConversionThread(input_paths, output_dir, **params))
+            
+        except Exception as e:
+            self.show_error(str(e))
+
+    def start_conversion(self, conversion_thread):
+        try:
+            self.conversion_thread = conversion_thread
+            # Connect signals
+            self.conversion_thread.progress.connect(self.update_progress)
+            self.conversion_thread.stats.connect(self.update_stats)
+            self.conversion_thread.finished.connect(self.conversion_finished)
+            self.conversion_thread.error.connect(self.show_error)
+            
+            # Disable controls during conversion
+            self.preview_widget.export_btn.setEnabled(False)
+            self.preview_widget.batch_btn.setEnabled(False)
+            self.preview_widget.import_image_btn.setEnabled(False)
+            self.preview_widget.import_video_btn.setEnabled(False)
+            
+            # Show progress bar
+            self.progress_bar = QProgressBar()
+            self.progress_bar.setVisible(True)
+            self.progress_bar.setValue(0)
+            self.statusBar().addWidget(self.progress_bar)
+            
+            # Job controls and throughput readout
+            self.stats_label = QLabel("")
+            self.pause_btn = QPushButton("Pause")
+            self.cancel_btn = QPushButton("Cancel")
+            self.pause_btn.clicked.connect(self.toggle_pause)
+            self.cancel_btn.clicked.connect(self.cancel_conversion)
+            self.statusBar().addWidget(self.stats_label)
+            self.statusBar().addWidget(self.pause_btn)
+            self.statusBar().addWidget(self.cancel_btn)
+            
+            self.conversion_thread.start()
+            
+        except Exception as e:
+            self.show_error(str(e))
+
+    def queue_export(self):
+        try:
+            output_path = self.ask_output_path()
+            if output_path:
+                self.export_queue.add_job(self.get_export_params(output_path))
+        except Exception as e:
+            self.show_error(str(e))
+
+    def resume_export_queue(self):
+        journal = self.export_queue.journal
+        journal.recover()
+        pending = [job for job in journal.get_jobs() if job['status'] == 'queued']
+        self.refresh_queue_list()
+        if not pending:
+            return
+        
+        reply = QMessageBox.question(
+            self,
+            "Resume Exports",
+            f"{len(pending)} export job(s) did not finish last time. Resume them now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.export_queue.start_pending()
+
+    def refresh_queue_list(self, job_id=None):
+        selected = self.get_selected_job_id()
+        self.queue_list.clear()
+        for job in self.export_queue.journal.get_jobs():
+            params = job['params']
+            status = job['status']
+            if status == 'running' and job['id'] in self.export_queue.progress:
+                status = f"running {self.export_queue.progress[job['id']]}%"
+            elif status == 'queued' and job['frames_done'] > 0:
+                status = f"queued, resumes at frame {job['frames_done']}"
+            
+            item = QListWidgetItem(f"{os.path.basename(params['input_path'])} -> {os.path.basename(params['output_path'])} [{status}]")
+            item.setData(Qt.ItemDataRole.UserRole, job['id'])
+            if job['error']:
+                item.setToolTip(job['error'])
+            self.queue_list.addItem(item)
+            if job['id'] == selected:
+                item.setSelected(True)
+
+    def get_selected_job_id(self):
+        items = self.queue_list.selectedItems()
+        return items[0].data(Qt.ItemDataRole.UserRole) if items else None
+
+    def cancel_queued_job(self):
+        job_id = self.get_selected_job_id()
+        if job_id is not None:
+            self.export_queue.cancel_job(job_id)
+
+    def clear_finished_jobs(self):
+        for job in self.export_queue.journal.get_jobs():
+            if job['status'] in ('done', 'failed', 'cancelled'):
+                self.export_queue.journal.remove_job(job['id'])
+        self.refresh_queue_list()
+
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
+    def update_stats(self, stats):
+        stages = ", ".join(f"{name} {ms:.1f} ms" for name, ms in stats['stages'].items())
+        duplicates = f" | {stats['duplicates']} duplicates" if stats.get('duplicates') else ""
+        self.stats_label.setText(
+            f"{stats['frames']}/{stats['total_frames']} frames | {stats['fps']:.1f} fps | "
+            f"ETA {self.preview_widget.format_time(stats['eta'])} | {stages}{duplicates}"
+        )
+
+    def toggle_pause(self):
+        if self.conversion_thread.is_paused():
+            self.conversion_thread.resume()
+            self.pause_btn.setText("Pause")
+        else:
+            self.conversion_thread.pause()
+            self.pause_btn.setText("Resume")
+
+    def cancel_conversion(self):
+        self.conversion_thread.cancel()
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(False)
+
     def conversion_finished(self):
-        self.progress_bar.setVisible(False)
-        self.statusBar().removeWidget(self.progress_bar)
-        QMessageBox.information(self, "Success", "Export completed successfully!")
+        for widget in [self.progress_bar, self.stats_label, self.pause_btn, self.cancel_btn]:
+            widget.setVisible(False)
+            self.statusBar().removeWidget(widget)
+        
+        if self.conversion_thread.cancel_requested:
+            self.statusBar().showMessage("Export cancelled", 5000)
+        elif not self.conversion_thread.failed:
+            QMessageBox.information(self, "Success", "Export completed successfully!")
         self.preview_widget.export_btn.setEnabled(True)
+        self.preview_widget.batch_btn.setEnabled(True)
         self.preview_widget.import_image_btn.setEnabled(True)
         self.preview_widget.import_video_btn.setEnabled(True)
     
@@ -0,0 +1,315 @@
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import shutil
+import sqlite3
+import argparse
+import threading
+
+# Nodes run without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import cv2
+from PyQt6.QtCore import Qt
+
+from fulldome_converter import ConversionThread, EXPORT_DEFAULTS, concat_segments, get_stream_path
+
+JOB_FILE = 'job.json'
+CLAIMS_FILE = 'claims.sqlite'
+SEGMENTS_DIR = 'segments'
+
+def log(message):
+    print(f"{time.strftime('%H:%M:%S')} {message}", file=sys.stderr, flush=True)
+
+def get_node_id():
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+def read_job(job_dir):
+    with open(os.path.join(job_dir, JOB_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_job(job_dir, job):
+    # Write-then-rename so nodes never read a half-written job
+    path = os.path.join(job_dir, JOB_FILE)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(job, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+class ClaimTable:
+    # Frame ranges and their leases in a small SQLite file on the shared path.
+    # Every claim is a single write transaction, so two nodes can never take the same range.
+    def __init__(self, path):
+        # Rollback journal rather than WAL: WAL needs shared memory, which network filesystems don't provide
+        self.connection = sqlite3.connect(path, timeout=60.0, isolation_level=None)
+
+    def close(self):
+        self.connection.close()
+
+    def create(self, ranges):
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS ranges (
+                id INTEGER PRIMARY KEY,
+                start_frame INTEGER NOT NULL,
+                end_frame INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                node TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT
+            )""")
+        self.connection.executemany("INSERT INTO ranges (start_frame, end_frame) VALUES (?, ?)", ranges)
+
+    def claim(self, node, lease_seconds, max_attempts):
+        # Pending ranges first, then ranges whose node stopped renewing its lease
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.connection.execute("""
+                SELECT id, start_frame, end_frame FROM ranges
+                WHERE (status = 'pending' OR (status = 'claimed' AND lease_until < ?)) AND attempts < ?
+                ORDER BY status = 'claimed', start_frame LIMIT 1""", (now, max_attempts)).fetchone()
+            if row is not None:
+                self.connection.execute(
+                    "UPDATE ranges SET status = 'claimed', node = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    (node, now + lease_seconds, row[0]))
+            self.connection.execute("COMMIT")
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        return row
+
+    def renew(self, range_id, node, lease_seconds):
+        cursor = self.connection.execute(
+            "UPDATE ranges SET lease_until = ? WHERE id = ? AND node = ? AND status = 'claimed'",
+            (time.time() + lease_seconds, range_id, node))
+        return cursor.rowcount == 1
+
+    def finish(self, range_id, node):
+        # A node that lost its lease may still finish; its segment is as good as the new owner's
+        self.connection.execute(
+            "UPDATE ranges SET status = 'done', node = ?, lease_until = NULL WHERE id = ? AND status != 'done'",
+            (node, range_id))
+
+    def release(self, range_id, node, error, max_attempts):
+        # A failed range goes back to the pool until it has used up its attempts
+        self.connection.execute("""
+            UPDATE ranges SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                node = NULL, lease_until = NULL, error = ?
+            WHERE id = ? AND node = ? AND status = 'claimed'""", (max_attempts, error, range_id, node))
+
+    def expire_exhausted(self, max_attempts):
+        # A range whose last node died after its final attempt can't be claimed again
+        self.connection.execute("""
+            UPDATE ranges SET status = 'failed', error = COALESCE(error, 'Node stopped responding')
+            WHERE status = 'claimed' AND lease_until < ? AND attempts >= ?""", (time.time(), max_attempts))
+
+    def get_counts(self):
+        rows = self.connection.execute("SELECT status, COUNT(*) FROM ranges GROUP BY status").fetchall()
+        return dict(rows)
+
+    def get_ranges(self):
+        return self.connection.execute(
+            "SELECT id, start_frame, end_frame, status, node, attempts, error FROM ranges ORDER BY start_frame").fetchall()
+
+def get_segment_path(job_dir, start_frame, end_frame):
+    return os.path.join(job_dir, SEGMENTS_DIR, f"range_{start_frame:08d}_{end_frame:08d}.mp4")
+
+def submit_job(job_dir, params, range_frames=300, lease_seconds=60.0, max_attempts=3):
+    # Splits the video into frame ranges for nodes to claim
+    params = dict(EXPORT_DEFAULTS, **params)
+    cap = cv2.VideoCapture(params['input_path'])
+    if not cap.isOpened():
+        raise Exception("Failed to open input video")
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    cap.release()
+    if total_frames <= 0:
+        raise Exception("Video frame count is unknown")
+
+    # Stereo jobs exporting both eyes produce two streams per range
+    probe = ConversionThread(**dict(params, is_video=True))
+    streams = probe.get_streams(probe.get_stereo_layout(width, height))
+
+    os.makedirs(os.path.join(job_dir, SEGMENTS_DIR), exist_ok=True)
+    if os.path.exists(os.path.join(job_dir, CLAIMS_FILE)):
+        raise Exception(f"A job already exists in {job_dir}")
+
+    # The last range runs to the end of the stream, in case the container's frame count is short
+    starts = list(range(0, total_frames, range_frames))
+    ranges = [(start, start + range_frames) for start in starts[:-1]] + [(starts[-1], 0)]
+    claims = ClaimTable(os.path.join(job_dir, CLAIMS_FILE))
+    try:
+        claims.create(ranges)
+    finally:
+        claims.close()
+    write_job(job_dir, {
+        'params': params,
+        'total_frames': total_frames,
+        'fps': fps,
+        'streams': streams,
+        'range_frames': range_frames,
+        'lease_seconds': lease_seconds,
+        'max_attempts': max_attempts,
+        'created': time.time()
+    })
+    return len(ranges)
+
+class RenderNode:
+    def __init__(self, job_dir, node_id=None, poll_interval=2.0):
+        self.job_dir = job_dir
+        self.node_id = node_id or get_node_id()
+        self.poll_interval = poll_interval
+        self.job = read_job(job_dir)
+        self.lease_seconds = self.job['lease_seconds']
+        self.max_attempts = self.job['max_attempts']
+        self.claims = ClaimTable(os.path.join(job_dir, CLAIMS_FILE))
+
+    def close(self):
+        self.claims.close()
+
+    def keep_lease(self, range_id, stop_event):
+        # Own connection: SQLite connections are not shared between threads
+        claims = ClaimTable(os.path.join(self.job_dir, CLAIMS_FILE))
+        try:
+            while not stop_event.wait(self.lease_seconds / 3):
+                if not claims.renew(range_id, self.node_id, self.lease_seconds):
+                    log(f"{self.node_id} lost the lease on range {range_id}")
+                    break
+        finally:
+            claims.close()
+
+    def render_range(self, start_frame, end_frame):
+        params = dict(self.job['params'])
+        input_path = params.pop('input_path')
+        params.pop('output_path', None)
+        params.pop('is_video', None)
+        segment_path = get_segment_path(self.job_dir, start_frame, end_frame)
+        # Per-node temporary name, so a reclaimed range never mixes two nodes' frames
+        temp_path = f"{os.path.splitext(segment_path)[0]}.{self.node_id}.partial.mp4"
+        thread = ConversionThread(input_path, temp_path, True, start_frame=start_frame, end_frame=end_frame, **params)
+        errors = []
+        thread.error.connect(errors.append, Qt.ConnectionType.DirectConnection)
+        thread.run()
+        if thread.failed:
+            thread.remove_partial_output()
+            raise Exception(errors[0] if errors else "Range conversion failed")
+        for stream in self.job['streams']:
+            os.replace(get_stream_path(temp_path, stream), get_stream_path(segment_path, stream))
+
+    def run(self):
+        # Claims and renders ranges until none are left to claim
+        rendered = 0
+        while True:
+            row = self.claims.claim(self.node_id, self.lease_seconds, self.max_attempts)
+            if row is None:
+                self.claims.expire_exhausted(self.max_attempts)
+                counts = self.claims.get_counts()
+                if not counts.get('pending') and not counts.get('claimed'):
+                    return rendered
+                # Other nodes hold the rest; wait in case one of them dies
+                time.sleep(self.poll_interval)
+                continue
+
+            range_id, start_frame, end_frame = row
+            log(f"{self.node_id} rendering frames {start_frame}-{end_frame or 'end'}")
+            stop_event = threading.Event()
+            heartbeat = threading.Thread(target=self.keep_lease, args=(range_id, stop_event), daemon=True)
+            heartbeat.start()
+            try:
+                self.render_range(start_frame, end_frame)
+                self.claims.finish(range_id, self.node_id)
+                rendered += 1
+            except Exception as e:
+                log(f"{self.node_id} failed frames {start_frame}-{end_frame or 'end'}: {str(e)}")
+                self.claims.release(range_id, self.node_id, str(e), self.max_attempts)
+            finally:
+                stop_event.set()
+                heartbeat.join()
+
+def assemble_job(job_dir, poll_interval=2.0, work=False):
+    # Coordinator: optionally renders alongside the nodes, then joins the segments once every range is done
+    job = read_job(job_dir)
+    if work:
+        node = RenderNode(job_dir, poll_interval=poll_interval)
+        try:
+            node.run()
+        finally:
+            node.close()
+
+    claims = ClaimTable(os.path.join(job_dir, CLAIMS_FILE))
+    try:
+        while True:
+            claims.expire_exhausted(job['max_attempts'])
+            counts = claims.get_counts()
+            if counts.get('failed'):
+                failed = [row for row in claims.get_ranges() if row[3] == 'failed']
+                raise Exception(f"{len(failed)} range(s) failed; first at frame {failed[0][1]}: {failed[0][6]}")
+            if not counts.get('pending') and not counts.get('claimed'):
+                break
+            time.sleep(poll_interval)
+        ranges = claims.get_ranges()
+    finally:
+        claims.close()
+
+    segments = [get_segment_path(job_dir, row[1], row[2]) for row in ranges]
+    output_path = job['params']['output_path']
+    for stream in job['streams']:
+        paths = [get_stream_path(path, stream) for path in segments]
+        missing = [path for path in paths if not os.path.exists(path)]
+        if missing:
+            raise Exception(f"Missing segment {missing[0]}")
+        concat_segments(paths, get_stream_path(output_path, stream), job['fps'])
+    # Also removes partial segments left by nodes that died
+    shutil.rmtree(os.path.join(job_dir, SEGMENTS_DIR), ignore_errors=True)
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Render one video across several nodes sharing a job folder")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help="Create a job and split it into frame ranges")
+    submit.add_argument('job_dir', help="Job folder on the shared path")
+    submit.add_argument('params', help="JSON file with the export parameters (input_path, output_path, tilt, ...)")
+    submit.add_argument('--range-frames', type=int, default=300, help="Frames per claimable range")
+    submit.add_argument('--lease', type=float, default=60.0, help="Seconds before a silent node's range is reclaimed")
+    submit.add_argument('--attempts', type=int, default=3, help="Attempts per range before the job fails")
+
+    work = commands.add_parser('work', help="Claim and render ranges until none are left")
+    work.add_argument('job_dir')
+    work.add_argument('--node-id', help="Name of this node in the claim table")
+    work.add_argument('--poll', type=float, default=2.0)
+
+    assemble = commands.add_parser('assemble', help="Wait for every range, then join the segments into the output")
+    assemble.add_argument('job_dir')
+    assemble.add_argument('--work', action='store_true', help="Also render ranges on this machine")
+    assemble.add_argument('--poll', type=float, default=2.0)
+
+    args = parser.parse_args()
+    try:
+        if args.command == 'submit':
+            with open(args.params, 'r', encoding='utf-8') as f:
+                params = json.load(f)
+            count = submit_job(args.job_dir, params, args.range_frames, args.lease, args.attempts)
+            log(f"Created {count} ranges in {args.job_dir}")
+        elif args.command == 'work':
+            node = RenderNode(args.job_dir, args.node_id, args.poll)
+            try:
+                rendered = node.run()
+            finally:
+                node.close()
+            log(f"{node.node_id} rendered {rendered} ranges")
+        else:
+            output_path = assemble_job(args.job_dir, args.poll, args.work)
+            log(f"Assembled {output_path}")
+    except Exception as e:
+        log(f"Error: {str(e)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,325 @@
+import os
+import sys
+import json
+import time
+import uuid
+import signal
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# The service runs without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import Qt
+
+from fulldome_converter import (ConversionThread, WarmConverters, MAP_CACHE, EXPORT_DEFAULTS, STEREO_LAYOUTS,
+                                STEREO_OUTPUTS, OUTPUT_PROJECTIONS, OUTPUT_DEPTHS)
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv')
+
+# Allowed values for the parameters the GUI picks from a combo box
+PARAM_CHOICES = {
+    'input_format': ('Equirectangular', 'Cubemap'),
+    'dome_type': ('standard', 'virtual_sky'),
+    'stereo_layout': tuple(STEREO_LAYOUTS.values()),
+    'stereo_output': tuple(STEREO_OUTPUTS.values()),
+    'output_projection': tuple(OUTPUT_PROJECTIONS.values()),
+    'output_depth': tuple(OUTPUT_DEPTHS.values())
+}
+
+# Finished jobs kept for status queries
+MAX_FINISHED_JOBS = 1000
+
+class RenderJob:
+    def __init__(self, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = 'queued'
+        self.progress = 0
+        self.stats = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.thread = None
+        self.cancel_requested = False
+        # Stills run on a shared warm converter, so they check the job's own event instead of its cancel flag
+        self.cancel_event = threading.Event()
+        # Wakes progress streams on every change
+        self.changed = threading.Condition()
+        self.version = 0
+
+    def update(self, **fields):
+        with self.changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self.changed.notify_all()
+
+    def is_done(self):
+        return self.status in ('done', 'failed', 'cancelled')
+
+    def describe(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'stats': self.stats,
+            'error': self.error,
+            'input_path': self.params['input_path'],
+            'output_path': self.params['output_path'],
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished
+        }
+
+def get_job_params(request):
+    # Same parameters as ConversionThread; anything left out takes the export defaults
+    params = dict(EXPORT_DEFAULTS)
+    params.update(request)
+    for key in ('input_path', 'output_path'):
+        if not params.get(key):
+            raise ValueError(f"Missing '{key}'")
+    if 'is_video' not in params:
+        params['is_video'] = os.path.splitext(params['input_path'])[1].lower() in VIDEO_EXTENSIONS
+    # Validate up front instead of failing later on a worker: unknown names raise TypeError, bad choices ValueError
+    for key, choices in PARAM_CHOICES.items():
+        if key in params and params[key] not in choices:
+            raise ValueError(f"Invalid '{key}': '{params[key]}' (expected one of {', '.join(choices)})")
+    ConversionThread(**params)
+    return params
+
+class RenderService:
+    def __init__(self, workers=2):
+        self.workers = max(1, int(workers))
+        # Warm workers: imports, OpenCV threads, converters and the map cache stay loaded between jobs
+        self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        self.converters = WarmConverters()
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def submit(self, request):
+        return self.submit_all([request])[0]
+
+    def submit_all(self, requests):
+        # Every request is validated before any is queued, so a bad item can't leave untracked jobs running
+        jobs = [RenderJob(get_job_params(request)) for request in requests]
+        with self.lock:
+            for job in jobs:
+                self.jobs[job.id] = job
+            self.prune()
+        for job in jobs:
+            self.pool.submit(self.run_job, job)
+        return jobs
+
+    def prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_done()]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def get_jobs(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job):
+        job.cancel_requested = True
+        job.cancel_event.set()
+        if job.thread is not None:
+            job.thread.cancel()
+        elif job.status == 'queued':
+            job.update(status='cancelled', finished=time.time())
+
+    def run_job(self, job):
+        if job.cancel_requested:
+            return
+        job.update(status='running', started=time.time())
+        try:
+            params = dict(job.params)
+            input_path = params.pop('input_path')
+            output_path = params.pop('output_path')
+            if params.pop('is_video'):
+                self.run_video(job, input_path, output_path, params)
+            else:
+                # Stills share a warm converter per setting, so repeated sizes skip the map build
+                converter = self.converters.get(params)
+                if not converter.convert_still(input_path, output_path, cancel_event=job.cancel_event):
+                    raise Exception("Cancelled")
+            if job.cancel_requested:
+                job.update(status='cancelled', finished=time.time())
+            else:
+                job.update(status='done', progress=100, finished=time.time())
+        except Exception as e:
+            status = 'cancelled' if job.cancel_requested else 'failed'
+            job.update(status=status, error=None if status == 'cancelled' else str(e), finished=time.time())
+
+    def run_video(self, job, input_path, output_path, params):
+        thread = ConversionThread(input_path, output_path, True, **params)
+        errors = []
+        # run() is called on this pool thread, so signals are delivered directly
+        thread.progress.connect(lambda value: job.update(progress=value), Qt.ConnectionType.DirectConnection)
+        thread.stats.connect(lambda stats: job.update(stats=stats), Qt.ConnectionType.DirectConnection)
+        thread.error.connect(errors.append, Qt.ConnectionType.DirectConnection)
+        job.thread = thread
+        if job.cancel_requested:
+            thread.cancel()
+        thread.run()
+        job.thread = None
+        if thread.failed:
+            raise Exception(errors[0] if errors else "Video conversion failed")
+
+    def describe(self):
+        jobs = self.get_jobs()
+        counts = {}
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'workers': self.workers,
+            'jobs': counts,
+            'cached_maps': MAP_CACHE.count('maps'),
+            'map_cache_mb': round(MAP_CACHE.nbytes / (1024 * 1024), 1),
+            'uptime': time.time() - self.started
+        }
+
+    def close(self):
+        for job in self.get_jobs():
+            if not job.is_done():
+                self.cancel(job)
+        self.pool.shutdown(wait=True)
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, so a client submitting many jobs pays for one TCP handshake
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def get_route(self):
+        url = urlparse(self.path)
+        return [part for part in url.path.split('/') if part], parse_qs(url.query)
+
+    def find_job(self, job_id):
+        job = self.server.service.get_job(job_id)
+        if job is None:
+            self.send_json({'error': f"Unknown job: {job_id}"}, 404)
+        return job
+
+    def do_GET(self):
+        parts, query = self.get_route()
+        if parts == ['status']:
+            self.send_json(self.server.service.describe())
+        elif parts == ['jobs']:
+            self.send_json([job.describe() for job in self.server.service.get_jobs()])
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.send_json(job.describe())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+            job = self.find_job(parts[1])
+            if job is not None:
+                self.stream_job(job)
+        else:
+            self.send_json({'error': "Not found"}, 404)
+
+    def do_POST(self):
+        parts, query = self.get_route()
+        try:
+            if parts == ['jobs']:
+                request = self.read_json()
+                # A list submits many jobs in one round trip
+                requests = request if isinstance(request, list) else [request]
+                jobs = self.server.service.submit_all(requests)
+                if query.get('wait', ['0'])[0] not in ('0', ''):
+                    for job in jobs:
+                        self.wait_for(job)
+                results = [job.describe() for job in jobs]
+                self.send_json(results if isinstance(request, list) else results[0], 201)
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+                job = self.find_job(parts[1])
+                if job is not None:
+                    self.server.service.cancel(job)
+                    self.send_json(job.describe())
+            else:
+                self.send_json({'error': "Not found"}, 404)
+        except (ValueError, TypeError) as e:
+            self.send_json({'error': str(e)}, 400)
+
+    def wait_for(self, job):
+        with job.changed:
+            job.changed.wait_for(job.is_done)
+
+    def stream_job(self, job):
+        # Newline-delimited JSON, one line per change, until the job finishes
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        version = -1
+        try:
+            while True:
+                with job.changed:
+                    job.changed.wait_for(lambda: job.version != version, timeout=15.0)
+                    version = job.version
+                    data = job.describe()
+                self.wfile.write(json.dumps(data).encode('utf-8') + b'\n')
+                self.wfile.flush()
+                if data['status'] in ('done', 'failed', 'cancelled'):
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def create_server(host='127.0.0.1', port=8765, workers=2, verbose=False):
+    server = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    server.daemon_threads = True
+    server.service = RenderService(workers)
+    server.verbose = verbose
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fulldome render service")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on (local only by default)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help="Jobs converted at the same time")
+    parser.add_argument('--cache-mb', type=int, default=1024, help="Memory for projection maps kept between jobs")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args()
+
+    MAP_CACHE.max_mb = args.cache_mb
+    server = create_server(args.host, args.port, args.workers, args.verbose)
+    # shutdown() waits for serve_forever, so it runs off the signal handler's thread
+    stop = lambda *_: threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    print(f"Render service listening on http://{args.host}:{server.server_address[1]}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.service.close()
+        server.server_close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,363 @@
+import os
+import re
+import sys
+import json
+import time
+import signal
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# The watcher runs without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtCore import Qt
+
+from fulldome_converter import (ConversionThread, WarmConverters, MAP_CACHE, EXPORT_DEFAULTS, get_app_data_dir,
+                                get_batch_output_path, get_stream_path)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tif', '.tiff', '.exr', '.hdr')
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv')
+
+# Renderers and copy tools that write under a temporary name first
+PARTIAL_SUFFIXES = ('.tmp', '.part', '.partial', '.crdownload', '~')
+PARTIAL_PREFIX = '.partial_'
+
+# Output streams an item can produce: one file, or <name>_left / <name>_right for both eyes of a stereo pair
+STREAMS = (None, 'left', 'right')
+
+# Per-folder overrides that can be dropped next to the files
+PRESET_FILE = 'fulldome_preset.json'
+
+# Frame numbers of at least three digits at the end of the name: shot.0001.exr, shot_0001.png, shot0001.jpg
+SEQUENCE_PATTERN = re.compile(r'^(.*?)([._-]?)(\d{3,})(\.[^.]+)$')
+
+def log(message):
+    print(f"{time.strftime('%H:%M:%S')} {message}", file=sys.stderr, flush=True)
+
+def load_preset(folder, base):
+    # Defaults < folder config < preset file in the folder itself
+    preset = dict(EXPORT_DEFAULTS)
+    preset.update(base or {})
+    path = os.path.join(folder, PRESET_FILE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            preset.update(json.load(f))
+    # Paths are chosen by the watcher, not the preset
+    for key in ('input_path', 'output_path', 'is_video'):
+        preset.pop(key, None)
+    return preset
+
+def is_partial(name):
+    lower = name.lower()
+    return name.startswith('.') or lower.endswith(PARTIAL_SUFFIXES)
+
+def is_readable(path):
+    # Windows writers hold an exclusive lock until the file is closed
+    try:
+        with open(path, 'rb') as f:
+            f.read(1)
+        return True
+    except OSError:
+        return False
+
+def get_partial_path(path):
+    directory, name = os.path.split(path)
+    return os.path.join(directory, PARTIAL_PREFIX + name)
+
+def commit_partial(output_path):
+    # Moves every stream written under the temporary name into place
+    temp_path = get_partial_path(output_path)
+    written = [stream for stream in STREAMS if os.path.exists(get_stream_path(temp_path, stream))]
+    if not written:
+        raise Exception(f"No output was written for {os.path.basename(output_path)}")
+    for stream in written:
+        os.replace(get_stream_path(temp_path, stream), get_stream_path(output_path, stream))
+
+def remove_partial(output_path):
+    temp_path = get_partial_path(output_path)
+    for stream in STREAMS:
+        try:
+            os.remove(get_stream_path(temp_path, stream))
+        except FileNotFoundError:
+            pass
+
+@contextmanager
+def partial_output(output_path):
+    # Written under a hidden temporary name, renamed when complete and removed on failure
+    try:
+        yield get_partial_path(output_path)
+        commit_partial(output_path)
+    except BaseException:
+        remove_partial(output_path)
+        raise
+
+class WatchItem:
+    # One unit of work: a still, a video, or a numbered frame sequence
+    def __init__(self, kind, key, paths, folder):
+        self.kind = kind
+        self.key = key
+        self.paths = paths
+        self.folder = folder
+
+    def get_signature(self):
+        # Changes whenever a file is added, grows or is rewritten
+        stats = [os.stat(path) for path in self.paths]
+        return [len(stats), sum(st.st_size for st in stats), max(st.st_mtime_ns for st in stats)]
+
+def scan_folder(folder):
+    # Non-recursive, so an output folder inside the watched one is never picked up
+    stills = []
+    videos = []
+    sequences = {}
+    try:
+        entries = sorted(os.scandir(folder['path']), key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return []
+    for entry in entries:
+        if not entry.is_file() or is_partial(entry.name) or entry.name == PRESET_FILE:
+            continue
+        stem, extension = os.path.splitext(entry.name)
+        extension = extension.lower()
+        # Our own outputs, in case a folder is set to write into itself
+        if stem.endswith('_fulldome'):
+            continue
+        if extension in VIDEO_EXTENSIONS:
+            videos.append(entry.path)
+        elif extension in IMAGE_EXTENSIONS:
+            match = SEQUENCE_PATTERN.match(entry.name)
+            if match:
+                prefix, separator, digits, _ = match.groups()
+                sequences.setdefault((prefix, separator, len(digits), extension), []).append(entry.path)
+            else:
+                stills.append(entry.path)
+
+    items = [WatchItem('video', path, [path], folder) for path in videos]
+    items += [WatchItem('still', path, [path], folder) for path in stills]
+    for (prefix, separator, width, extension), paths in sequences.items():
+        if len(paths) == 1:
+            items.append(WatchItem('still', paths[0], paths, folder))
+        else:
+            key = os.path.join(folder['path'], f"{prefix}{separator}{'#' * width}{extension}")
+            items.append(WatchItem('sequence', key, paths, folder))
+    return items
+
+class WatchLedger:
+    # Processed items survive restarts, so nothing is converted twice
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {'items': {}}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError):
+            os.replace(self.path, self.path + ".corrupt")
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def is_processed(self, key, signature):
+        # A failed item is retried only once its files change
+        with self.lock:
+            entry = self.data['items'].get(key)
+            return entry is not None and entry['signature'] == signature
+
+    def record(self, key, signature, status, output, error=None):
+        with self.lock:
+            self.data['items'][key] = {
+                'signature': signature,
+                'status': status,
+                'output': output,
+                'error': error,
+                'finished': time.time()
+            }
+            self.save()
+
+class FolderWatcher:
+    def __init__(self, folders, ledger, workers=2, settle_seconds=5.0, poll_interval=2.0):
+        self.folders = folders
+        self.ledger = ledger
+        self.workers = max(1, int(workers))
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.observed = {}
+        self.running = {}
+        # Warm converters keep their maps between jobs that share a preset
+        self.converters = WarmConverters()
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+        for thread in list(self.running.values()):
+            if isinstance(thread, ConversionThread):
+                thread.cancel()
+
+    def get_output_path(self, item):
+        output_dir = item.folder['output']
+        if item.kind == 'video':
+            return get_batch_output_path(item.key, output_dir, '.mp4')
+        if item.kind == 'sequence':
+            prefix = os.path.basename(item.key).split('#')[0].rstrip('._-') or 'sequence'
+            return os.path.join(output_dir, f"{prefix}_fulldome")
+        return get_batch_output_path(item.key, output_dir)
+
+    def get_ready_items(self):
+        # An item is ready once its files have stopped changing for the settle time and can be opened
+        now = time.monotonic()
+        ready = []
+        seen = set()
+        for folder in self.folders:
+            for item in scan_folder(folder):
+                seen.add(item.key)
+                if item.key in self.running:
+                    continue
+                try:
+                    signature = item.get_signature()
+                except FileNotFoundError:
+                    continue
+                if self.ledger.is_processed(item.key, signature):
+                    self.observed.pop(item.key, None)
+                    continue
+                previous = self.observed.get(item.key)
+                if previous is None or previous[0] != signature:
+                    self.observed[item.key] = (signature, now)
+                    continue
+                if now - previous[1] >= self.settle_seconds and all(is_readable(path) for path in item.paths):
+                    ready.append((item, signature))
+        for key in list(self.observed):
+            if key not in seen:
+                del self.observed[key]
+        return ready
+
+    def convert_still(self, item, preset, output_path):
+        converter = self.converters.get(preset)
+        with partial_output(output_path) as temp_path:
+            converter.convert_still(item.paths[0], temp_path)
+
+    def convert_sequence(self, item, preset, output_dir):
+        converter = self.converters.get(preset)
+        os.makedirs(output_dir, exist_ok=True)
+        for path in sorted(item.paths):
+            if self.stop_event.is_set():
+                raise Exception("Watcher stopped")
+            output_path = os.path.join(output_dir, os.path.basename(path))
+            with partial_output(output_path) as temp_path:
+                converter.convert_still(path, temp_path)
+
+    def convert_video(self, item, preset, output_path):
+        with partial_output(output_path) as temp_path:
+            thread = ConversionThread(item.paths[0], temp_path, True, **preset)
+            errors = []
+            # run() is called on this pool thread, so signals are delivered directly
+            thread.error.connect(errors.append, Qt.ConnectionType.DirectConnection)
+            self.running[item.key] = thread
+            thread.run()
+            if thread.cancel_requested:
+                raise Exception("Watcher stopped")
+            if thread.failed:
+                raise Exception(errors[0] if errors else "Video conversion failed")
+
+    def process(self, item, signature):
+        output_path = self.get_output_path(item)
+        start = time.perf_counter()
+        try:
+            preset = load_preset(item.folder['path'], item.folder.get('preset'))
+            os.makedirs(item.folder['output'], exist_ok=True)
+            log(f"Converting {item.kind} {item.key}")
+            if item.kind == 'video':
+                self.convert_video(item, preset, output_path)
+            elif item.kind == 'sequence':
+                self.convert_sequence(item, preset, output_path)
+            else:
+                self.convert_still(item, preset, output_path)
+            self.ledger.record(item.key, signature, 'done', output_path)
+            log(f"Finished {item.key} -> {output_path} in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            # Interrupted items are left out of the ledger so they run again on the next start
+            if not self.stop_event.is_set():
+                self.ledger.record(item.key, signature, 'failed', output_path, str(e))
+            log(f"Failed {item.key}: {str(e)}")
+
+    def run_item(self, item, signature):
+        try:
+            self.process(item, signature)
+        finally:
+            self.running.pop(item.key, None)
+
+    def run(self, once=False):
+        # The pool never holds more items than it has workers; the rest wait for the next scan
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while not self.stop_event.is_set():
+                for item, signature in self.get_ready_items():
+                    if len(self.running) >= self.workers:
+                        break
+                    self.running[item.key] = None
+                    pool.submit(self.run_item, item, signature)
+                if once and not self.running and not self.observed:
+                    break
+                self.stop_event.wait(self.poll_interval)
+
+def load_folders(args):
+    folders = []
+    settings = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+        folders = settings.get('folders', [])
+
+    base_preset = {}
+    if args.preset:
+        with open(args.preset, 'r', encoding='utf-8') as f:
+            base_preset = json.load(f)
+    for path in args.folders:
+        folders.append({'path': path, 'output': args.output, 'preset': base_preset})
+
+    for folder in folders:
+        folder['path'] = os.path.abspath(folder['path'])
+        folder['output'] = os.path.abspath(folder.get('output') or os.path.join(folder['path'], 'fulldome'))
+    return folders, settings
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch folders and convert new 360 media to fulldome")
+    parser.add_argument('folders', nargs='*', help="Folders to watch")
+    parser.add_argument('--config', help="JSON file with 'folders' (path, output, preset) and watcher settings")
+    parser.add_argument('--output', help="Output folder for folders given on the command line (default: <folder>/fulldome)")
+    parser.add_argument('--preset', help="JSON file with conversion settings for folders given on the command line")
+    parser.add_argument('--workers', type=int, help="Items converted at the same time")
+    parser.add_argument('--settle', type=float, help="Seconds a file must stay unchanged before it is converted")
+    parser.add_argument('--poll', type=float, help="Seconds between folder scans")
+    parser.add_argument('--cache-mb', type=int, help="Memory for projection maps kept between jobs")
+    parser.add_argument('--state', help="Ledger of processed items (default: in the app data folder)")
+    parser.add_argument('--once', action='store_true', help="Convert what is there, then exit")
+    args = parser.parse_args()
+
+    folders, settings = load_folders(args)
+    if not folders:
+        parser.error("No folders to watch")
+
+    def setting(name, default):
+        value = getattr(args, name)
+        return value if value is not None else settings.get(name, default)
+
+    MAP_CACHE.max_mb = setting('cache_mb', 1024)
+    ledger = WatchLedger(setting('state', None) or os.path.join(get_app_data_dir(), "watch_folder.json"))
+    watcher = FolderWatcher(folders, ledger, setting('workers', 2), setting('settle', 5.0), setting('poll', 2.0))
+
+    signal.signal(signal.SIGINT, lambda *_: watcher.stop())
+    signal.signal(signal.SIGTERM, lambda *_: watcher.stop())
+    for folder in folders:
+        log(f"Watching {folder['path']} -> {folder['output']}")
+    watcher.run(once=args.once)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+
+# The converter modules live in src/ and import each other by name; Qt runs without a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import cv2
+import numpy as np
+import pytest
+from PyQt6.QtCore import Qt
+
+# View settings every test export starts from, the same as the GUI's defaults
+VIEW_PARAMS = {
+    'input_format': 'Equirectangular',
+    'dome_type': 'standard',
+    'rotation': 0,
+    'zoom_factor': 1.0,
+    'tilt': 0,
+    'pan': 0,
+    'roll': 0,
+    'flip_h': False,
+    'flip_v': False
+}
+
+def write_video(path, frames, width, height, fps=10):
+    # Every frame differs, so duplicate skipping never hides a frame
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    gradient = np.linspace(0, 200, width, dtype=np.float32)[None, :, None]
+    for index in range(frames):
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[...] = np.clip(gradient + index * 2, 0, 255).astype(np.uint8)
+        frame[:, :, 2] = index * 10 % 256
+        out.write(frame)
+    out.release()
+    return str(path)
+
+def count_frames(path):
+    cap = cv2.VideoCapture(str(path))
+    count = 0
+    while cap.read()[0]:
+        count += 1
+    cap.release()
+    return count
+
+def run_thread(thread):
+    # run() on the calling thread, with signals delivered directly
+    errors = []
+    thread.error.connect(errors.append, Qt.ConnectionType.DirectConnection)
+    thread.run()
+    assert not thread.failed, errors
+    return thread
+
+@pytest.fixture
+def make_video():
+    return write_video
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+def wait_until(app, condition, timeout=10.0):
+    # Runs the event loop until queued signals from worker threads have been delivered
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "Timed out waiting for the event loop"
+        app.processEvents()
+        time.sleep(0.01)
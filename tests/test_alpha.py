@@ -0,0 +1,32 @@
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread, flatten_alpha
+
+
+def export_still(tmp_path, source_pixels, transparent):
+    source = str(tmp_path / 'source.png')
+    cv2.imwrite(source, source_pixels)
+    output = str(tmp_path / 'dome.png')
+    run_thread(ConversionThread(source, output, False, transparent=transparent, **VIEW_PARAMS))
+    return cv2.imread(output, cv2.IMREAD_UNCHANGED)
+
+
+def test_outside_of_the_dome_is_transparent(tmp_path):
+    result = export_still(tmp_path, np.full((64, 128, 3), 200, dtype=np.uint8), True)
+    assert result.shape == (64, 64, 4)
+    assert result[32, 32].tolist() == [200, 200, 200, 255]
+    assert result[0, 0, 3] == 0
+
+
+def test_source_alpha_is_kept_only_for_transparent_output(tmp_path):
+    pixels = np.full((64, 128, 4), 200, dtype=np.uint8)
+    pixels[:, :, 3] = 100
+    assert export_still(tmp_path, pixels, True)[32, 32, 3] == 100
+    assert export_still(tmp_path, pixels, False).shape == (64, 64, 3)
+
+
+def test_flattening_premultiplies_onto_black():
+    image = np.array([[[200, 100, 50, 255], [200, 100, 50, 0]]], dtype=np.uint8)
+    assert flatten_alpha(image).tolist() == [[[200, 100, 50], [0, 0, 0]]]
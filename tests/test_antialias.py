@@ -0,0 +1,25 @@
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread
+
+
+def export_checkerboard(tmp_path, antialias):
+    # One-pixel checks alias badly where the equirect's rows converge on the zenith
+    source = str(tmp_path / 'checks.png')
+    checks = (np.indices((256, 512)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    cv2.imwrite(source, cv2.cvtColor(checks, cv2.COLOR_GRAY2BGR))
+    output = str(tmp_path / f"dome_{antialias}.png")
+    run_thread(ConversionThread(source, output, False, antialias=antialias, **VIEW_PARAMS))
+    return cv2.imread(output)[:, :, 0].astype(np.float32)
+
+
+def test_antialiasing_averages_checks_near_the_zenith(tmp_path):
+    point = export_checkerboard(tmp_path, False)
+    filtered = export_checkerboard(tmp_path, True)
+    centre = (slice(96, 160), slice(96, 160))
+
+    assert point[centre].std() > 100
+    assert filtered[centre].std() < 20
+    assert abs(filtered[centre].mean() - 127.5) < 10
@@ -0,0 +1,61 @@
+import os
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import Qt
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import BatchConversionThread
+
+
+def test_batch_converts_every_image(tmp_path):
+    # Two resolutions, so the batch runs two groups
+    inputs = []
+    for index, size in enumerate(((32, 64), (64, 128), (32, 64), (64, 128))):
+        inputs.append(str(tmp_path / f"pano_{index}.png"))
+        cv2.imwrite(inputs[-1], np.full(size + (3,), 40 + index * 50, dtype=np.uint8))
+    output_dir = tmp_path / 'out'
+
+    run_thread(BatchConversionThread(inputs, str(output_dir), output_extension='.jpg', max_workers=2, **VIEW_PARAMS))
+
+    for index, (height, _) in enumerate(((32, 64), (64, 128), (32, 64), (64, 128))):
+        result = cv2.imread(str(output_dir / f"pano_{index}_fulldome.jpg"))
+        assert result.shape == (height, height, 3)
+        assert abs(int(result[height // 2, height // 2, 0]) - (40 + index * 50)) <= 2
+
+
+def test_failed_images_are_reported_and_the_rest_still_convert(tmp_path):
+    good = str(tmp_path / 'good.png')
+    cv2.imwrite(good, np.full((32, 64, 3), 100, dtype=np.uint8))
+    bad = str(tmp_path / 'bad.png')
+    with open(bad, 'wb') as f:
+        f.write(b'not an image')
+    output_dir = tmp_path / 'out'
+
+    thread = BatchConversionThread([bad, good], str(output_dir), **VIEW_PARAMS)
+    failed, errors = [], []
+    thread.file_failed.connect(lambda path, message: failed.append(path), Qt.ConnectionType.DirectConnection)
+    thread.error.connect(errors.append, Qt.ConnectionType.DirectConnection)
+    thread.run()
+
+    assert thread.failed
+    assert failed == [bad]
+    assert errors and errors[0].startswith("1 of 2 images failed")
+    assert os.listdir(output_dir) == ['good_fulldome.png']
+
+
+def test_same_names_from_different_folders_get_separate_outputs(tmp_path):
+    inputs = []
+    for value, folder in ((60, 'a'), (120, 'b'), (180, 'c')):
+        os.makedirs(tmp_path / folder)
+        inputs.append(str(tmp_path / folder / 'pano.png'))
+        cv2.imwrite(inputs[-1], np.full((32, 64, 3), value, dtype=np.uint8))
+    output_dir = tmp_path / 'out'
+
+    run_thread(BatchConversionThread(inputs + inputs[:1], str(output_dir), **VIEW_PARAMS))
+
+    assert sorted(os.listdir(output_dir)) == ['pano_fulldome.png', 'pano_fulldome_2.png', 'pano_fulldome_3.png']
+    # Each input's result is its own; the centre of the dome shows the source colour
+    for name, value in (('pano_fulldome.png', 60), ('pano_fulldome_2.png', 120), ('pano_fulldome_3.png', 180)):
+        result = cv2.imread(str(output_dir / name))
+        assert abs(int(result[16, 16, 0]) - value) <= 1
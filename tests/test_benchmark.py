@@ -0,0 +1,40 @@
+from benchmark import compare_to_baseline, get_input_size, run_case
+
+
+def result(fps, resolution='2K', kernel=None):
+    entry = {'input_format': 'equirect', 'resolution': resolution, 'video_fps': fps}
+    if kernel is not None:
+        entry['kernel'] = kernel
+    return entry
+
+
+def test_only_drops_beyond_the_tolerance_are_regressions():
+    baseline = {'results': [result(100.0), result(50.0, '4K')]}
+    assert compare_to_baseline([result(91.0), result(60.0, '4K')], baseline, 0.1) == []
+    regressions = compare_to_baseline([result(89.0), result(10.0, '1K')], baseline, 0.1)
+    assert [(r['resolution'], r['baseline_fps'], r['fps']) for r in regressions] == [('2K', 100.0, 89.0)]
+
+
+
+def test_kernels_are_compared_with_themselves():
+    baseline = {'results': [result(100.0, kernel='numba'), result(20.0, kernel='numpy')]}
+    assert compare_to_baseline([result(19.0, kernel='numpy')], baseline, 0.1) == []
+    regressions = compare_to_baseline([result(50.0, kernel='numba')], baseline, 0.1)
+    assert [(r['kernel'], r['baseline_fps']) for r in regressions] == [('numba', 100.0)]
+
+
+def test_old_reports_count_as_numpy():
+    baseline = {'results': [result(20.0)]}
+    assert compare_to_baseline([result(100.0, kernel='numba')], baseline, 0.1) == []
+    assert len(compare_to_baseline([result(10.0, kernel='numpy')], baseline, 0.1)) == 1
+
+def test_cubemap_inputs_are_six_faces_wide():
+    assert get_input_size('equirect', '2K') == (2048, 1024)
+    assert get_input_size('cubemap', '2K') == (3072, 512)
+
+
+def test_case_reports_every_stage():
+    report = run_case({'input_format': 'equirect', 'resolution': '1K', 'frames': 2, 'repeat': 1})
+    assert set(report['stages_ms']) >= {'map_build', 'flip', 'sampling', 'decode', 'encode'}
+    assert report['dome_size'] == 512
+    assert report['video_fps'] > 0
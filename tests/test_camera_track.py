@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from fulldome_converter import CameraTrack, apply_camera_track, build_fisheye_maps, interpolate_maps
+
+
+def test_keyframes_interpolate_and_hold_at_the_ends():
+    track = CameraTrack([{'time': 2, 'tilt': 10, 'zoom': 2}, {'time': 0, 'tilt': 0, 'pan': 30}])
+    assert track.evaluate(-1) == {'tilt': 0, 'pan': 30, 'roll': 0, 'zoom': 1}
+    # Channels a keyframe leaves out keep the previous keyframe's value
+    assert track.evaluate(1) == {'tilt': 5, 'pan': 30, 'roll': 0, 'zoom': 1.5}
+    assert track.evaluate(5) == {'tilt': 10, 'pan': 30, 'roll': 0, 'zoom': 2}
+
+
+def test_smooth_interpolation_eases_in_and_out():
+    track = CameraTrack.from_dict({'interpolation': 'smooth', 'keyframes': [{'time': 0}, {'time': 1, 'pan': 100}]})
+    assert track.evaluate(0.5)['pan'] == pytest.approx(50)
+    assert track.evaluate(0.25)['pan'] < 25
+
+
+def test_track_offsets_the_static_view():
+    track = CameraTrack([{'time': 0, 'tilt': 10, 'pan': -5, 'roll': 2, 'zoom': 2}])
+    assert apply_camera_track(track, 0, 20, 30, 0, 1.5) == (30, 25, 2, 3.0)
+    assert apply_camera_track(None, 0, 20, 30, 0, 1.5) == (20, 30, 0, 1.5)
+
+
+def test_invalid_tracks_are_rejected():
+    with pytest.raises(Exception, match="Invalid camera track"):
+        CameraTrack.from_dict({'keyframes': []})
+    with pytest.raises(Exception, match="Invalid camera track"):
+        CameraTrack.from_dict({'interpolation': 'bounce', 'keyframes': [{'time': 0}]})
+
+
+def test_interpolated_maps_follow_the_exact_ones():
+    start = build_fisheye_maps(128, 256, 128, 1.0, 0, 0, 0)
+    end = build_fisheye_maps(128, 256, 128, 1.0, 0, 4, 0)
+    exact = build_fisheye_maps(128, 256, 128, 1.0, 0, 2, 0)
+    map_x, map_y = interpolate_maps(start, end, 0.5, 256)
+
+    inside = exact[0] >= 0
+    # Horizontal distance wraps around the seam
+    error_x = np.abs(map_x[inside] - exact[0][inside])
+    error_x = np.minimum(error_x, 256 - error_x)
+    assert np.median(error_x) < 0.5
+    assert np.median(np.abs(map_y[inside] - exact[1][inside])) < 0.5
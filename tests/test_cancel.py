@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import Qt
+
+from conftest import VIEW_PARAMS, count_frames, run_thread
+from fulldome_converter import ConversionThread, get_stream_path
+
+
+def test_progress_is_throttled_but_always_finishes(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 20, 64, 32)
+    thread = ConversionThread(source, str(tmp_path / 'dome.mp4'), True, progress_interval=60.0, **VIEW_PARAMS)
+    progress = []
+    thread.progress.connect(progress.append, Qt.ConnectionType.DirectConnection)
+    run_thread(thread)
+
+    assert len(progress) <= 2
+    assert progress[-1] == 100
+
+
+def test_cancel_stops_and_removes_the_output(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 20, 64, 32)
+    output = str(tmp_path / 'dome.mp4')
+    thread = ConversionThread(source, output, True, progress_interval=0.0, **VIEW_PARAMS)
+    thread.progress.connect(lambda value: thread.cancel(), Qt.ConnectionType.DirectConnection)
+    run_thread(thread)
+
+    assert thread.cancel_requested
+    assert not os.path.exists(output)
+
+
+def test_paused_export_waits_for_resume(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 10, 64, 32)
+    output = str(tmp_path / 'dome.mp4')
+    thread = ConversionThread(source, output, True, **VIEW_PARAMS)
+    thread.pause()
+    worker = threading.Thread(target=run_thread, args=(thread,))
+    worker.start()
+    time.sleep(0.3)
+    assert worker.is_alive() and thread.is_paused()
+
+    thread.resume()
+    worker.join(timeout=30)
+    assert not worker.is_alive()
+    assert count_frames(output) == 10
+
+
+def cancel_during_export(source, output, **params):
+    thread = ConversionThread(source, output, True, **dict(VIEW_PARAMS, **params))
+    convert_stereo = thread.convert_stereo
+    def convert_and_cancel(frame, index, *args):
+        if index == 3:
+            thread.cancel()
+        return convert_stereo(frame, index, *args)
+    thread.convert_stereo = convert_and_cancel
+    thread.run()
+    assert thread.cancel_requested
+
+
+@pytest.mark.parametrize('stereo_layout, stereo_output, written, untouched', [
+    ('mono', 'left', [None], ['left', 'right']),
+    ('top_bottom', 'anaglyph', [None], ['left', 'right']),
+    ('top_bottom', 'both', ['left', 'right'], [None])
+])
+def test_cancel_removes_only_the_streams_it_writes(tmp_path, make_video, stereo_layout, stereo_output, written, untouched):
+    source = make_video(tmp_path / 'source.mp4', 10, 64, 64 if stereo_layout == 'top_bottom' else 32)
+    output = str(tmp_path / 'dome.mp4')
+    # Files from some other export that happen to share the name pattern
+    for stream in untouched:
+        with open(get_stream_path(output, stream), 'wb') as f:
+            f.write(b'keep')
+
+    cancel_during_export(source, output, stereo_layout=stereo_layout, stereo_output=stereo_output)
+
+    for stream in written:
+        assert not os.path.exists(get_stream_path(output, stream))
+    for stream in untouched:
+        with open(get_stream_path(output, stream), 'rb') as f:
+            assert f.read() == b'keep'
@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+import pytest
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread, convert_depth, get_write_depth, remap_frame
+
+
+def test_depth_conversion_spans_the_full_range():
+    assert convert_depth(np.array([0, 255], dtype=np.uint8), np.uint16).tolist() == [0, 65535]
+    assert convert_depth(np.array([65535], dtype=np.uint16), np.float32).tolist() == [1.0]
+    # HDR values above 1.0 clip when narrowed to integers
+    assert convert_depth(np.array([0.5, 2.0], dtype=np.float32), np.uint8).tolist() == [128, 255]
+
+
+@pytest.mark.parametrize('extension, dtype, expected', [
+    ('.png', 'uint16', 'uint16'),
+    ('.png', 'float32', 'uint16'),
+    ('.jpg', 'uint16', 'uint8'),
+    ('.tif', 'float16', 'float32'),
+    ('.exr', 'uint8', 'float16'),
+])
+def test_each_format_gets_its_closest_depth(extension, dtype, expected):
+    assert get_write_depth(f"out{extension}", dtype) == np.dtype(expected)
+
+
+def test_half_float_nearest_lookups_keep_the_exact_values():
+    frame = np.random.default_rng(2).random((16, 32, 3)).astype(np.float16)
+    map_x, map_y = np.meshgrid(np.arange(32, dtype=np.float32), np.arange(16, dtype=np.float32))
+    assert np.array_equal(remap_frame(frame, map_x, map_y, cv2.INTER_NEAREST), frame)
+
+
+@pytest.mark.parametrize('output_depth, dtype', [('source', np.uint16), ('uint8', np.uint8)])
+def test_16_bit_stills_keep_their_depth(tmp_path, output_depth, dtype):
+    source = str(tmp_path / 'source.png')
+    # 1000 is not a multiple of 257, so an 8-bit round trip would change it
+    cv2.imwrite(source, np.full((64, 128, 3), 1000, dtype=np.uint16))
+    output = str(tmp_path / 'dome.png')
+    run_thread(ConversionThread(source, output, False, output_depth=output_depth, **VIEW_PARAMS))
+
+    result = cv2.imread(output, cv2.IMREAD_UNCHANGED)
+    assert result.dtype == dtype
+    expected = 1000 if dtype == np.uint16 else 4
+    assert int(result[32, 32, 0]) == expected
@@ -0,0 +1,75 @@
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread, frames_match
+
+
+def make_frame(value=100):
+    return np.full((64, 48, 3), value, dtype=np.uint8)
+
+
+def test_identical_frames_match():
+    assert frames_match(make_frame(), make_frame())
+
+
+def test_missing_or_different_frames_never_match():
+    frame = make_frame()
+    assert not frames_match(frame, None)
+    assert not frames_match(frame, frame[:32])
+    assert not frames_match(frame, frame.astype(np.uint16))
+
+
+def test_change_between_sampled_rows_is_caught():
+    # Row 1 is skipped by the sparse pass, so only the full comparison sees it
+    frame = make_frame()
+    frame[1] = 0
+    assert not frames_match(frame, make_frame())
+
+
+def test_tolerance_is_a_mean_absolute_difference():
+    frame = make_frame()
+    assert frames_match(frame, make_frame(101), tolerance=1.0)
+    assert not frames_match(frame, make_frame(102), tolerance=1.0)
+
+
+def write_held_video(path, values):
+    # MJPEG codes every frame on its own, so repeated frames decode identically
+    out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 32))
+    for value in values:
+        out.write(np.full((32, 64, 3), value, dtype=np.uint8))
+    out.release()
+    return str(path)
+
+
+def read_centres(path):
+    cap = cv2.VideoCapture(str(path))
+    values = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        values.append(int(frame[16, 16, 0]))
+    cap.release()
+    return values
+
+
+def test_held_frames_reuse_the_previous_result(tmp_path):
+    source = write_held_video(tmp_path / 'held.avi', [50, 50, 50, 150, 150, 250])
+    output = str(tmp_path / 'dome.mp4')
+    thread = run_thread(ConversionThread(source, output, True, skip_duplicates=True, **VIEW_PARAMS))
+    assert thread.duplicate_frames == 3
+    centres = read_centres(output)
+    assert len(centres) == 6
+    # Held frames come out identical; both codecs shift levels a little
+    assert centres[0] == centres[1] == centres[2] and centres[3] == centres[4]
+    assert all(abs(value - expected) <= 8 for value, expected in zip(centres, [50, 50, 50, 150, 150, 250]))
+
+
+def test_slow_fades_are_not_frozen_by_the_tolerance(tmp_path):
+    # Each frame is one level brighter, under the tolerance, but the fade as a whole is not
+    source = write_held_video(tmp_path / 'fade.avi', list(range(100, 112)))
+    output = str(tmp_path / 'dome.mp4')
+    run_thread(ConversionThread(source, output, True, skip_duplicates=True, duplicate_tolerance=1.5, **VIEW_PARAMS))
+    centres = read_centres(output)
+    assert centres[-1] - centres[0] >= 8
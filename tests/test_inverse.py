@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread, build_view_directions, get_projection_shape
+
+
+def test_view_directions_are_unit_vectors():
+    for projection in ('equirectangular', 'cubemap'):
+        directions = build_view_directions(projection, 16)
+        assert directions.shape == (3,) + get_projection_shape(projection, 16)
+        assert np.allclose(np.linalg.norm(directions, axis=0), 1, atol=1e-5)
+
+
+def test_dome_to_equirect_round_trip(tmp_path):
+    # Smooth and never black, so nearest sampling barely matters and uncovered pixels stand out
+    source = str(tmp_path / 'pano.png')
+    y, x = np.mgrid[0:256, 0:512].astype(np.float32)
+    image = np.stack([40 + x / 4, 40 + y / 2, 40 + (x + y) / 6], axis=2).astype(np.uint8)
+    cv2.imwrite(source, image)
+    view = dict(VIEW_PARAMS, tilt=20, pan=30, roll=10)
+
+    dome = str(tmp_path / 'dome.png')
+    run_thread(ConversionThread(source, dome, False, **view))
+    back = str(tmp_path / 'back.png')
+    run_thread(ConversionThread(dome, back, False, output_projection='equirectangular', output_size=256, **view))
+
+    result = cv2.imread(back)
+    assert result.shape == image.shape
+    covered = result.max(axis=2) > 0
+    # The dome is half the sphere
+    assert 0.4 < covered.mean() < 0.6
+    difference = np.abs(result.astype(np.int16) - image)[covered]
+    assert np.median(difference) <= 1
+    assert difference.mean() < 3
+
+
+def test_cubemap_output_is_a_strip_of_faces(tmp_path):
+    source = str(tmp_path / 'dome.png')
+    cv2.imwrite(source, np.full((64, 64, 3), 120, dtype=np.uint8))
+    output = str(tmp_path / 'cube.png')
+    run_thread(ConversionThread(source, output, False, output_projection='cubemap', **VIEW_PARAMS))
+    assert cv2.imread(output).shape == (32, 192, 3)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from fulldome_converter import ProjectionKernel
+
+
+def test_unknown_backends_are_rejected():
+    kernel = ProjectionKernel()
+    with pytest.raises(Exception, match="not available"):
+        kernel.set_backend('opencl')
+    assert kernel.backend == 'numpy' and not kernel.is_fused()
+
+
+def test_fused_kernel_matches_the_numpy_reference():
+    pytest.importorskip('numba')
+    kernel = ProjectionKernel()
+    kernel.set_backend('numba')
+    assert kernel.is_fused()
+
+    frame = np.random.default_rng(1).integers(0, 256, (128, 256, 3), dtype=np.uint8)
+    expected = kernel.project(frame, 96, 1.0, 10, -20, 5, backend='numpy').astype(np.float32)
+    result = kernel.project(frame, 96, 1.0, 10, -20, 5).astype(np.float32)
+    assert result.shape == expected.shape
+    assert np.mean(np.abs(result - expected)) < 1.0
+    # Outside the dome stays black
+    assert not result[0, 0].any()
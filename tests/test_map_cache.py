@@ -0,0 +1,33 @@
+import numpy as np
+
+from fulldome_converter import ProjectionMapCache, build_fisheye_maps
+
+
+def test_maps_are_built_once_per_setting():
+    cache = ProjectionMapCache()
+    map_x, map_y = cache.get_maps(64, 128, 64, 1.0, 10, 0, 0)
+    assert cache.get_maps(64, 128, 64, 1.0, 10, 0, 0)[0] is map_x
+    assert cache.get_maps(64, 128, 64, 1.0, 20, 0, 0)[0] is not map_x
+
+
+def test_cache_stays_within_its_memory_budget():
+    # A 64 px dome is ~50 KB of maps, directions and grid; 1 MB holds a handful of settings
+    cache = ProjectionMapCache(max_mb=1)
+    first = cache.get_maps(64, 128, 64, 1.0, 0, 0, 0)
+    for tilt in range(1, 40):
+        last = cache.get_maps(64, 128, 64, 1.0, tilt, 0, 0)
+        assert cache.nbytes <= 1024 * 1024
+    assert 0 < cache.count('maps') < 40
+
+    # The most recent settings are still cached; the oldest were evicted first
+    assert cache.get_maps(64, 128, 64, 1.0, 39, 0, 0)[0] is last[0]
+    assert cache.get_maps(64, 128, 64, 1.0, 0, 0, 0)[0] is not first[0]
+
+
+def test_entries_larger_than_the_budget_are_not_kept():
+    cache = ProjectionMapCache(max_mb=1)
+    map_x, map_y = cache.get_maps(1024, 2048, 1024, 1.0, 0, 0, 0)
+    assert cache.count('maps') == 0
+    assert cache.nbytes <= 1024 * 1024
+    expected = build_fisheye_maps(1024, 2048, 1024, 1.0, 0, 0, 0)
+    assert np.array_equal(map_x, expected[0])
@@ -0,0 +1,48 @@
+import cv2
+import numpy as np
+from PyQt6.QtCore import Qt
+
+from fulldome_converter import MediaLoader
+
+
+def load(path, is_video, cancel=False):
+    events = []
+    loader = MediaLoader(str(path), is_video, 64)
+    for name in ('metadata_ready', 'video_ready', 'image_ready', 'error'):
+        getattr(loader, name).connect(lambda *args, name=name: events.append((name, args[1:])),
+                                      Qt.ConnectionType.DirectConnection)
+    if cancel:
+        loader.cancel()
+    loader.run()
+    return events
+
+
+def test_video_metadata_arrives_before_the_first_frame(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 5, 256, 128)
+    events = load(source, True)
+
+    assert [name for name, _ in events] == ['metadata_ready', 'video_ready']
+    metadata = events[0][1][0]
+    assert (metadata['total_frames'], metadata['width'], metadata['height']) == (5, 256, 128)
+    capture, thumbnail = events[1][1]
+    # The open capture is handed over for scrubbing, past the first frame
+    assert capture.isOpened() and capture.read()[0]
+    capture.release()
+    assert thumbnail.shape == (32, 64, 3)
+
+
+def test_images_load_with_a_preview_copy(tmp_path):
+    path = tmp_path / 'still.png'
+    cv2.imwrite(str(path), np.full((128, 256, 3), 90, dtype=np.uint8))
+    events = load(path, False)
+
+    assert [name for name, _ in events] == ['image_ready']
+    image, preview = events[0][1]
+    assert image.shape == (128, 256, 3)
+    assert preview.shape == (32, 64, 3)
+
+
+def test_failures_are_reported_unless_cancelled(tmp_path):
+    events = load(tmp_path / 'missing.png', False)
+    assert [name for name, _ in events] == ['error']
+    assert load(tmp_path / 'missing.png', False, cancel=True) == []
@@ -0,0 +1,15 @@
+from fulldome_converter import PlaybackDecoder
+
+
+def test_decoder_queues_downscaled_frames_from_the_start_frame(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 10, 256, 128)
+    decoder = PlaybackDecoder(source, 4, 64)
+    decoder.run()
+
+    frames = []
+    while not decoder.frames.empty():
+        frames.append(decoder.frames.get())
+    assert [index for index, _ in frames] == list(range(4, 10))
+    assert all(frame.shape == (32, 64, 3) for _, frame in frames)
+    # The test video's red channel steps by 10 per frame, 40 at frame 4
+    assert abs(frames[0][1][:, :, 2].mean() - 40) < 5
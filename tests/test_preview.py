@@ -0,0 +1,74 @@
+import cv2
+import numpy as np
+
+import fulldome_converter
+from conftest import wait_until
+from fulldome_converter import PreviewWidget
+
+
+def test_preview_renders_into_a_persistent_buffer(qapp):
+    preview = PreviewWidget()
+    preview.preview_image = np.full((64, 128, 3), 100, dtype=np.uint8)
+
+    preview.update_preview()
+    buffer = preview.preview_buffer
+    image = preview.preview_qimage
+    side = buffer.shape[0]
+    assert preview.preview_label.frame_image is image
+    # The QImage wraps the numpy buffer instead of a copy of it
+    assert int(image.constBits()) == buffer.ctypes.data
+    assert (image.width(), image.height()) == (side, side)
+    assert tuple(buffer[side // 2, side // 2]) == (100, 100, 100)
+    assert tuple(buffer[0, 0]) == (0, 0, 0)
+
+    # Re-rendering at the same size reuses the buffer
+    preview.tilt = 20
+    preview.update_preview()
+    assert preview.preview_buffer is buffer
+    assert preview.preview_qimage is image
+
+
+def test_playback_errors_stop_playback(qapp, tmp_path, make_video, monkeypatch):
+    messages = []
+    monkeypatch.setattr(fulldome_converter.QMessageBox, 'critical', lambda parent, title, text: messages.append(text))
+    source = make_video(tmp_path / 'source.mp4', 10, 64, 32)
+    preview = PreviewWidget()
+    preview.video_capture = cv2.VideoCapture(source)
+    preview.fps = 10.0
+    preview.total_frames = 10
+    # The file is gone by the time playback opens it
+    preview.video_path = str(tmp_path / 'missing.mp4')
+
+    preview.start_playback()
+    wait_until(qapp, lambda: messages)
+
+    assert not preview.is_playing
+    assert preview.playback_decoder is None
+    assert preview.play_button.text() == "Play"
+    assert messages[0].startswith("Playback error")
+    preview.close_media()
+
+
+def load_video(app, preview, path):
+    # Waits for the background loader, so no thread is still running when the widget goes away
+    preview.set_video(path)
+    preview.media_loader.wait()
+    preview.proxy_thread.wait()
+    wait_until(app, lambda: preview.video_capture is not None)
+
+
+def test_proxy_failures_are_shown_and_the_source_is_kept(qapp, tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 10, 64, 32)
+    preview = PreviewWidget()
+    load_video(qapp, preview, source)
+
+    preview.proxy_thread.error.emit("Proxy generation error: disk full")
+    assert preview.proxy_path is None
+    assert preview.video_path == source
+    assert not preview.proxy_status_label.isHidden()
+    assert "original video" in preview.proxy_status_label.text()
+
+    # Loading another video clears the message
+    load_video(qapp, preview, source)
+    assert preview.proxy_status_label.isHidden()
+    preview.close_media()
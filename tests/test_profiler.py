@@ -0,0 +1,47 @@
+import json
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import PROFILER, ConversionThread, StageProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler()
+    with profiler.span('decode'):
+        pass
+    profiler.record('project', 0.0, 1.0)
+    profiler.count('queue', 3)
+    assert profiler.summary() == {'stages': {}, 'counters': {}}
+
+
+def test_spans_and_counters_export_as_a_chrome_trace(tmp_path):
+    profiler = StageProfiler(history=2)
+    profiler.set_enabled(True)
+    for seconds in (1.0, 2.0, 3.0):
+        profiler.record('project', 10.0, 10.0 + seconds)
+    profiler.count('queue', 5)
+
+    # Averages cover the last `history` samples
+    summary = profiler.summary()
+    assert summary['stages']['project'] == {'avg_ms': 2500.0, 'max_ms': 3000.0, 'count': 2}
+    assert summary['counters'] == {'queue': 5}
+
+    path = tmp_path / 'trace.json'
+    profiler.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert [event['ph'] for event in events] == ['M', 'X', 'X', 'X', 'C']
+    assert events[3]['dur'] == 3e6
+    assert events[4]['args'] == {'queue': 5}
+
+
+def test_video_export_records_its_stages(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 5, 64, 32)
+    PROFILER.set_enabled(True)
+    PROFILER.reset()
+    try:
+        run_thread(ConversionThread(source, str(tmp_path / 'dome.mp4'), True, **VIEW_PARAMS))
+        stages = PROFILER.summary()['stages']
+    finally:
+        PROFILER.set_enabled(False)
+        PROFILER.reset()
+    for name in ('decode', 'project', 'encode'):
+        assert stages[name]['count'] == 5
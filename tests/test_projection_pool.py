@@ -0,0 +1,86 @@
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread
+from frame_transport import REPEAT_FRAME, ProjectionPool
+
+
+def read_frames(path):
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def test_results_come_back_in_order():
+    height, width = 8, 16
+    map_x, map_y = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+    values = [index * 10 for index in range(12)]
+    frames = iter(values)
+
+    def read_frame(dst):
+        value = next(frames, None)
+        if value is None:
+            return False
+        dst[...] = value
+        return True
+
+    # Fewer slots than frames, so slots are reused while workers finish out of order
+    pool = ProjectionPool(2, (height, width, 3), (height, width, 3), np.uint8, map_x, map_y, slots=4)
+    try:
+        results = [(index, int(result[0, 0, 0]), int(result[-1, -1, 2])) for index, result, *_ in pool.run(read_frame)]
+    finally:
+        pool.close()
+
+    assert [index for index, _, _ in results] == list(range(len(values)))
+    assert [first for _, first, _ in results] == values
+    assert [last for _, _, last in results] == values
+
+
+def test_pooled_export_matches_in_process(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 12, 64, 32)
+    outputs = {}
+    for workers in (1, 2):
+        outputs[workers] = str(tmp_path / f"dome_{workers}.mp4")
+        thread = ConversionThread(source, outputs[workers], True, workers=workers, **VIEW_PARAMS)
+        assert thread.use_worker_pool(64, 32, 32) == (workers > 1)
+        run_thread(thread)
+
+    single, pooled = read_frames(outputs[1]), read_frames(outputs[2])
+    assert len(single) == 12
+    assert len(pooled) == len(single)
+    assert all(np.array_equal(a, b) for a, b in zip(single, pooled))
+
+
+def test_results_come_back_in_order_with_repeats():
+    height, width = 8, 16
+    map_x, map_y = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+    # Frames 3, 4 and 8 repeat the frame before them
+    values = [0, 10, 20, 20, 20, 50, 60, 70, 70, 90, 100, 110]
+    repeats = {3, 4, 8}
+    frames = iter(range(len(values)))
+
+    def read_frame(dst):
+        index = next(frames, None)
+        if index is None:
+            return False
+        if index in repeats:
+            return REPEAT_FRAME
+        dst[...] = values[index]
+        return True
+
+    pool = ProjectionPool(2, (height, width, 3), (height, width, 3), np.uint8, map_x, map_y, slots=4)
+    try:
+        results = [(index, int(result[0, 0, 0]), int(result[-1, -1, 2])) for index, result, *_ in pool.run(read_frame)]
+    finally:
+        pool.close()
+
+    assert [index for index, _, _ in results] == list(range(len(values)))
+    assert [first for _, first, _ in results] == values
+    assert [last for _, _, last in results] == values
@@ -0,0 +1,37 @@
+import os
+
+import cv2
+from PyQt6.QtCore import Qt
+
+from conftest import count_frames
+from fulldome_converter import ProxyThread, find_cached_proxy
+
+
+def build_proxy(video_path, proxy_size):
+    ready = []
+    thread = ProxyThread(video_path, proxy_size)
+    thread.ready.connect(lambda source, proxy: ready.append(proxy), Qt.ConnectionType.DirectConnection)
+    thread.run()
+    return ready
+
+
+def test_proxy_is_downscaled_and_frame_accurate(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 12, 256, 128)
+    proxy_path, = build_proxy(source, 64)
+
+    assert os.path.dirname(proxy_path) == str(tmp_path)
+    cap = cv2.VideoCapture(proxy_path)
+    ok, frame = cap.read()
+    cap.release()
+    assert ok and max(frame.shape[:2]) <= 64
+    assert count_frames(proxy_path) == 12
+
+    # A later session picks up the proxy instead of rebuilding it
+    assert find_cached_proxy(source, 64) == proxy_path
+    assert build_proxy(source, 64) == [proxy_path]
+
+
+def test_small_sources_need_no_proxy(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 4, 64, 32)
+    assert build_proxy(source, 256) == []
+    assert find_cached_proxy(source, 256) is None
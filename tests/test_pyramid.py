@@ -0,0 +1,31 @@
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import PYRAMID_CACHE, ConversionThread
+
+
+def test_small_outputs_sample_the_pyramid(tmp_path):
+    # One-pixel checks, rendered at a sixteenth of the source height
+    source = str(tmp_path / 'checks.png')
+    checks = (np.indices((1024, 2048)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    cv2.imwrite(source, cv2.cvtColor(checks, cv2.COLOR_GRAY2BGR))
+    PYRAMID_CACHE.clear()
+
+    outputs = []
+    for index in range(2):
+        outputs.append(str(tmp_path / f"dome_{index}.png"))
+        run_thread(ConversionThread(source, outputs[-1], False, output_size=64, **VIEW_PARAMS))
+        # Both exports share the still's levels
+        assert len(PYRAMID_CACHE.pyramids) == 1
+        levels = next(iter(PYRAMID_CACHE.pyramids.values()))
+        assert levels
+
+    result = cv2.imread(outputs[0])[:, :, 0].astype(np.float32)
+    assert result.shape == (64, 64)
+    # Every region averages the checks out instead of aliasing, including those on the rim
+    inside = result[8:56, 8:56]
+    assert inside.std() < 20
+    assert abs(inside.mean() - 127.5) < 10
+    assert np.array_equal(cv2.imread(outputs[1]), cv2.imread(outputs[0]))
+    PYRAMID_CACHE.clear()
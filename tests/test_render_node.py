@@ -0,0 +1,77 @@
+import os
+import sqlite3
+
+from conftest import count_frames
+from fulldome_converter import get_stream_path
+from render_node import CLAIMS_FILE, SEGMENTS_DIR, ClaimTable, RenderNode, get_segment_path, submit_job
+
+
+def make_claims(tmp_path, ranges):
+    claims = ClaimTable(str(tmp_path / CLAIMS_FILE))
+    claims.create(ranges)
+    return claims
+
+
+def test_each_range_is_claimed_once(tmp_path):
+    claims = make_claims(tmp_path, [(0, 10), (10, 20)])
+    try:
+        assert claims.claim('a', 60.0, 3)[1:] == (0, 10)
+        assert claims.claim('b', 60.0, 3)[1:] == (10, 20)
+        assert claims.claim('c', 60.0, 3) is None
+    finally:
+        claims.close()
+
+
+def test_expired_leases_are_reclaimed_until_attempts_run_out(tmp_path):
+    claims = make_claims(tmp_path, [(0, 10)])
+    try:
+        # A negative lease has already expired, as if the node had died
+        range_id = claims.claim('a', -1.0, 2)[0]
+        assert claims.claim('b', -1.0, 2)[0] == range_id
+        assert not claims.renew(range_id, 'a', 60.0)
+        assert claims.claim('c', 60.0, 2) is None
+
+        claims.expire_exhausted(2)
+        assert claims.get_ranges()[0][3:] == ('failed', 'b', 2, 'Node stopped responding')
+    finally:
+        claims.close()
+
+
+def test_a_node_renders_every_range(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 12, 64, 32)
+    job_dir = str(tmp_path / 'job')
+    assert submit_job(job_dir, {'input_path': source, 'output_path': str(tmp_path / 'dome.mp4')}, range_frames=5) == 3
+
+    node = RenderNode(job_dir, node_id='node1', poll_interval=0.05)
+    try:
+        assert node.run() == 3
+    finally:
+        node.close()
+
+    # The last range runs to the end of the stream
+    for start, end, frames in ((0, 5, 5), (5, 10, 5), (10, 0, 2)):
+        assert count_frames(get_segment_path(job_dir, start, end)) == frames
+    assert not [name for name in os.listdir(os.path.join(job_dir, SEGMENTS_DIR)) if '.partial' in name]
+    with sqlite3.connect(os.path.join(job_dir, CLAIMS_FILE)) as connection:
+        assert connection.execute("SELECT status FROM ranges").fetchall() == [('done',)] * 3
+
+
+def test_stereo_ranges_are_rendered_per_eye(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 10, 64, 64)
+    job_dir = str(tmp_path / 'job')
+    params = {'input_path': source, 'output_path': str(tmp_path / 'dome.mp4'),
+              'stereo_layout': 'top_bottom', 'stereo_output': 'both'}
+    assert submit_job(job_dir, params, range_frames=5) == 2
+
+    node = RenderNode(job_dir, node_id='node1', poll_interval=0.05)
+    try:
+        assert node.run() == 2
+    finally:
+        node.close()
+
+    for start, end in ((0, 5), (5, 0)):
+        for stream in ('left', 'right'):
+            assert count_frames(get_stream_path(get_segment_path(job_dir, start, end), stream)) == 5
+    assert not [name for name in os.listdir(os.path.join(job_dir, SEGMENTS_DIR)) if '.partial' in name]
+    with sqlite3.connect(os.path.join(job_dir, CLAIMS_FILE)) as connection:
+        assert connection.execute("SELECT status FROM ranges").fetchall() == [('done',), ('done',)]
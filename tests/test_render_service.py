@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import cv2
+import numpy as np
+import pytest
+
+import fulldome_converter
+from render_service import RenderJob, RenderService, create_server, get_job_params
+
+
+@pytest.fixture
+def server():
+    server = create_server(port=0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.close()
+
+
+def get_url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def post_jobs(server, payload, path='/jobs'):
+    body = json.dumps(payload).encode()
+    request = urllib.request.Request(get_url(server, path), data=body, method='POST')
+    return urllib.request.urlopen(request, timeout=10)
+
+
+def test_a_job_list_is_rendered_and_reported(server, tmp_path):
+    payload = []
+    for index, value in enumerate((60, 160)):
+        source = str(tmp_path / f"in_{index}.png")
+        cv2.imwrite(source, np.full((32, 64, 3), value, dtype=np.uint8))
+        payload.append({'input_path': source, 'output_path': str(tmp_path / f"out_{index}.png")})
+
+    with post_jobs(server, payload, '/jobs?wait=1') as response:
+        assert response.status == 201
+        jobs = json.loads(response.read())
+    assert [job['status'] for job in jobs] == ['done', 'done']
+    for index, value in enumerate((60, 160)):
+        assert abs(int(cv2.imread(str(tmp_path / f"out_{index}.png"))[16, 16, 0]) - value) <= 1
+
+    # A finished job's event stream ends with its final state
+    with urllib.request.urlopen(get_url(server, f"/jobs/{jobs[0]['id']}/events"), timeout=10) as response:
+        events = [json.loads(line) for line in response.read().splitlines()]
+    assert events[-1]['status'] == 'done'
+    with urllib.request.urlopen(get_url(server, '/jobs'), timeout=10) as response:
+        assert sorted(job['id'] for job in json.loads(response.read())) == sorted(job['id'] for job in jobs)
+
+
+def test_unknown_jobs_and_missing_paths_are_rejected(server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(get_url(server, '/jobs/missing'), timeout=10)
+    assert error.value.code == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_jobs(server, {'input_path': 'in.png'})
+    assert error.value.code == 400
+    assert 'output_path' in json.loads(error.value.read())['error']
+
+
+@pytest.mark.parametrize('key, value', [
+    ('input_format', 'equirect'),
+    ('dome_type', 'Virtual Sky'),
+    ('stereo_layout', 'over_under'),
+    ('stereo_output', 'both_eyes'),
+    ('output_projection', 'dome'),
+    ('output_depth', '10-bit'),
+])
+def test_invalid_choices_are_rejected(key, value):
+    with pytest.raises(ValueError, match=key):
+        get_job_params({'input_path': 'in.png', 'output_path': 'out.png', key: value})
+
+
+def test_invalid_choice_returns_400(server):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_jobs(server, {'input_path': 'in.png', 'output_path': 'out.png', 'output_depth': '10-bit'})
+    assert error.value.code == 400
+    assert 'output_depth' in json.loads(error.value.read())['error']
+    assert not server.service.jobs
+
+
+def test_a_bad_item_rejects_the_whole_list(server, tmp_path):
+    good = {'input_path': str(tmp_path / 'in.png'), 'output_path': str(tmp_path / 'out.png')}
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_jobs(server, [good, dict(good, dome_type='dome')])
+    assert error.value.code == 400
+    assert not server.service.jobs
+
+
+def test_running_stills_can_be_cancelled(tmp_path, monkeypatch):
+    source = str(tmp_path / 'in.png')
+    cv2.imwrite(source, np.full((32, 64, 3), 100, dtype=np.uint8))
+    service = RenderService(workers=1)
+    job = RenderJob(get_job_params({'input_path': source, 'output_path': str(tmp_path / 'out.png')}))
+
+    # The cancel arrives while the still is being read, after the job has started
+    read_image = fulldome_converter.read_image
+    def read_and_cancel(*args, **kwargs):
+        service.cancel(job)
+        return read_image(*args, **kwargs)
+    monkeypatch.setattr(fulldome_converter, 'read_image', read_and_cancel)
+    try:
+        service.run_job(job)
+    finally:
+        service.close()
+
+    assert job.status == 'cancelled'
+    assert not os.path.exists(tmp_path / 'out.png')
+    # Other jobs on the same warm converter are unaffected
+    converter = service.converters.get({key: value for key, value in job.params.items()
+                                        if key not in ('input_path', 'output_path', 'is_video')})
+    monkeypatch.setattr(fulldome_converter, 'read_image', read_image)
+    assert converter.convert_still(source, str(tmp_path / 'other.png'))
@@ -0,0 +1,106 @@
+import json
+import os
+
+import cv2
+import numpy as np
+
+from conftest import VIEW_PARAMS, count_frames, run_thread
+from fulldome_converter import ConversionThread, ExportJournal, get_stream_path
+
+
+def read_means(path):
+    cap = cv2.VideoCapture(str(path))
+    means = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        means.append(frame.mean())
+    cap.release()
+    return means
+
+
+def test_export_resumes_after_last_segment(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 20, 64, 32)
+    output = str(tmp_path / 'dome.mp4')
+
+    # Stand-in for the first segment of an interrupted export: ten black dome frames
+    dark = tmp_path / 'dark.mp4'
+    out = cv2.VideoWriter(str(dark), cv2.VideoWriter_fourcc(*'mp4v'), 10, (64, 32))
+    for _ in range(10):
+        out.write(np.zeros((32, 64, 3), dtype=np.uint8))
+    out.release()
+    parts_dir = output + ".parts"
+    os.makedirs(parts_dir)
+    segment = os.path.join(parts_dir, "segment_00000.mp4")
+    run_thread(ConversionThread(str(dark), segment, True, **VIEW_PARAMS))
+
+    run_thread(ConversionThread(source, output, True, start_frame=10, segment_frames=10, segments=[segment], **VIEW_PARAMS))
+
+    # The kept segment is joined as it is and only the rest of the video is rendered
+    means = read_means(output)
+    assert len(means) == 20
+    assert max(means[:10]) < 5
+    assert min(means[10:]) > 20
+    assert not os.path.exists(parts_dir)
+
+
+def test_two_eye_export_resumes_from_per_stream_segments(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 20, 64, 64)
+    output = str(tmp_path / 'dome.mp4')
+    params = dict(VIEW_PARAMS, stereo_layout='top_bottom', stereo_output='both')
+
+    # The first segment as an interrupted export leaves it behind: one file per eye
+    parts_dir = output + ".parts"
+    os.makedirs(parts_dir)
+    segment = os.path.join(parts_dir, "segment_00000.mp4")
+    run_thread(ConversionThread(source, segment, True, end_frame=10, **params))
+
+    thread = ConversionThread(source, output, True, start_frame=10, segment_frames=10, segments=[segment], **params)
+    projected = []
+    convert_stereo = thread.convert_stereo
+    thread.convert_stereo = lambda frame, index, *args: projected.append(index) or convert_stereo(frame, index, *args)
+    run_thread(thread)
+
+    assert projected == list(range(10, 20))
+    for stream in ('left', 'right'):
+        assert count_frames(get_stream_path(output, stream)) == 20
+    assert not os.path.exists(parts_dir)
+
+
+def test_missing_segment_restarts_from_the_beginning(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 20, 64, 64)
+    output = str(tmp_path / 'dome.mp4')
+    segment = os.path.join(output + ".parts", "segment_00000.mp4")
+    params = dict(VIEW_PARAMS, stereo_layout='top_bottom', stereo_output='both')
+
+    # Only one eye of the segment survived
+    os.makedirs(os.path.dirname(segment))
+    run_thread(ConversionThread(source, get_stream_path(segment, 'left'), True, end_frame=10, **dict(params, stereo_output='left')))
+
+    run_thread(ConversionThread(source, output, True, start_frame=10, segment_frames=10, segments=[segment], **params))
+    for stream in ('left', 'right'):
+        assert count_frames(get_stream_path(output, stream)) == 20
+
+def test_journal_survives_a_restart(tmp_path):
+    path = str(tmp_path / 'jobs.json')
+    journal = ExportJournal(path)
+    running = journal.add_job({'input_path': 'a.mp4'})
+    queued = journal.add_job({'input_path': 'b.mp4'})
+    journal.update_job(running, status='running', frames_done=300)
+
+    # A crash mid-export leaves the job marked running; the next session queues it again
+    journal = ExportJournal(path)
+    assert journal.recover() == 1
+    assert [(job['id'], job['status'], job['frames_done']) for job in journal.get_jobs()] == [
+        (running, 'queued', 300), (queued, 'queued', 0)]
+
+
+def test_unreadable_journal_is_kept_aside(tmp_path):
+    path = tmp_path / 'jobs.json'
+    path.write_text('{"jobs": [')
+    journal = ExportJournal(str(path))
+    assert journal.get_jobs() == []
+    assert (tmp_path / 'jobs.json.corrupt').read_text() == '{"jobs": ['
+    journal.add_job({'input_path': 'a.mp4'})
+    assert len(json.loads(path.read_text())['jobs']) == 1
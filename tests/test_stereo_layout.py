@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+import pytest
+
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import (ConversionThread, compose_anaglyph, get_mono_aspect, get_stereo_layout, get_stream_path,
+                                split_stereo)
+
+
+def test_auto_detect_from_the_frame_aspect():
+    assert get_stereo_layout('auto', 400, 200) == 'mono'
+    assert get_stereo_layout('auto', 400, 400) == 'top_bottom'
+    assert get_stereo_layout('auto', 800, 200) == 'side_by_side'
+    # An explicit layout is kept whatever the aspect
+    assert get_stereo_layout('side_by_side', 400, 200) == 'side_by_side'
+
+
+@pytest.mark.parametrize('input_format, width, height, expected', [
+    ('Equirectangular', 400, 200, 'mono'),
+    ('Equirectangular', 400, 400, 'top_bottom'),
+    ('Equirectangular', 800, 200, 'side_by_side'),
+    ('Cubemap', 600, 100, 'mono'),
+    ('Cubemap', 600, 200, 'top_bottom'),
+    ('Cubemap', 1200, 100, 'side_by_side'),
+])
+def test_auto_detect_uses_the_input_format_aspect(input_format, width, height, expected):
+    assert get_stereo_layout('auto', width, height, get_mono_aspect(input_format)) == expected
+
+
+def test_inverse_outputs_detect_against_a_square_dome_master():
+    mono_aspect = get_mono_aspect('Equirectangular', 'equirectangular')
+    assert get_stereo_layout('auto', 512, 512, mono_aspect) == 'mono'
+    assert get_stereo_layout('auto', 512, 1024, mono_aspect) == 'top_bottom'
+
+
+def test_split_returns_views_of_each_eye():
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    frame[32:] = 200
+    left, right = split_stereo(frame, 'top_bottom')
+    assert left.shape == right.shape == (32, 64, 3)
+    assert left.max() == 0 and right.min() == 200
+    assert np.shares_memory(left, frame) and np.shares_memory(right, frame)
+
+    left, right = split_stereo(np.zeros((32, 128, 3), dtype=np.uint8), 'side_by_side')
+    assert left.shape == right.shape == (32, 64, 3)
+
+
+def test_anaglyph_takes_red_from_the_left_eye():
+    left = np.full((4, 4, 3), (10, 20, 30), dtype=np.uint8)
+    right = np.full((4, 4, 3), (40, 50, 60), dtype=np.uint8)
+    assert compose_anaglyph(left, right)[0, 0].tolist() == [40, 50, 30]
+
+
+def test_both_eyes_are_written_next_to_the_output(tmp_path):
+    source = str(tmp_path / 'stereo.png')
+    frame = np.full((64, 64, 3), 60, dtype=np.uint8)
+    frame[32:] = 180
+    cv2.imwrite(source, frame)
+    output = str(tmp_path / 'dome.png')
+
+    run_thread(ConversionThread(source, output, False, stereo_layout='auto', stereo_output='both', **VIEW_PARAMS))
+
+    for stream, value in (('left', 60), ('right', 180)):
+        result = cv2.imread(get_stream_path(output, stream))
+        assert result.shape == (32, 32, 3)
+        assert abs(int(result[16, 16, 0]) - value) <= 1
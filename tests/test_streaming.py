@@ -0,0 +1,68 @@
+import json
+
+import cv2
+import numpy as np
+
+import fulldome_converter
+from conftest import VIEW_PARAMS, run_thread
+from fulldome_converter import ConversionThread, get_circular_span
+
+
+def make_panorama(tmp_path):
+    # Noise, so any misplaced row or column shows; saved both as a PNG (BGR) and as an RGB .npy
+    rng = np.random.default_rng(6)
+    image = rng.integers(0, 256, (128, 256, 3), dtype=np.uint8)
+    cv2.imwrite(str(tmp_path / 'pano.png'), image)
+    np.save(tmp_path / 'pano.npy', np.ascontiguousarray(image[:, :, ::-1]))
+    return image
+
+
+def convert(source, output, **params):
+    run_thread(ConversionThread(str(source), str(output), False, **dict(VIEW_PARAMS, **params)))
+
+
+def test_circular_span_wraps_around_the_seam():
+    assert get_circular_span(np.array([3, 4, 5]), 10) == (3, 3)
+    assert get_circular_span(np.array([0, 1, 8, 9]), 10) == (8, 4)
+
+
+def test_tiles_match_the_in_core_still(tmp_path, monkeypatch):
+    make_panorama(tmp_path)
+    convert(tmp_path / 'pano.png', tmp_path / 'in_core.png')
+    # Small tiles, so the dome is assembled from many of them, including ones across the seam
+    monkeypatch.setattr(fulldome_converter, 'STREAMING_TILE', 32)
+    convert(tmp_path / 'pano.npy', tmp_path / 'streamed.png')
+    convert(tmp_path / 'pano.npy', tmp_path / 'streamed.npy')
+
+    expected = cv2.imread(str(tmp_path / 'in_core.png'))
+    assert np.array_equal(cv2.imread(str(tmp_path / 'streamed.png')), expected)
+    assert np.array_equal(np.load(tmp_path / 'streamed.npy'), expected[:, :, ::-1])
+
+
+def test_raw_inputs_follow_their_sidecar(tmp_path, monkeypatch):
+    image = make_panorama(tmp_path)
+    # BGR pixels after a 16-byte header
+    with open(tmp_path / 'pano.raw', 'wb') as f:
+        f.write(bytes(16))
+        f.write(image.tobytes())
+    with open(tmp_path / 'pano.raw.json', 'w', encoding='utf-8') as f:
+        json.dump({'width': 256, 'height': 128, 'channels': 3, 'offset': 16, 'order': 'bgr'}, f)
+
+    convert(tmp_path / 'pano.png', tmp_path / 'in_core.png')
+    monkeypatch.setattr(fulldome_converter, 'STREAMING_TILE', 32)
+    convert(tmp_path / 'pano.raw', tmp_path / 'streamed.png')
+    assert np.array_equal(cv2.imread(str(tmp_path / 'streamed.png')), cv2.imread(str(tmp_path / 'in_core.png')))
+
+
+def test_in_core_stills_write_npy_and_raw(tmp_path):
+    make_panorama(tmp_path)
+    convert(tmp_path / 'pano.png', tmp_path / 'in_core.png')
+    convert(tmp_path / 'pano.png', tmp_path / 'dome.npy')
+    convert(tmp_path / 'pano.png', tmp_path / 'dome.raw')
+
+    expected = cv2.imread(str(tmp_path / 'in_core.png'))[:, :, ::-1]
+    assert np.array_equal(np.load(tmp_path / 'dome.npy'), expected)
+    with open(tmp_path / 'dome.raw.json', 'r', encoding='utf-8') as f:
+        info = json.load(f)
+    assert (info['width'], info['height'], info['channels'], info['order']) == (128, 128, 3, 'rgb')
+    assert np.array_equal(np.fromfile(tmp_path / 'dome.raw', dtype=np.uint8).reshape(128, 128, 3), expected)
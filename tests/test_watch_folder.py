@@ -0,0 +1,68 @@
+import os
+
+import cv2
+import numpy as np
+
+from conftest import count_frames
+from watch_folder import FolderWatcher, WatchLedger, scan_folder
+
+def watch_once(folder, output, preset):
+    ledger = WatchLedger(str(output / 'ledger.json'))
+    folders = [{'path': str(folder), 'output': str(output), 'preset': preset}]
+    FolderWatcher(folders, ledger, workers=1, settle_seconds=0.0, poll_interval=0.05).run(once=True)
+    return ledger.data['items']
+
+def test_stills_videos_and_sequences_are_converted_once(tmp_path, make_video):
+    folder = tmp_path / 'in'
+    output = tmp_path / 'out'
+    folder.mkdir()
+    output.mkdir()
+    cv2.imwrite(str(folder / 'still.png'), np.full((32, 64, 3), 90, dtype=np.uint8))
+    for index in range(3):
+        cv2.imwrite(str(folder / f'shot.{index + 1:04d}.png'), np.full((32, 64, 3), 40 * index, dtype=np.uint8))
+    make_video(folder / 'clip.mp4', 5, 64, 32)
+
+    items = watch_once(folder, output, {})
+
+    assert sorted(item['status'] for item in items.values()) == ['done', 'done', 'done']
+    assert cv2.imread(str(output / 'still_fulldome.png')).shape == (32, 32, 3)
+    assert sorted(os.listdir(output / 'shot_fulldome')) == ['shot.0001.png', 'shot.0002.png', 'shot.0003.png']
+    assert count_frames(output / 'clip_fulldome.mp4') == 5
+    assert not [name for name in os.listdir(output) if name.startswith('.partial_')]
+
+    # The ledger keeps a second pass from converting anything again
+    finished = {key: item['finished'] for key, item in items.items()}
+    items = watch_once(folder, output, {})
+    assert {key: item['finished'] for key, item in items.items()} == finished
+
+def test_stereo_outputs_are_moved_into_place(tmp_path, make_video):
+    folder = tmp_path / 'in'
+    output = tmp_path / 'out'
+    folder.mkdir()
+    cv2.imwrite(str(folder / 't.png'), np.full((64, 64, 3), 90, dtype=np.uint8))
+    make_video(folder / 'v.mp4', 6, 64, 64)
+
+    items = watch_once(folder, output, {'stereo_layout': 'top_bottom', 'stereo_output': 'both'})
+
+    assert sorted(item['status'] for item in items.values()) == ['done', 'done']
+    for eye in ('left', 'right'):
+        assert cv2.imread(str(output / f't_fulldome_{eye}.png')).shape == (32, 32, 3)
+        assert count_frames(output / f'v_fulldome_{eye}.mp4') == 6
+    assert not [name for name in os.listdir(output) if name.startswith('.partial_')]
+
+def test_failed_items_leave_no_partial_files(tmp_path):
+    folder = tmp_path / 'in'
+    output = tmp_path / 'out'
+    folder.mkdir()
+    (folder / 'broken.png').write_bytes(b'not an image')
+
+    items = watch_once(folder, output, {})
+
+    assert [item['status'] for item in items.values()] == ['failed']
+    assert [name for name in os.listdir(output) if name != 'ledger.json'] == []
+
+def test_scan_skips_partial_and_own_outputs(tmp_path):
+    for name in ('a.png', '.partial_a_fulldome.png', 'a_fulldome.png', 'b.tmp', 'shot.0001.png', 'shot.0002.png'):
+        (tmp_path / name).write_bytes(b'')
+    items = scan_folder({'path': str(tmp_path), 'output': str(tmp_path / 'out')})
+    assert sorted((item.kind, os.path.basename(item.key)) for item in items) == [('sequence', 'shot.####.png'), ('still', 'a.png')]
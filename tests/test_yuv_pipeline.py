@@ -0,0 +1,80 @@
+import io
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+from conftest import VIEW_PARAMS, count_frames, run_thread
+from fulldome_converter import YUV_BLACK, ConversionThread, get_i420_planes, read_exact
+
+
+class ShortReads(io.RawIOBase):
+    # A pipe that hands out at most a few bytes per read
+    def __init__(self, data, chunk=5):
+        self.data = memoryview(data)
+        self.chunk = chunk
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self.chunk, len(self.data))
+        buffer[:count] = self.data[:count]
+        self.data = self.data[count:]
+        return count
+
+
+def test_planes_are_views_of_the_frame_buffer():
+    buffer = np.arange(8 * 4 * 3 // 2, dtype=np.uint8)
+    y, u, v = get_i420_planes(buffer, 8, 4)
+    assert (y.shape, u.shape, v.shape) == ((4, 8), (2, 4), (2, 4))
+    assert (y[0, 0], u[0, 0], v[0, 0]) == (0, 32, 40)
+    assert all(np.shares_memory(plane, buffer) for plane in (y, u, v))
+
+
+def test_read_exact_fills_the_frame_across_short_reads():
+    buffer = np.empty(12, dtype=np.uint8)
+    stream = ShortReads(bytes(range(24)))
+    assert read_exact(stream, buffer)
+    assert buffer.tolist() == list(range(12))
+    assert read_exact(stream, buffer)
+    assert not read_exact(stream, buffer)
+    with pytest.raises(Exception, match="middle of a frame"):
+        read_exact(ShortReads(bytes(7)), buffer)
+
+
+def test_project_yuv_samples_each_plane_with_its_own_maps():
+    thread = ConversionThread('in.mp4', 'out.mp4', True, yuv_pipeline=True, **VIEW_PARAMS)
+    source = np.empty(64 * 32 * 3 // 2, dtype=np.uint8)
+    for plane, value in zip(get_i420_planes(source, 64, 32), (200, 90, 160)):
+        plane[...] = value
+    result = np.empty(32 * 32 * 3 // 2, dtype=np.uint8)
+    thread.project_yuv(source, result, 64, 32, 32, thread.get_yuv_maps(32, 64, 32))
+    for plane, value, black in zip(get_i420_planes(result, 32, 32), (200, 90, 160), YUV_BLACK):
+        size = plane.shape[0]
+        assert plane[size // 2, size // 2] == value
+        assert plane[0, 0] == black
+
+
+def test_without_ffmpeg_the_opencv_path_is_used(tmp_path, make_video, monkeypatch):
+    monkeypatch.setattr(shutil, 'which', lambda name: None)
+    source = make_video(tmp_path / 'source.mp4', 6, 64, 32)
+    output = str(tmp_path / 'dome.mp4')
+    thread = ConversionThread(source, output, True, yuv_pipeline=True, **VIEW_PARAMS)
+    assert not thread.use_yuv_pipeline(64, 32, 32)
+    run_thread(thread)
+    assert count_frames(output) == 6
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg is not installed")
+def test_yuv_export_matches_the_bgr_export(tmp_path, make_video):
+    source = make_video(tmp_path / 'source.mp4', 6, 64, 32)
+    outputs = {}
+    for yuv in (False, True):
+        outputs[yuv] = str(tmp_path / f"dome_{yuv}.mp4")
+        thread = ConversionThread(source, outputs[yuv], True, yuv_pipeline=yuv, **VIEW_PARAMS)
+        assert thread.use_yuv_pipeline(64, 32, 32) == yuv
+        run_thread(thread)
+    assert count_frames(outputs[True]) == count_frames(outputs[False]) == 6
+    bgr = cv2.VideoCapture(outputs[False]).read()[1].astype(np.int16)
+    yuv = cv2.VideoCapture(outputs[True]).read()[1].astype(np.int16)
+    # Different encoders and colour conversions, so only close
+    assert np.abs(bgr - yuv)[8:24, 8:24].mean() < 8